@@ -12,6 +12,19 @@ from models.refresh_token import RefreshToken
 from models.user import User
 from models.doctor import Doctor
 from models.appointment import Appointment
+from models.doctor_schedule import (
+    DoctorScheduleTemplate,
+    DoctorScheduleException,
+    DoctorSlotCalendar,
+)
+from models.waitlist import WaitlistEntry
+from models.idempotency_key import IdempotencyKey
+from models.rate_limit_bucket import RateLimitBucket
+from models.outbox_event import OutboxEvent
+from models.appointment_reminder import AppointmentReminder
+from models.appointment_archive import AppointmentArchive
+from models.doctor_daily_stats import DoctorDailyStats, RollupWatermark
+from models.background_job import BackgroundJob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,173 @@
+"""partition appointments
+
+Revision ID: a4c6e8f0b2d1
+Revises: 0801974028e8
+Create Date: 2026-10-19 17:42:19.680534
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c6e8f0b2d1"
+down_revision: Union[str, Sequence[str], None] = "0801974028e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, doctor_id, date, slot_index, status, created_at, updated_at"
+
+
+def _create_appointments(**kwargs) -> None:
+    op.create_table(
+        "appointments",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('appointments_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("doctor_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("slot_index", sa.Integer(), nullable=False),
+        sa.Column(
+            "starts_at",
+            sa.DateTime(),
+            sa.Computed("date + slot_index * interval '20 minutes'", persisted=True),
+            nullable=False,
+        ),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "PLANNED",
+                "FINISHED",
+                "CANCELLED",
+                name="appointment_status_enum",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.CheckConstraint(
+            "slot_index >= 0 AND slot_index < 24", name="ck_slot_index_range"
+        ),
+        sa.ForeignKeyConstraint(
+            ["doctor_id"],
+            ["doctors.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint(*kwargs.pop("primary_key"), name="appointments_pkey"),
+        sa.UniqueConstraint(
+            "doctor_id",
+            "date",
+            "slot_index",
+            "status",
+            "user_id",
+            name="uq_doctor_slot",
+        ),
+        **kwargs,
+    )
+
+
+def _rename_old(suffix: str) -> None:
+    op.rename_table("appointments", f"appointments_{suffix}")
+    op.execute(
+        f"ALTER TABLE appointments_{suffix} RENAME CONSTRAINT appointments_pkey TO appointments_{suffix}_pkey"
+    )
+    op.execute(
+        f"ALTER TABLE appointments_{suffix} RENAME CONSTRAINT uq_doctor_slot TO uq_doctor_slot_{suffix}"
+    )
+    op.execute(
+        f"ALTER INDEX ix_appointments_doctor_date RENAME TO ix_appointments_{suffix}_doctor_date"
+    )
+    op.execute(
+        f"ALTER INDEX ix_appointments_planned_starts_at RENAME TO ix_appointments_{suffix}_planned_starts_at"
+    )
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        "ix_appointments_doctor_date",
+        "appointments",
+        ["doctor_id", "date"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_appointments_planned_starts_at",
+        "appointments",
+        ["starts_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PLANNED'"),
+    )
+
+
+def _move_rows(suffix: str) -> None:
+    op.execute(
+        f"INSERT INTO appointments ({COLUMNS}) SELECT {COLUMNS} FROM appointments_{suffix}"
+    )
+    op.execute("ALTER SEQUENCE appointments_id_seq OWNED BY appointments.id")
+    op.drop_table(f"appointments_{suffix}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint(
+        "appointment_reminders_appointment_id_fkey",
+        "appointment_reminders",
+        type_="foreignkey",
+    )
+    _rename_old("legacy")
+    _create_appointments(
+        primary_key=("id", "date"), postgresql_partition_by="RANGE (date)"
+    )
+    # Months of the existing rows plus a year ahead; the partition job keeps
+    # extending that. The default partition only catches dates beyond it.
+    op.execute("""
+    DO $$
+    DECLARE
+        month date;
+    BEGIN
+        FOR month IN
+            SELECT generate_series(
+                date_trunc('month', LEAST(min(date), current_date)),
+                date_trunc('month', GREATEST(max(date), current_date + interval '12 months')),
+                interval '1 month'
+            )::date
+            FROM appointments_legacy
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF appointments FOR VALUES FROM (%L) TO (%L)',
+                'appointments_p' || to_char(month, 'YYYY_MM'),
+                month,
+                (month + interval '1 month')::date
+            );
+        END LOOP;
+    END $$;
+    """)
+    op.execute("CREATE TABLE appointments_default PARTITION OF appointments DEFAULT")
+    _create_indexes()
+    _move_rows("legacy")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_old("partitioned")
+    _create_appointments(primary_key=("id",))
+    _create_indexes()
+    _move_rows("partitioned")
+    op.create_foreign_key(
+        "appointment_reminders_appointment_id_fkey",
+        "appointment_reminders",
+        "appointments",
+        ["appointment_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
@@ -1,39 +1,196 @@
-from typing import TypeVar, Type, Generic, List
+from dataclasses import dataclass, fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Callable, TypeVar, Type, Generic, List, Sequence
 
 from pydantic import BaseModel
-from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    bindparam,
+    column,
+    insert,
+    union_all,
+    values as sqlalchemy_values,
+    update as sqlalchemy_update,
+    delete as sqlalchemy_delete,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.base import ExecutableOption
 
 from models.base import Base
 
 T = TypeVar("T", bound=Base)
+R = TypeVar("R")
+
+
+@lru_cache(maxsize=None)
+def _row_plan(model: Type[Base], row_cls: type) -> tuple[list, list, tuple]:
+    # dataclass-typed fields are filled from the relationship of the same name
+    columns, joins, layout = [], [], []
+    for field in fields(row_cls):
+        if is_dataclass(field.type):
+            relationship = getattr(model, field.name)
+            target = relationship.property.mapper.class_
+            nested = [getattr(target, f.name) for f in fields(field.type)]
+            columns.extend(nested)
+            joins.append(relationship)
+            layout.append((field.type, len(nested)))
+        else:
+            columns.append(getattr(model, field.name))
+            layout.append((None, 1))
+    return columns, joins, tuple(layout)
+
+
+# Statement templates keyed by (kind, model, filter keys, ...). Filter values
+# travel as bind parameters, so a template is built once per key set and its
+# memoized cache key lets SQLAlchemy reuse the compiled SQL on every call.
+_statement_cache: dict[tuple, object] = {}
+
+
+def _where(
+    model: Type[Base],
+    keys: tuple[str, ...],
+    null_keys: tuple[str, ...],
+    range_filters: dict[str, tuple[str, Callable[[Any, Any], Any]]] | None = None,
+):
+    conditions = []
+    for k in keys:
+        if range_filters and k in range_filters:
+            name, op = range_filters[k]
+            conditions.append(op(getattr(model, name), bindparam(f"f_{k}")))
+        else:
+            conditions.append(getattr(model, k) == bindparam(f"f_{k}"))
+    return conditions + [getattr(model, k).is_(None) for k in null_keys]
+
+
+def _split_filters(filter_dict: dict) -> tuple[tuple, tuple, dict]:
+    keys = tuple(sorted(k for k, v in filter_dict.items() if v is not None))
+    null_keys = tuple(sorted(k for k, v in filter_dict.items() if v is None))
+    return keys, null_keys, {f"f_{k}": filter_dict[k] for k in keys}
+
+
+@dataclass(slots=True)
+class GuardedResult(Generic[T]):
+    found: bool
+    applied: bool = False
+    failed_guard: str | None = None
+    instance: T | None = None
+
+
+def _batches(rows: list[dict], batch_size: int):
+    # chunks of at most batch_size rows that share the same key set
+    groups: dict[tuple, list[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    for group in groups.values():
+        for start in range(0, len(group), batch_size):
+            yield group[start : start + batch_size]
 
 
 class BaseDAO(Generic[T]):
     model: Type[T] = None
+    # same columns as model, holds rows moved out of it; read when asked for
+    archive_model: Type[Base] | None = None
+    # filter key -> (column, operator), e.g. {"date_from": ("date", operator.ge)}
+    range_filters: dict[str, tuple[str, Callable[[Any, Any], Any]]] = {}
+    batch_size: int = 500
+    upsert_constraint: str | None = None
 
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
+    def _select(self, filter_dict: dict, model: Type[Base] | None = None):
+        model = model or self.model
+        keys, null_keys, params = _split_filters(filter_dict)
+        cache_key = ("select", model, keys, null_keys)
+        query = _statement_cache.get(cache_key)
+        if query is None:
+            query = select(model).where(
+                *_where(model, keys, null_keys, self.range_filters)
+            )
+            _statement_cache[cache_key] = query
+        return query, params
+
     async def find_one_or_none_by_id(self, data_id: int) -> T | None:
-        query = select(self.model).filter_by(id=data_id)
-        res = await self.db_session.execute(query)
+        query, params = self._select({"id": data_id})
+        res = await self.db_session.execute(query, params)
         return res.scalar_one_or_none()
 
     async def find_one_or_none(self, filters: BaseModel) -> T | None:
         filter_dict = filters.model_dump(exclude_unset=True)
-        query = select(self.model).filter_by(**filter_dict)
-        res = await self.db_session.execute(query)
+        query, params = self._select(filter_dict)
+        res = await self.db_session.execute(query, params)
         return res.scalar_one_or_none()
 
-    async def find_all(self, filters: BaseModel | None = None) -> List[T] | None:
+    async def find_all(
+        self,
+        filters: BaseModel | None = None,
+        options: Sequence[ExecutableOption] = (),
+        with_archive: bool = False,
+    ) -> List[T] | None:
         filter_dict = (
             filters.model_dump(exclude_unset=True, exclude_none=True) if filters else {}
         )
-        query = select(self.model).filter_by(**filter_dict)
-        res = await self.db_session.execute(query)
-        return res.scalars().all()
+        models = [self.model]
+        if with_archive and self.archive_model is not None:
+            # two entity types, so two queries instead of a UNION
+            models.append(self.archive_model)
+        instances = []
+        for model in models:
+            query, params = self._select(filter_dict, model)
+            if options:
+                query = query.options(*options)
+            res = await self.db_session.execute(query, params)
+            instances.extend(res.scalars().all())
+        return instances
+
+    async def find_all_rows(
+        self,
+        row_cls: Type[R],
+        filters: BaseModel | None = None,
+        with_archive: bool = False,
+    ) -> List[R]:
+        filter_dict = (
+            filters.model_dump(exclude_unset=True, exclude_none=True) if filters else {}
+        )
+        with_archive = with_archive and self.archive_model is not None
+        keys, null_keys, params = _split_filters(filter_dict)
+        cache_key = ("rows", self.model, row_cls, keys, null_keys, with_archive)
+        query = _statement_cache.get(cache_key)
+        if query is None:
+            models = [self.model, self.archive_model] if with_archive else [self.model]
+            parts = []
+            for model in models:
+                columns, joins, _ = _row_plan(model, row_cls)
+                part = select(*columns).select_from(model)
+                for relationship in joins:
+                    part = part.join(relationship)
+                parts.append(
+                    part.where(*_where(model, keys, null_keys, self.range_filters))
+                )
+            query = union_all(*parts) if with_archive else parts[0]
+            _statement_cache[cache_key] = query
+        res = await self.db_session.execute(query, params)
+
+        _, joins, layout = _row_plan(self.model, row_cls)
+
+        if not joins:
+            return [row_cls(*row) for row in res]
+
+        rows = []
+        for row in res:
+            values, pos = [], 0
+            for nested_cls, width in layout:
+                if nested_cls is None:
+                    values.append(row[pos])
+                else:
+                    values.append(nested_cls(*row[pos : pos + width]))
+                pos += width
+            rows.append(row_cls(*values))
+        return rows
 
     async def add(self, values: BaseModel):
         values_dict = values.model_dump(exclude_unset=True)
@@ -42,19 +199,200 @@ class BaseDAO(Generic[T]):
         await self.db_session.flush()
         return instance
 
+    async def add_many(
+        self, values: Sequence[BaseModel], batch_size: int | None = None
+    ) -> List[T]:
+        rows = [v.model_dump(exclude_unset=True) for v in values]
+        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        instances = []
+        for batch in _batches(rows, batch_size or self.batch_size):
+            res = await self.db_session.execute(query, batch)
+            instances.extend(res.scalars().all())
+        return instances
+
+    async def upsert_many(
+        self,
+        values: Sequence[BaseModel],
+        update_fields: Sequence[str] | None = None,
+        constraint: str | None = None,
+        batch_size: int | None = None,
+    ) -> List[T]:
+        constraint = constraint or self.upsert_constraint
+        if constraint is None:
+            raise ValueError(f"{self.model.__name__} has no upsert constraint")
+        conflict_keys = next(
+            (
+                {col.name for col in c.columns}
+                for c in self.model.__table__.constraints
+                if c.name == constraint
+            ),
+            set(),
+        )
+        rows = [v.model_dump(exclude_unset=True) for v in values]
+        instances = []
+        for batch in _batches(rows, batch_size or self.batch_size):
+            fields_to_update = (
+                update_fields
+                if update_fields is not None
+                else [k for k in batch[0] if k not in conflict_keys]
+            )
+            query = pg_insert(self.model)
+            if fields_to_update:
+                query = query.on_conflict_do_update(
+                    constraint=constraint,
+                    set_={k: query.excluded[k] for k in fields_to_update},
+                )
+            else:
+                query = query.on_conflict_do_nothing(constraint=constraint)
+            query = query.returning(self.model).execution_options(
+                populate_existing=True
+            )
+            res = await self.db_session.execute(query, batch)
+            instances.extend(res.scalars().all())
+        return instances
+
+    async def update_many(
+        self,
+        values: Sequence[BaseModel],
+        key: str = "id",
+        batch_size: int | None = None,
+    ) -> List[T]:
+        # UPDATE ... FROM (VALUES ...) matched on ``key``, one statement per batch
+        table = self.model.__table__
+        if key not in table.c:
+            raise ValueError(f"{self.model.__name__} has no column {key!r}")
+        rows = [v.model_dump(exclude_unset=True) for v in values]
+        missing = [i for i, row in enumerate(rows) if key not in row]
+        if missing:
+            raise ValueError(f"update_many rows {missing} have no {key!r} value")
+        instances = []
+        for batch in _batches(rows, batch_size or self.batch_size):
+            keys = sorted(batch[0])
+            data = sqlalchemy_values(
+                *[column(k, table.c[k].type) for k in keys], name="batch"
+            ).data([tuple(row[k] for k in keys) for row in batch])
+            query = (
+                sqlalchemy_update(self.model)
+                .where(getattr(self.model, key) == data.c[key])
+                .values({k: data.c[k] for k in keys if k != key})
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            res = await self.db_session.execute(query)
+            instances.extend(res.scalars().all())
+        return instances
+
     async def update(self, filters: BaseModel, values: BaseModel):
         filter_dict = filters.model_dump(exclude_unset=True)
         values_dict = values.model_dump(exclude_unset=True)
-        query = (
-            sqlalchemy_update(self.model)
-            .where(*[getattr(self.model, k) == v for k, v in filter_dict.items()])
-            .values(**values_dict)
-            .returning(self.model)
-        )
-        result = await self.db_session.execute(query)
+        keys, null_keys, params = _split_filters(filter_dict)
+        value_keys = tuple(sorted(values_dict))
+        cache_key = ("update", self.model, keys, null_keys, value_keys)
+        query = _statement_cache.get(cache_key)
+        if query is None:
+            # session sync would read the unset bind values; RETURNING refreshes
+            # loaded instances instead
+            query = (
+                sqlalchemy_update(self.model)
+                .where(*_where(self.model, keys, null_keys))
+                .values({k: bindparam(f"v_{k}") for k in value_keys})
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            _statement_cache[cache_key] = query
+        params.update({f"v_{k}": v for k, v in values_dict.items()})
+        result = await self.db_session.execute(query, params)
         return result.scalars().first()
 
     async def delete(self, filters: BaseModel):
         filter_dict = filters.model_dump(exclude_unset=True)
-        query = sqlalchemy_delete(self.model).filter_by(**filter_dict)
-        await self.db_session.execute(query)
+        keys, null_keys, params = _split_filters(filter_dict)
+        cache_key = ("delete", self.model, keys, null_keys)
+        query = _statement_cache.get(cache_key)
+        if query is None:
+            query = (
+                sqlalchemy_delete(self.model)
+                .where(*_where(self.model, keys, null_keys))
+                .execution_options(synchronize_session=False)
+            )
+            _statement_cache[cache_key] = query
+        await self.db_session.execute(query, params)
+
+    async def update_guarded(
+        self,
+        filters: BaseModel,
+        values: BaseModel,
+        guards: dict[str, ColumnElement[bool]] | None = None,
+    ) -> GuardedResult[T]:
+        values_dict = values.model_dump(exclude_unset=True)
+        return await self._run_guarded(
+            sqlalchemy_update(self.model).values(**values_dict),
+            filters,
+            guards or {},
+            load_instance=True,
+        )
+
+    async def delete_guarded(
+        self,
+        filters: BaseModel,
+        guards: dict[str, ColumnElement[bool]] | None = None,
+    ) -> GuardedResult[T]:
+        return await self._run_guarded(
+            sqlalchemy_delete(self.model), filters, guards or {}, load_instance=False
+        )
+
+    async def _run_guarded(
+        self,
+        dml,
+        filters: BaseModel,
+        guards: dict[str, ColumnElement[bool]],
+        load_instance: bool,
+    ) -> GuardedResult[T]:
+        # One statement: the "target" CTE finds the row and evaluates every
+        # guard, the DML CTE writes only if the guards still hold, and the
+        # outer join tells "not found" from "guard failed" from "done".
+        filter_dict = filters.model_dump(exclude_unset=True)
+        pk_columns = list(self.model.__table__.primary_key.columns)
+        target = (
+            select(
+                *pk_columns,
+                *[guard.label(f"guard_{name}") for name, guard in guards.items()],
+            )
+            .where(*[getattr(self.model, k) == v for k, v in filter_dict.items()])
+            .cte("target")
+        )
+        changed = (
+            dml.where(
+                *[column == target.c[column.name] for column in pk_columns],
+                *guards.values(),
+            )
+            .returning(*self.model.__table__.columns)
+            .cte("changed")
+        )
+        on_pk = and_(
+            *[changed.c[column.name] == target.c[column.name] for column in pk_columns]
+        )
+        guard_columns = [target.c[f"guard_{name}"] for name in guards]
+        if load_instance:
+            entity = aliased(self.model, changed)
+            query = select(entity, *guard_columns).execution_options(
+                populate_existing=True
+            )
+        else:
+            query = select(changed.c[pk_columns[0].name], *guard_columns)
+        query = query.select_from(target.outerjoin(changed, on_pk))
+
+        res = await self.db_session.execute(query)
+        row = res.first()
+        if row is None:
+            return GuardedResult(found=False)
+        if row[0] is not None:
+            return GuardedResult(
+                found=True,
+                applied=True,
+                instance=row[0] if load_instance else None,
+            )
+        failed = next(
+            (name for name, passed in zip(guards, row[1:]) if not passed), None
+        )
+        return GuardedResult(found=True, failed_guard=failed)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -9,13 +10,76 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # pool connections opened and primed with the hot statements at startup
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
+    DB_POOL_WARMUP_TIMEOUT_SECONDS: float = 10
+    SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS: float = 10
     SECRET_KEY: str
     ALGORITHM: str
     BOT_TOKEN: str
     TELEGRAM_MAX_AGE_SECONDS: int = 86400
     REFRESH_EXPIRES_DAYS: int = 30
+    REFRESH_GRACE_SECONDS: int = 10
     ACCESS_EXPIRES_MINUTES: int = 10
     CRON_FREQ_MINUTES: int = 1
+    SLOT_CALENDAR_HORIZON_DAYS: int = 90
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    # "<requests>/<seconds>" per limiter name; "<name>:global" caps all callers
+    RATE_LIMITS: dict[str, str] = {
+        "appointment": "10/60",
+        "appointment:global": "200/1",
+        "auth": "20/60",
+    }
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_PING_SECONDS: int = 15
+    OUTBOX_DISPATCH_SECONDS: int = 5
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_MAX_BATCHES_PER_RUN: int = 20
+    OUTBOX_RETRY_SECONDS: int = 10
+    OUTBOX_MAX_RETRY_SECONDS: int = 3600
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    TELEGRAM_MAX_CONCURRENCY: int = 10
+    # Telegram allows about 30 messages per second per bot
+    TELEGRAM_MESSAGES_PER_SECOND: float = 25
+    TELEGRAM_MAX_RETRIES: int = 3
+    TELEGRAM_TIMEOUT_SECONDS: float = 10
+    REMINDER_OFFSETS_MINUTES: list[int] = [24 * 60, 60]
+    REMINDER_BATCH_SIZE: int = 200
+    REMINDER_MAX_ATTEMPTS: int = 5
+    REMINDER_RETRY_SECONDS: int = 60
+    # appointments is partitioned by month; None keeps every partition attached
+    APPOINTMENT_PARTITIONS_AHEAD_MONTHS: int = 12
+    APPOINTMENT_PARTITION_RETENTION_MONTHS: int | None = None
+    APPOINTMENT_ARCHIVE_AFTER_DAYS: int = 180
+    APPOINTMENT_ARCHIVE_BATCH_SIZE: int = 1000
+    APPOINTMENT_ARCHIVE_MAX_BATCHES_PER_RUN: int = 50
+    DOCTOR_IMPORT_MAX_BYTES: int = 5 * 1024 * 1024
+    # smaller imports skip the COPY staging table and upsert directly
+    DOCTOR_IMPORT_COPY_MIN_ROWS: int = 1000
+    DOCTOR_STATS_ROLLUP_SECONDS: int = 60
+    # rows committed late with an older updated_at are still picked up
+    DOCTOR_STATS_WATERMARK_MARGIN_SECONDS: int = 300
+    DOCTOR_STATS_REFRESH_BATCH_DAYS: int = 31
+    DOCTOR_STATS_MAX_DAYS: int = 366
+    CAPACITY_REPORT_MAX_DAYS: int = 1096
+    CAPACITY_PROJECTION_WEEKS: int = 8
+    CAPACITY_OVERLOAD_THRESHOLD: float = 0.9
+    # answer prefix searches from an in-process copy of the doctor catalogue
+    DOCTOR_SEARCH_IN_MEMORY: bool = False
+    DOCTOR_SEARCH_INDEX_TTL_SECONDS: int = 300
+    # worker.py: jobs run at once per worker process
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_HEARTBEAT_SECONDS: int = 15
+    JOB_LEASE_SECONDS: int = 120
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_SECONDS: int = 30
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: int = 60
+    JOB_RETENTION_DAYS: int = 7
     model_config = SettingsConfigDict(env_file=Path(__file__).parent.parent / ".env")
 
 
@@ -109,11 +109,78 @@ class DoctorAlreadyExistsError(ConflictError):
     message = "Doctor already exists"
 
 
+class DoctorImportFormatError(BadRequestError):
+    code = "doctor_import_invalid_format"
+    message = "Doctor import file cannot be parsed"
+
+
+class DoctorImportTooLargeError(AppError):
+    status_code = 413
+    code = "doctor_import_too_large"
+    message = "Doctor import file is too large"
+
+
+class DoctorSpecializationMismatchError(BadRequestError):
+    code = "doctor_specialization_mismatch"
+    message = "Doctors have different specializations"
+
+
 class DoctorSlotBusyError(ConflictError):
     code = "doctor_slot_busy"
     message = "Doctor slot busy"
 
 
+class DoctorSlotNotScheduledError(ConflictError):
+    code = "doctor_slot_not_scheduled"
+    message = "Doctor does not work in this slot"
+
+
+class DoctorScheduleExceptionNotFoundError(NotFoundError):
+    code = "doctor_schedule_exception_not_found"
+    message = "Doctor schedule exception not found"
+
+
+class ScheduleRangeError(BadRequestError):
+    code = "schedule_range_invalid"
+    message = "Invalid schedule date range"
+
+
+class StatsRangeError(BadRequestError):
+    code = "stats_range_invalid"
+    message = "Invalid stats date range"
+
+
+class WaitlistEntryAlreadyExistsError(ConflictError):
+    code = "waitlist_entry_already_exists"
+    message = "Already in the waitlist for this slot"
+
+
+class WaitlistEntryNotFoundError(NotFoundError):
+    code = "waitlist_entry_not_found"
+    message = "Waitlist entry not found"
+
+
+class WaitlistSlotFreeError(ConflictError):
+    code = "waitlist_slot_free"
+    message = "Slot is free, book it directly"
+
+
+class IdempotencyKeyReusedError(AppError):
+    status_code = 422
+    code = "idempotency_key_reused"
+    message = "Idempotency key was already used for a different request"
+
+
+class RateLimitExceededError(AppError):
+    status_code = 429
+    code = "rate_limit_exceeded"
+    message = "Too many requests"
+
+    def __init__(self, retry_after: int, **kwargs):
+        super().__init__(extra={"retry_after": retry_after}, **kwargs)
+        self.headers = {"Retry-After": str(retry_after)}
+
+
 class VerificationError(BadRequestError):
     code = "verification_failed"
     message = "Verification failed"
@@ -125,6 +192,26 @@ class ExternalServiceError(AppError):
     message = "External service error"
 
 
+class TelegramSendError(ExternalServiceError):
+    code = "telegram_send_failed"
+    message = "Telegram message was not sent"
+
+    def __init__(self, message: str | None = None, permanent: bool = False, **kwargs):
+        super().__init__(message, **kwargs)
+        # the chat is gone or blocked the bot, retrying will not help
+        self.permanent = permanent
+
+
+class BackgroundJobNotFoundError(NotFoundError):
+    code = "background_job_not_found"
+    message = "Background job not found"
+
+
+class BackgroundJobPayloadError(BadRequestError):
+    code = "background_job_invalid_payload"
+    message = "Invalid background job payload"
+
+
 class AppointmentNotFoundError(NotFoundError):
     code = "appointment_not_found"
     message = "Appointment not found"
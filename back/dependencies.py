@@ -1,22 +1,39 @@
 import asyncio
 from typing import Annotated, AsyncGenerator
 
-from fastapi import Request, HTTPException, status, Depends
+from fastapi import Request, HTTPException, status, Depends, Header
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import ForbiddenError
 from core.security import decode_token
 from infrastructure.database import async_session_maker
+from infrastructure.doctor_search import get_doctor_prefix_index
+from infrastructure.rate_limit import rate_limiter
 from models.user import UserRoleEnum
 from repositories.appointment import AppointmentRepository
+from repositories.background_job import BackgroundJobRepository
+from repositories.capacity_report import CapacityReportRepository
 from repositories.doctor import DoctorRepository
+from repositories.doctor_daily_stats import DoctorDailyStatsRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from repositories.idempotency_key import IdempotencyKeyRepository
+from repositories.outbox import OutboxRepository
 from repositories.refresh_token import RefreshTokenRepository
 from repositories.user import UserRepository
+from repositories.waitlist import WaitlistRepository
 from schemas.auth import TokenUserSchema
 from services.appointment import AppointmentService
 from services.auth import AuthService
+from services.background_job import BackgroundJobService
+from services.capacity_report import CapacityReportService
 from services.doctor import DoctorService
+from services.doctor_daily_stats import DoctorDailyStatsService
+from services.doctor_schedule import DoctorScheduleService
+from services.idempotency import IdempotencyService, request_fingerprint
+from services.outbox import OutboxService
 
 bearer = HTTPBearer()
 event_loop = asyncio.get_event_loop()
@@ -46,12 +63,30 @@ async def get_doctor_repository(
     return DoctorRepository(db_session=db_session)
 
 
+async def get_doctor_schedule_repository(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> DoctorScheduleRepository:
+    return DoctorScheduleRepository(db_session=db_session)
+
+
 async def get_appointment_repository(
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
 ) -> AppointmentRepository:
     return AppointmentRepository(db_session=db_session)
 
 
+async def get_waitlist_repository(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> WaitlistRepository:
+    return WaitlistRepository(db_session=db_session)
+
+
+async def get_idempotency_repository(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> IdempotencyKeyRepository:
+    return IdempotencyKeyRepository(db_session=db_session)
+
+
 async def get_refresh_repository(
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
 ) -> RefreshTokenRepository:
@@ -72,8 +107,41 @@ async def get_auth_service(
 
 async def get_doctor_service(
     doctor_repository: Annotated[DoctorRepository, Depends(get_doctor_repository)],
+    schedule_repository: Annotated[
+        DoctorScheduleRepository, Depends(get_doctor_schedule_repository)
+    ],
 ) -> DoctorService:
-    return DoctorService(doctor_repository=doctor_repository)
+    return DoctorService(
+        doctor_repository=doctor_repository,
+        schedule_repository=schedule_repository,
+        prefix_index=get_doctor_prefix_index(),
+    )
+
+
+async def get_doctor_stats_repository(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> DoctorDailyStatsRepository:
+    return DoctorDailyStatsRepository(db_session=db_session)
+
+
+async def get_doctor_stats_service(
+    stats_repository: Annotated[
+        DoctorDailyStatsRepository, Depends(get_doctor_stats_repository)
+    ],
+) -> DoctorDailyStatsService:
+    return DoctorDailyStatsService(stats_repository=stats_repository)
+
+
+async def get_doctor_schedule_service(
+    schedule_repository: Annotated[
+        DoctorScheduleRepository, Depends(get_doctor_schedule_repository)
+    ],
+    doctor_repository: Annotated[DoctorRepository, Depends(get_doctor_repository)],
+) -> DoctorScheduleService:
+    return DoctorScheduleService(
+        schedule_repository=schedule_repository,
+        doctor_repository=doctor_repository,
+    )
 
 
 async def get_appointment_service(
@@ -81,13 +149,69 @@ async def get_appointment_service(
         AppointmentRepository, Depends(get_appointment_repository)
     ],
     doctor_repository: Annotated[DoctorRepository, Depends(get_doctor_repository)],
+    doctor_schedule_repository: Annotated[
+        DoctorScheduleRepository, Depends(get_doctor_schedule_repository)
+    ],
+    waitlist_repository: Annotated[
+        WaitlistRepository, Depends(get_waitlist_repository)
+    ],
 ) -> AppointmentService:
     return AppointmentService(
         appointment_repository=appointment_repository,
         doctor_repository=doctor_repository,
+        doctor_schedule_repository=doctor_schedule_repository,
+        waitlist_repository=waitlist_repository,
     )
 
 
+async def get_outbox_repository(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> OutboxRepository:
+    return OutboxRepository(db_session=db_session)
+
+
+async def get_outbox_service(
+    outbox_repository: Annotated[OutboxRepository, Depends(get_outbox_repository)],
+) -> OutboxService:
+    return OutboxService(outbox_repository=outbox_repository)
+
+
+async def get_capacity_report_repository(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> CapacityReportRepository:
+    return CapacityReportRepository(db_session=db_session)
+
+
+async def get_capacity_report_service(
+    report_repository: Annotated[
+        CapacityReportRepository, Depends(get_capacity_report_repository)
+    ],
+) -> CapacityReportService:
+    return CapacityReportService(report_repository=report_repository)
+
+
+async def get_background_job_repository(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> BackgroundJobRepository:
+    return BackgroundJobRepository(db_session=db_session)
+
+
+async def get_background_job_service(
+    job_repository: Annotated[
+        BackgroundJobRepository, Depends(get_background_job_repository)
+    ],
+) -> BackgroundJobService:
+    return BackgroundJobService(job_repository=job_repository)
+
+
+async def get_idempotency_service(
+    idempotency_repository: Annotated[
+        IdempotencyKeyRepository, Depends(get_idempotency_repository)
+    ],
+) -> IdempotencyService:
+    return IdempotencyService(idempotency_repository=idempotency_repository)
+
+
 def get_access_token(request: Request) -> str:
     token = request.cookies.get("user_access_token")
     if not token:
@@ -132,3 +256,80 @@ class RequireRoles:
                 },
             )
         return user
+
+
+class RateLimitUser:
+    def __init__(self, name: str):
+        self.name = name
+
+    async def __call__(
+        self, user: Annotated[TokenUserSchema, Depends(get_current_user)]
+    ) -> None:
+        await rate_limiter.hit(self.name, f"user:{user.id}")
+
+
+class RateLimitIP:
+    def __init__(self, name: str):
+        self.name = name
+
+    async def __call__(self, request: Request) -> None:
+        # nginx overwrites X-Real-IP with the peer address; client.host comes
+        # from the leftmost X-Forwarded-For (--forwarded-allow-ips='*'),
+        # which the caller controls. No header: running without nginx.
+        ip = request.headers.get("x-real-ip") or request.client.host
+        await rate_limiter.hit(self.name, f"ip:{ip}")
+
+
+class IdempotencyGuard:
+    def __init__(
+        self,
+        service: IdempotencyService,
+        user_id: int,
+        key: str | None,
+        scope: str,
+        request_hash: str,
+    ):
+        self.service = service
+        self.user_id = user_id
+        self.key = key
+        self.scope = scope
+        self.request_hash = request_hash
+
+    async def replay(self) -> ORJSONResponse | None:
+        if self.key is None:
+            return None
+        stored = await self.service.claim(
+            self.user_id, self.key, self.scope, self.request_hash
+        )
+        if stored is None:
+            return None
+        status_code, body = stored
+        return ORJSONResponse(
+            body, status_code=status_code, headers={"Idempotent-Replayed": "true"}
+        )
+
+    async def save(self, response: BaseModel) -> None:
+        if self.key is not None:
+            await self.service.save_response(
+                self.user_id,
+                self.key,
+                status.HTTP_200_OK,
+                response.model_dump(mode="json"),
+            )
+
+
+async def get_idempotency_guard(
+    request: Request,
+    user: Annotated[TokenUserSchema, Depends(get_current_user)],
+    idempotency_service: Annotated[
+        IdempotencyService, Depends(get_idempotency_service)
+    ],
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None,
+) -> IdempotencyGuard:
+    return IdempotencyGuard(
+        service=idempotency_service,
+        user_id=user.id,
+        key=idempotency_key,
+        scope=f"{request.method} {request.url.path}",
+        request_hash=request_fingerprint(await request.body()),
+    )
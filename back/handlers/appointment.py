@@ -1,41 +1,70 @@
+import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response, StreamingResponse
 
 from dependencies import (
+    IdempotencyGuard,
+    RateLimitUser,
     RequireRoles,
     get_appointment_service,
+    get_capacity_report_service,
+    get_idempotency_guard,
+    get_outbox_service,
 )
+from infrastructure.events import EventBroker, get_event_broker, sse_stream
 from schemas.appointment import (
     AppointmentCreateSchema,
     AppointmentUpdateSchema,
     AppointmentFilterSchema,
+    AppointmentSchema,
+    AppointmentWithDoctorSchema,
+    DoctorUnavailableSchema,
+    DoctorUnavailableResultSchema,
 )
 from schemas.auth import TokenUserSchema
+from schemas.capacity_report import CapacityReportFormatEnum, CapacityReportSchema
+from schemas.common import MessageSchema
+from schemas.outbox import OutboxStatsSchema
+from schemas.waitlist import WaitlistEntrySchema, WaitlistJoinSchema
 from services.appointment import AppointmentService
+from services.capacity_report import CapacityReportService, capacity_report_csv
+from services.outbox import OutboxService
 
 router = APIRouter(prefix="/appointment", tags=["appointment"])
 
 
-@router.post("/", description="создание записи")
+@router.post(
+    "/",
+    description="создание записи",
+    response_model=AppointmentSchema,
+    dependencies=[Depends(RateLimitUser("appointment"))],
+)
 async def create_appointment(
     appointment_data: AppointmentCreateSchema,
     user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin", "user"))],
     appointment_service: Annotated[
         AppointmentService, Depends(get_appointment_service)
     ],
+    idempotency: Annotated[IdempotencyGuard, Depends(get_idempotency_guard)],
 ):
+    replayed = await idempotency.replay()
+    if replayed is not None:
+        return replayed
 
     appointment = await appointment_service.create_appointment(
         user_id=user_data.id, appointment_data=appointment_data
     )
 
+    await idempotency.save(AppointmentSchema.model_validate(appointment))
     return appointment
 
 
 @router.patch(
     "/{appointment_id}/status",
     description="сменить статус любой записи админом",
+    response_model=AppointmentSchema,
     dependencies=[Depends(RequireRoles("admin"))],
 )
 async def change_appointment_status(
@@ -54,9 +83,29 @@ async def change_appointment_status(
     return appointment
 
 
+@router.post(
+    "/doctor/{doctor_id}/unavailable",
+    description="врач недоступен: отменить или перенести к другому врачу "
+    "той же специализации все его записи за период",
+    response_model=DoctorUnavailableResultSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def mark_doctor_unavailable(
+    doctor_id: int,
+    unavailable_data: DoctorUnavailableSchema,
+    appointment_service: Annotated[
+        AppointmentService, Depends(get_appointment_service)
+    ],
+):
+    return await appointment_service.mark_doctor_unavailable(
+        doctor_id=doctor_id, unavailable_data=unavailable_data
+    )
+
+
 @router.get(
     "/",
     description="список записей плюс фильтры",
+    response_model=list[AppointmentWithDoctorSchema],
     dependencies=[Depends(RequireRoles("user", "admin"))],
 )
 async def get_appointments(
@@ -67,3 +116,106 @@ async def get_appointments(
 ):
     appointments = await appointment_service.get_appointments(filters)
     return appointments
+
+
+@router.get(
+    "/events",
+    description="поток изменений записей врача (SSE) вместо опроса списка "
+    "записей, можно ограничить одним днём; событие resync значит, что часть "
+    "изменений пропущена и слоты надо перечитать",
+    dependencies=[Depends(RequireRoles("user", "admin"))],
+)
+async def stream_appointment_events(
+    doctor_id: int,
+    event_broker: Annotated[EventBroker, Depends(get_event_broker)],
+    date: datetime.date | None = None,
+):
+    return StreamingResponse(
+        sse_stream(event_broker, doctor_id, date),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/outbox/stats",
+    description="очередь событий для внешних потребителей: сколько не "
+    "доставлено и насколько отстаёт доставка",
+    response_model=OutboxStatsSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def get_outbox_stats(
+    outbox_service: Annotated[OutboxService, Depends(get_outbox_service)],
+):
+    return await outbox_service.get_stats()
+
+
+@router.get(
+    "/reports/capacity",
+    description="спрос по специализациям, дням недели и слотам за период "
+    "(включая архив), доля отмен и прогноз перегрузки; format=csv отдаёт "
+    "таблицу вместо массивов",
+    response_model=CapacityReportSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def get_capacity_report(
+    date_from: datetime.date,
+    date_to: datetime.date,
+    report_service: Annotated[
+        CapacityReportService, Depends(get_capacity_report_service)
+    ],
+    format: CapacityReportFormatEnum = CapacityReportFormatEnum.JSON,
+):
+    report = await report_service.get_capacity_report(date_from, date_to)
+    if format == CapacityReportFormatEnum.CSV:
+        return Response(capacity_report_csv(report), media_type="text/csv")
+    return report
+
+
+@router.post(
+    "/waitlist",
+    description="встать в очередь на занятый слот, при отмене записи первый "
+    "в очереди записывается автоматически",
+    response_model=WaitlistEntrySchema,
+    dependencies=[Depends(RateLimitUser("appointment"))],
+)
+async def join_waitlist(
+    waitlist_data: WaitlistJoinSchema,
+    user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin", "user"))],
+    appointment_service: Annotated[
+        AppointmentService, Depends(get_appointment_service)
+    ],
+):
+    return await appointment_service.join_waitlist(
+        user_id=user_data.id, waitlist_data=waitlist_data
+    )
+
+
+@router.get(
+    "/waitlist",
+    description="мои места в очередях",
+    response_model=list[WaitlistEntrySchema],
+)
+async def get_waitlist(
+    user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin", "user"))],
+    appointment_service: Annotated[
+        AppointmentService, Depends(get_appointment_service)
+    ],
+):
+    return await appointment_service.get_waitlist(user_id=user_data.id)
+
+
+@router.delete(
+    "/waitlist/{entry_id}",
+    description="выйти из очереди",
+    response_model=MessageSchema,
+)
+async def leave_waitlist(
+    entry_id: int,
+    user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin", "user"))],
+    appointment_service: Annotated[
+        AppointmentService, Depends(get_appointment_service)
+    ],
+):
+    await appointment_service.leave_waitlist(user_id=user_data.id, entry_id=entry_id)
+    return {"msg": "Left the waitlist"}
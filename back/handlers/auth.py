@@ -6,11 +6,13 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from core.exceptions import VerificationError
 from dependencies import (
+    RateLimitIP,
     get_auth_service,
     get_current_user,
     get_refresh_token,
 )
 from schemas.auth import TokenUserSchema
+from schemas.common import MessageSchema
 from schemas.user import UserVerifySchema
 from services.auth import AuthService
 
@@ -24,12 +26,16 @@ security = HTTPBearer(auto_error=True)
 #   -d ''
 
 
-@router.post("/telegram")
+@router.post(
+    "/telegram",
+    response_model=MessageSchema,
+    dependencies=[Depends(RateLimitIP("auth"))],
+)
 async def login(
         response: Response,
         credentials: Annotated[HTTPAuthorizationCredentials, Security(security)],
         auth_service: Annotated[AuthService, Depends(get_auth_service)],
-) -> dict:
+):
     scheme = (credentials.scheme or "").lower()
     if scheme not in ("tma", "bearer"):
         raise HTTPException(status_code=401, detail="Invalid scheme")
@@ -60,13 +66,14 @@ async def login(
 @router.post(
     "/verify",
     description="шлем поля пол возраст итд, получаем роль юзера и новый access с этой ролью",
+    response_model=MessageSchema,
 )
 async def verify_account(
     response: Response,
     user_verify_data: UserVerifySchema,
     user_data: Annotated[TokenUserSchema, Depends(get_current_user)],
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
-) -> dict:
+):
     try:
         access_token = await auth_service.verify(
             user_id=user_data.id, user_verify_data=user_verify_data
@@ -86,7 +93,12 @@ async def verify_account(
     return {"msg": "ok"}
 
 
-@router.post("/refresh", description="если access протухший/отсутствует то идем сюда")
+@router.post(
+    "/refresh",
+    description="если access протухший/отсутствует то идем сюда",
+    response_model=MessageSchema,
+    dependencies=[Depends(RateLimitIP("auth"))],
+)
 async def refresh_tokens(
     response: Response,
     refresh_token: Annotated[str, Depends(get_refresh_token)],
@@ -95,7 +107,7 @@ async def refresh_tokens(
     access_token, new_refresh_token = await auth_service.refresh_tokens(refresh_token)
     response.set_cookie(
         key="user_refresh_token",
-        value=refresh_token,
+        value=new_refresh_token,
         httponly=True,
         secure=True,
         samesite="none",
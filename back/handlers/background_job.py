@@ -0,0 +1,56 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+
+from dependencies import RequireRoles, get_background_job_service
+from schemas.auth import TokenUserSchema
+from schemas.background_job import (
+    BackgroundJobCreateSchema,
+    BackgroundJobFilterSchema,
+    BackgroundJobSchema,
+)
+from services.background_job import BackgroundJobService
+
+router = APIRouter(prefix="/job", tags=["job"])
+
+
+@router.post(
+    "/",
+    description="поставить тяжёлую операцию в очередь фонового обработчика "
+    "(worker.py); ход выполнения - GET /job/{id}",
+    response_model=BackgroundJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_job(
+    job_data: BackgroundJobCreateSchema,
+    user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin"))],
+    job_service: Annotated[BackgroundJobService, Depends(get_background_job_service)],
+):
+    return await job_service.enqueue(job_data, user_data.id)
+
+
+@router.get(
+    "/",
+    description="последние фоновые задачи плюс фильтры",
+    response_model=list[BackgroundJobSchema],
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def get_jobs(
+    filters: Annotated[BackgroundJobFilterSchema, Depends()],
+    job_service: Annotated[BackgroundJobService, Depends(get_background_job_service)],
+    limit: int = Query(50, ge=1, le=500),
+):
+    return await job_service.get_jobs(filters, limit)
+
+
+@router.get(
+    "/{job_id}",
+    description="статус и результат фоновой задачи",
+    response_model=BackgroundJobSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def get_job(
+    job_id: int,
+    job_service: Annotated[BackgroundJobService, Depends(get_background_job_service)],
+):
+    return await job_service.get_job(job_id)
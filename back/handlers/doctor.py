@@ -1,24 +1,66 @@
+import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi import status
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import Request, status
 
+from core.config import settings
 from core.exceptions import (
     DoctorAlreadyExistsError,
+    DoctorImportTooLargeError,
     DoctorNotFoundError,
 )
 from dependencies import (
     RequireRoles,
     get_doctor_service,
+    get_doctor_schedule_service,
+    get_doctor_stats_service,
+)
+from models.doctor import SpecializationEnum
+from schemas.doctor import (
+    DoctorCreateSchema,
+    DoctorFilterSchema,
+    DoctorImportReportSchema,
+    DoctorSchema,
+    DoctorSummarySchema,
+    DoctorUpdateSchema,
+)
+from schemas.doctor_daily_stats import DoctorDailyStatsSchema
+from schemas.doctor_schedule import (
+    DoctorDaySlotsSchema,
+    DoctorScheduleExceptionCreateSchema,
+    DoctorScheduleExceptionSchema,
+    DoctorScheduleSchema,
+    DoctorScheduleUpdateSchema,
+    FreeSlotSchema,
 )
-from schemas.doctor import DoctorCreateSchema, DoctorFilterSchema, DoctorUpdateSchema
 from services.doctor import DoctorService
+from services.doctor_daily_stats import DoctorDailyStatsService
+from services.doctor_schedule import DoctorScheduleService
 
 router = APIRouter(prefix="/doctor", tags=["doctor"])
 
 
+async def _read_body(request: Request, max_bytes: int) -> bytes:
+    # Content-Length rejects honest oversized uploads before reading; the
+    # bounded read covers chunked bodies and a wrong header
+    extra = {"max_bytes": max_bytes}
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise DoctorImportTooLargeError(extra=extra)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise DoctorImportTooLargeError(extra=extra)
+    return bytes(body)
+
+
 @router.post(
-    "/", description="создание врача", dependencies=[Depends(RequireRoles("admin"))]
+    "/",
+    description="создание врача",
+    response_model=DoctorSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
 )
 async def create_doctor(
     doctor_data: DoctorCreateSchema,
@@ -32,9 +74,26 @@ async def create_doctor(
     return doctor
 
 
+@router.post(
+    "/import",
+    description="массовый импорт врачей из CSV или JSON (тело запроса - файл)",
+    response_model=DoctorImportReportSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def import_doctors(
+    request: Request,
+    doctor_service: Annotated[DoctorService, Depends(get_doctor_service)],
+):
+    return await doctor_service.import_doctors(
+        content=await _read_body(request, settings.DOCTOR_IMPORT_MAX_BYTES),
+        content_type=request.headers.get("content-type", "text/csv"),
+    )
+
+
 @router.patch(
     "/{doctor_id}",
     description="обновление врача",
+    response_model=DoctorSchema,
     dependencies=[Depends(RequireRoles("admin"))],
 )
 async def update_doctor(
@@ -53,6 +112,7 @@ async def update_doctor(
 @router.delete(
     "/{doctor_id}",
     description="удаление врача",
+    response_model=dict[str, str],
     dependencies=[Depends(RequireRoles("admin"))],
 )
 async def delete_doctor(
@@ -70,6 +130,7 @@ async def delete_doctor(
 @router.get(
     "/",
     description="список врачей плюс фильтры",
+    response_model=list[DoctorSchema],
     dependencies=[Depends(RequireRoles("user", "admin"))],
 )
 async def get_doctors(
@@ -80,9 +141,64 @@ async def get_doctors(
     return doctors
 
 
+@router.get(
+    "/search",
+    description="поиск врача по началу фамилии, имени или отчества без учёта "
+    "регистра, с опечатками; лучшие совпадения первыми",
+    response_model=list[DoctorSummarySchema],
+    dependencies=[Depends(RequireRoles("user", "admin"))],
+)
+async def search_doctors(
+    doctor_service: Annotated[DoctorService, Depends(get_doctor_service)],
+    q: str = Query(min_length=1, max_length=100),
+    specialization: SpecializationEnum | None = None,
+    limit: int = Query(10, ge=1, le=50),
+):
+    return await doctor_service.search_doctors(q, specialization, limit)
+
+
+@router.get(
+    "/earliest-slots",
+    description="ближайшие свободные слоты по специализации (врач, дата, слот)",
+    response_model=list[FreeSlotSchema],
+    dependencies=[Depends(RequireRoles("user", "admin"))],
+)
+async def get_earliest_slots(
+    specialization: SpecializationEnum,
+    schedule_service: Annotated[
+        DoctorScheduleService, Depends(get_doctor_schedule_service)
+    ],
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    limit: int = Query(10, ge=1, le=100),
+):
+    return await schedule_service.find_earliest_slots(
+        specialization, date_from, date_to, limit
+    )
+
+
+@router.get(
+    "/stats",
+    description="загрузка врачей по дням: записи по статусам, доля занятых "
+    "слотов и отмен (из предрасчитанной таблицы)",
+    response_model=list[DoctorDailyStatsSchema],
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def get_doctor_stats(
+    date_from: datetime.date,
+    date_to: datetime.date,
+    stats_service: Annotated[
+        DoctorDailyStatsService, Depends(get_doctor_stats_service)
+    ],
+    doctor_id: int | None = None,
+):
+    return await stats_service.get_daily_stats(date_from, date_to, doctor_id)
+
+
 @router.get(
     "/{doctor_id}",
     description="получение врача по id",
+    response_model=DoctorSchema,
     dependencies=[Depends(RequireRoles("admin"))],
 )
 async def get_doctor_by_id(
@@ -95,3 +211,85 @@ async def get_doctor_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
         )
     return doctor
+
+
+@router.get(
+    "/{doctor_id}/slots",
+    description="свободные слоты врача по дням за период",
+    response_model=list[DoctorDaySlotsSchema],
+    dependencies=[Depends(RequireRoles("user", "admin"))],
+)
+async def get_doctor_free_slots(
+    doctor_id: int,
+    date_from: datetime.date,
+    date_to: datetime.date,
+    schedule_service: Annotated[
+        DoctorScheduleService, Depends(get_doctor_schedule_service)
+    ],
+):
+    return await schedule_service.get_free_slots(doctor_id, date_from, date_to)
+
+
+@router.get(
+    "/{doctor_id}/schedule",
+    description="недельный график врача и исключения",
+    response_model=DoctorScheduleSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def get_doctor_schedule(
+    doctor_id: int,
+    schedule_service: Annotated[
+        DoctorScheduleService, Depends(get_doctor_schedule_service)
+    ],
+):
+    return await schedule_service.get_schedule(doctor_id)
+
+
+@router.put(
+    "/{doctor_id}/schedule",
+    description="задать недельный график врача (дни без слотов - выходные)",
+    response_model=DoctorScheduleSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def set_doctor_schedule(
+    doctor_id: int,
+    schedule_data: DoctorScheduleUpdateSchema,
+    schedule_service: Annotated[
+        DoctorScheduleService, Depends(get_doctor_schedule_service)
+    ],
+):
+    return await schedule_service.set_weekly_schedule(doctor_id, schedule_data)
+
+
+@router.put(
+    "/{doctor_id}/schedule/exceptions/{day}",
+    description="исключение из графика на дату (праздник, отпуск, изменённые часы)",
+    response_model=DoctorScheduleExceptionSchema,
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def set_doctor_schedule_exception(
+    doctor_id: int,
+    day: datetime.date,
+    exception_data: DoctorScheduleExceptionCreateSchema,
+    schedule_service: Annotated[
+        DoctorScheduleService, Depends(get_doctor_schedule_service)
+    ],
+):
+    return await schedule_service.set_exception(doctor_id, day, exception_data)
+
+
+@router.delete(
+    "/{doctor_id}/schedule/exceptions/{day}",
+    description="удалить исключение из графика",
+    response_model=dict[str, str],
+    dependencies=[Depends(RequireRoles("admin"))],
+)
+async def delete_doctor_schedule_exception(
+    doctor_id: int,
+    day: datetime.date,
+    schedule_service: Annotated[
+        DoctorScheduleService, Depends(get_doctor_schedule_service)
+    ],
+):
+    await schedule_service.delete_exception(doctor_id, day)
+    return {"message": "Schedule exception deleted"}
@@ -4,7 +4,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi import status, Response
 
 from dependencies import (
+    IdempotencyGuard,
+    RateLimitUser,
     RequireRoles,
+    get_idempotency_guard,
     get_user_repository,
     get_appointment_service,
     get_appointment_repository,
@@ -12,16 +15,21 @@ from dependencies import (
 )
 from repositories.appointment import AppointmentRepository
 from repositories.user import UserRepository
-from schemas.appointment import AppointmentFilterSchema
+from schemas.appointment import AppointmentSchema, AppointmentWithDoctorSchema
 from schemas.auth import TokenUserSchema
-from schemas.user import UserUpdateSchema
+from schemas.common import MessageSchema
+from schemas.user import UserSchema, UserUpdateSchema
 from services.appointment import AppointmentService
 from services.auth import AuthService
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
 
-@router.patch("/", description="редачим свой профиль (поля по которым был вериф акка)")
+@router.patch(
+    "/",
+    description="редачим свой профиль (поля по которым был вериф акка)",
+    response_model=UserSchema,
+)
 async def update_user(
     user_update_data: UserUpdateSchema,
     user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin", "user"))],
@@ -33,7 +41,7 @@ async def update_user(
     return user
 
 
-@router.get("/", description="глянуть свой профиль")
+@router.get("/", description="глянуть свой профиль", response_model=UserSchema)
 async def get_me(
     user_data: Annotated[TokenUserSchema, Depends(RequireRoles("user", "admin"))],
     user_repository: Annotated[UserRepository, Depends(get_user_repository)],
@@ -49,6 +57,8 @@ async def get_me(
 @router.patch(
     "/appointments/{appointment_id}/cancel",
     description="отмена собственной записи",
+    response_model=AppointmentSchema,
+    dependencies=[Depends(RateLimitUser("appointment"))],
 )
 async def cancel_appointment(
     appointment_id: int,
@@ -56,16 +66,24 @@ async def cancel_appointment(
     appointment_service: Annotated[
         AppointmentService, Depends(get_appointment_service)
     ],
+    idempotency: Annotated[IdempotencyGuard, Depends(get_idempotency_guard)],
 ):
+    replayed = await idempotency.replay()
+    if replayed is not None:
+        return replayed
+
     appointment = await appointment_service.cancel_appointment(
         user_id=user_data.id,
         appointment_id=appointment_id,
     )
 
+    await idempotency.save(AppointmentSchema.model_validate(appointment))
     return appointment
 
 
-@router.patch("/become-admin", description="становимся админом")
+@router.patch(
+    "/become-admin", description="становимся админом", response_model=MessageSchema
+)
 async def update_user(
     response: Response,
     user_data: Annotated[TokenUserSchema, Depends(RequireRoles("user"))],
@@ -86,7 +104,11 @@ async def update_user(
     return {"msg": "ok"}
 
 
-@router.patch("/stop-being-admin", description="перестаем быть админом")
+@router.patch(
+    "/stop-being-admin",
+    description="перестаем быть админом",
+    response_model=MessageSchema,
+)
 async def update_user(
     response: Response,
     user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin"))],
@@ -108,14 +130,14 @@ async def update_user(
     return {"msg": "ok"}
 
 
-@router.get("/appointments")
+@router.get("/appointments", response_model=list[AppointmentWithDoctorSchema])
 async def list_my_appointments(
     user_data: Annotated[TokenUserSchema, Depends(RequireRoles("admin", "user"))],
     appointment_repository: Annotated[
         AppointmentRepository, Depends(get_appointment_repository)
     ],
 ):
-    appointments = await appointment_repository.find_all(
-        AppointmentFilterSchema(user_id=user_data.id)
+    appointments = await appointment_repository.get_user_appointments(
+        user_id=user_data.id
     )
     return appointments
@@ -1,14 +1,48 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable
+
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     create_async_engine,
     async_sessionmaker,
     AsyncSession,
 )
 
-from core.config import database_url
+from core.config import database_url, settings
 
 engine = create_async_engine(
-    url=database_url, connect_args={"server_settings": {"timezone": "utc"}}
+    url=database_url,
+    connect_args={"server_settings": {"timezone": "utc"}},
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
 )
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+
+
+async def _warm_connection(
+    connection: AsyncConnection, warm: Callable[[AsyncSession], Awaitable[None]]
+) -> None:
+    async with AsyncSession(bind=connection) as session:
+        try:
+            await warm(session)
+        finally:
+            await session.rollback()
+
+
+async def warm_up_pool(
+    connections: int, warm: Callable[[AsyncSession], Awaitable[None]]
+) -> None:
+    # Connections are held open together so the pool really creates that
+    # many, and each one runs `warm` so asyncpg has the statements prepared
+    # on it. Anything beyond pool_size would be closed again on release.
+    connections = min(connections, settings.DB_POOL_SIZE)
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+        await asyncio.gather(
+            *(_warm_connection(connection, warm) for connection in opened)
+        )
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Awaitable, Callable
+
+from core.config import settings
+from models.doctor import SpecializationEnum
+from schemas.doctor import DoctorSummaryRow
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class DoctorPrefixIndex:
+    # Sorted (key, rank, doctor id) entries, one per doctor for the whole
+    # "surname first_name middle_name" string (rank 0) and one for each
+    # other name part (rank 1); a prefix lookup is a bisect plus a scan of
+    # the matching range. Same ranking as DoctorRepository.search_doctors,
+    # without the fuzzy matches.
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._keys: list[str] = []
+        self._entries: list[tuple[int, int]] = []
+        self._names: dict[int, str] = {}
+        self._doctors: dict[int, DoctorSummaryRow] = {}
+        self._built_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._built_at = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._built_at is not None
+            and time.monotonic() - self._built_at < self.ttl_seconds
+        )
+
+    def build(self, doctors: list[DoctorSummaryRow]) -> None:
+        entries = []
+        names = {}
+        for doctor in doctors:
+            parts = [doctor.surname, doctor.first_name, doctor.middle_name]
+            names[doctor.id] = normalize_query(" ".join(parts))
+            entries.append((names[doctor.id], 0, doctor.id))
+            for part in parts[1:]:
+                entries.append((normalize_query(part), 1, doctor.id))
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        self._entries = [(rank, doctor_id) for _, rank, doctor_id in entries]
+        self._names = names
+        self._doctors = {doctor.id: doctor for doctor in doctors}
+        self._built_at = time.monotonic()
+
+    async def ensure_fresh(
+        self, load: Callable[[], Awaitable[list[DoctorSummaryRow]]]
+    ) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            # another request may have rebuilt it while this one waited
+            if not self._is_fresh():
+                self.build(await load())
+
+    def search(
+        self,
+        query: str,
+        specialization: SpecializationEnum | None,
+        limit: int,
+    ) -> list[DoctorSummaryRow]:
+        query = normalize_query(query)
+        ranks: dict[int, int] = {}
+        position = bisect_left(self._keys, query)
+        while position < len(self._keys) and self._keys[position].startswith(query):
+            rank, doctor_id = self._entries[position]
+            if rank < ranks.get(doctor_id, 2):
+                ranks[doctor_id] = rank
+            position += 1
+        found = sorted(
+            (rank, self._names[doctor_id], doctor_id)
+            for doctor_id, rank in ranks.items()
+            if specialization is None
+            or self._doctors[doctor_id].specialization == specialization
+        )
+        return [self._doctors[doctor_id] for _, _, doctor_id in found[:limit]]
+
+
+doctor_prefix_index = DoctorPrefixIndex(settings.DOCTOR_SEARCH_INDEX_TTL_SECONDS)
+
+
+def get_doctor_prefix_index():
+    return doctor_prefix_index
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import signal
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import date
+
+import asyncpg
+import orjson
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APPOINTMENT_EVENTS_CHANNEL = "appointment_events"
+
+# markers put into a subscriber queue next to raw event payloads
+RESYNC = object()
+CLOSED = object()
+
+
+class Subscription:
+    def __init__(self, doctor_id: int, day: date | None, queue_size: int):
+        self.doctor_id = doctor_id
+        # payloads carry ISO dates, compare strings instead of parsing each one
+        self.day = day.isoformat() if day is not None else None
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    def put(self, item) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # slow client: drop what it has not read and make it refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    def close(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(CLOSED)
+
+
+class EventBroker:
+    # One LISTEN connection per worker, fanned out in memory to every
+    # subscriber of the doctor (and day) an event is about.
+    def __init__(self, channel: str, queue_size: int):
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._closing = False
+
+    async def start(self) -> None:
+        self._closing = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        self.close_subscriptions()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def close_subscriptions(self) -> None:
+        # ends every open stream; streams opened afterwards end right away
+        self._closing = True
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    def close_on_exit_signal(self) -> None:
+        # uvicorn waits for open responses before the lifespan shutdown runs
+        # and a stream never ends by itself, so close them as soon as the
+        # exit signal arrives and then hand it on to uvicorn's handler
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(sig)
+            if not callable(previous):
+                continue
+
+            def handler(signum, frame, previous=previous):
+                loop.call_soon_threadsafe(self.close_subscriptions)
+                previous(signum, frame)
+
+            signal.signal(sig, handler)
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(
+            host=settings.DB_HOST,
+            port=settings.DB_PORT,
+            user=settings.DB_USER,
+            password=settings.DB_PASSWORD,
+            database=settings.DB_NAME,
+        )
+        await connection.add_listener(self.channel, self._on_notify)
+        connection.add_termination_listener(self._on_terminate)
+        self._connection = connection
+
+    def _on_terminate(self, connection: asyncpg.Connection) -> None:
+        if not self._closing:
+            logger.warning("event listener connection lost, reconnecting")
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1
+        while not self._closing:
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+            else:
+                # notifications sent meanwhile are lost
+                self._broadcast(RESYNC)
+                return
+
+    def _broadcast(self, item) -> None:
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.put(item)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        event = orjson.loads(payload)
+        # a reassignment frees the slot at the previous doctor
+        doctor_ids = {event["doctor_id"], event.get("previous_doctor_id")}
+        for doctor_id in doctor_ids:
+            for subscription in self._subscribers.get(doctor_id, ()):
+                if subscription.day is None or subscription.day == event["date"]:
+                    subscription.put(payload)
+
+    @asynccontextmanager
+    async def subscribe(self, doctor_id: int, day: date | None = None):
+        subscription = Subscription(doctor_id, day, self.queue_size)
+        if self._closing:
+            subscription.close()
+        self._subscribers[doctor_id].add(subscription)
+        try:
+            yield subscription.queue
+        finally:
+            subscriptions = self._subscribers[doctor_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[doctor_id]
+
+
+async def sse_stream(broker: EventBroker, doctor_id: int, day: date | None):
+    async with broker.subscribe(doctor_id, day) as queue:
+        # EventSource reconnect delay; also sends the headers right away
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), settings.EVENTS_PING_SECONDS)
+            except asyncio.TimeoutError:
+                # keeps proxies from closing an idle stream
+                yield ": ping\n\n"
+                continue
+            if item is CLOSED:
+                return
+            if item is RESYNC:
+                yield "event: resync\ndata: {}\n\n"
+            else:
+                yield f"event: appointment\ndata: {item}\n\n"
+
+
+event_broker = EventBroker(APPOINTMENT_EVENTS_CHANNEL, settings.EVENTS_QUEUE_SIZE)
+
+
+def get_event_broker():
+    return event_broker
@@ -0,0 +1,144 @@
+import math
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from sqlalchemy import Float, bindparam, cast, delete, func, literal_column, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.config import settings
+from core.exceptions import RateLimitExceededError
+from infrastructure.database import engine
+from models.rate_limit_bucket import RateLimitBucket
+
+
+def _parse_limit(limit: str) -> tuple[float, float]:
+    # "10/60" -> capacity 10, refill 10 tokens per 60 seconds
+    requests, seconds = limit.split("/")
+    return float(requests), float(requests) / float(seconds)
+
+
+class MemoryBucketStore:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        # returns 0 if a token was taken, else seconds until the next one
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+        if not wait:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            # least recently used bucket has refilled the longest
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def give_back(self, key: str, capacity: float) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets[key] = (min(capacity, bucket[0] + 1), bucket[1])
+
+    async def delete_idle(self, idle_seconds: int) -> None:
+        # bounded by max_keys already
+        pass
+
+
+class PostgresBucketStore:
+    # One upsert per hit. The conflict branch refills and takes a token only
+    # WHERE a token is available, so an empty bucket returns no row and is
+    # left untouched.
+    def __init__(self):
+        # typed binds: untyped ones are inferred as INTEGER and asyncpg
+        # truncates a rate like 10/60 to 0, so buckets would never refill
+        capacity = bindparam("capacity", type_=Float)
+        elapsed = cast(
+            func.extract("epoch", func.now() - RateLimitBucket.updated_at), Float
+        )
+        refilled = func.least(
+            capacity,
+            RateLimitBucket.tokens + elapsed * bindparam("rate", type_=Float),
+        )
+        query = pg_insert(RateLimitBucket).values(
+            key=bindparam("key"),
+            tokens=capacity - 1,
+            updated_at=func.now(),
+        )
+        self._take = query.on_conflict_do_update(
+            index_elements=[RateLimitBucket.key],
+            set_={"tokens": refilled - 1, "updated_at": func.now()},
+            where=refilled >= 1,
+        ).returning(literal_column("1"))
+        self._give_back = (
+            update(RateLimitBucket)
+            .where(RateLimitBucket.key == bindparam("key"))
+            .values(tokens=func.least(capacity, RateLimitBucket.tokens + 1))
+        )
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        async with engine.begin() as connection:
+            res = await connection.execute(
+                self._take, {"key": key, "capacity": capacity, "rate": rate}
+            )
+            return 0.0 if res.first() else 1 / rate
+
+    async def give_back(self, key: str, capacity: float) -> None:
+        async with engine.begin() as connection:
+            await connection.execute(
+                self._give_back, {"key": key, "capacity": capacity}
+            )
+
+    async def delete_idle(self, idle_seconds: int) -> None:
+        async with engine.begin() as connection:
+            await connection.execute(
+                delete(RateLimitBucket).where(
+                    RateLimitBucket.updated_at
+                    < func.now() - timedelta(seconds=idle_seconds)
+                )
+            )
+
+
+class RateLimiter:
+    def __init__(self, limits: dict[str, str], store):
+        self.limits = {name: _parse_limit(limit) for name, limit in limits.items()}
+        self.store = store
+
+    async def hit(self, name: str, key: str) -> None:
+        taken = []
+        for bucket, bucket_key in ((name, key), (f"{name}:global", "*")):
+            limit = self.limits.get(bucket)
+            if limit is None:
+                continue
+            store_key = f"{bucket}:{bucket_key}"
+            wait = await self.store.take(store_key, *limit)
+            if wait:
+                # a request rejected by the global bucket must not cost the
+                # caller their own quota
+                for taken_key, (capacity, _) in taken:
+                    await self.store.give_back(taken_key, capacity)
+                raise RateLimitExceededError(retry_after=math.ceil(wait))
+            taken.append((store_key, limit))
+
+    async def delete_idle(self) -> None:
+        # a bucket idle for its whole period is full, same as having no row
+        longest = max(
+            (capacity / rate for capacity, rate in self.limits.values()), default=0
+        )
+        await self.store.delete_idle(math.ceil(longest))
+
+
+rate_limiter = RateLimiter(
+    settings.RATE_LIMITS,
+    (
+        PostgresBucketStore()
+        if settings.RATE_LIMIT_BACKEND == "postgres"
+        else MemoryBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+    ),
+)
+
+
+def get_rate_limiter():
+    return rate_limiter
@@ -1,3 +1,12 @@
+import asyncio
+from collections import Counter
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 scheduler = AsyncIOScheduler(
@@ -5,5 +14,44 @@ scheduler = AsyncIOScheduler(
     job_defaults={"coalesce": False, "max_instances": 1},
 )
 
+# job id -> submitted runs not finished yet; every run time of a submission
+# ends with an executed, error or missed event
+_running_jobs: Counter[str] = Counter()
+_jobs_idle = asyncio.Event()
+_jobs_idle.set()
+
+
+def _track_running_jobs(event) -> None:
+    if event.code == EVENT_JOB_SUBMITTED:
+        _running_jobs[event.job_id] += len(event.scheduled_run_times)
+    else:
+        _running_jobs[event.job_id] -= 1
+        if _running_jobs[event.job_id] <= 0:
+            del _running_jobs[event.job_id]
+    if _running_jobs:
+        _jobs_idle.clear()
+    else:
+        _jobs_idle.set()
+
+
+scheduler.add_listener(
+    _track_running_jobs,
+    EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED,
+)
+
+
 def get_scheduler():
-    return scheduler
\ No newline at end of file
+    return scheduler
+
+
+async def drain_scheduler(timeout: float) -> None:
+    # AsyncIOExecutor.shutdown cancels coroutine jobs that are still running,
+    # so stop new runs first and give the running ones time to finish
+    if not scheduler.running:
+        return
+    scheduler.pause()
+    try:
+        await asyncio.wait_for(_jobs_idle.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    scheduler.shutdown(wait=False)
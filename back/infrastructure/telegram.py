@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import httpx
+
+from core.config import settings
+from core.exceptions import TelegramSendError
+
+
+class TelegramBotClient:
+    # Pooled Bot API client. At most `max_concurrency` requests are in
+    # flight and request starts are paced to `messages_per_second`; a 429
+    # pauses every sender for the retry_after Telegram asks for.
+    def __init__(
+        self,
+        api_url: str,
+        token: str,
+        max_concurrency: int,
+        messages_per_second: float,
+        max_retries: int,
+        timeout: float,
+    ):
+        self.api_url = api_url
+        self.token = token
+        self.max_concurrency = max_concurrency
+        self.interval = 1 / messages_per_second
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pace_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.api_url}/bot{self.token}/",
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _wait_turn(self) -> None:
+        async with self._pace_lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        await asyncio.sleep(start - now)
+
+    def _pause(self, seconds: float) -> None:
+        self._next_start = max(self._next_start, time.monotonic() + seconds)
+
+    @staticmethod
+    def _parse_error(response: httpx.Response) -> dict | None:
+        # Bot API errors are JSON; anything else came from a proxy on the way
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._wait_turn()
+                try:
+                    response = await self.client.post(
+                        "sendMessage", json={"chat_id": chat_id, "text": text}
+                    )
+                except httpx.HTTPError as e:
+                    # connect errors, timeouts, broken connections
+                    error = TelegramSendError(repr(e))
+                    delay = 2**attempt
+                else:
+                    if response.status_code == 200:
+                        return
+                    body = self._parse_error(response)
+                    if body is None:
+                        error = TelegramSendError(
+                            f"{response.status_code} {response.reason_phrase}"
+                        )
+                        delay = 2**attempt
+                    elif response.status_code == 429:
+                        # the pause also delays this retry through _wait_turn
+                        self._pause(body.get("parameters", {}).get("retry_after", 1))
+                        error = TelegramSendError(body.get("description"))
+                        delay = 0
+                    elif response.status_code >= 500:
+                        error = TelegramSendError(body.get("description"))
+                        delay = 2**attempt
+                    else:
+                        # bad request, bot blocked, chat not found
+                        raise TelegramSendError(body.get("description"), permanent=True)
+                if attempt < self.max_retries:
+                    await asyncio.sleep(delay)
+            raise error
+
+
+telegram_bot = TelegramBotClient(
+    api_url=settings.TELEGRAM_API_URL,
+    token=settings.BOT_TOKEN,
+    max_concurrency=settings.TELEGRAM_MAX_CONCURRENCY,
+    messages_per_second=settings.TELEGRAM_MESSAGES_PER_SECOND,
+    max_retries=settings.TELEGRAM_MAX_RETRIES,
+    timeout=settings.TELEGRAM_TIMEOUT_SECONDS,
+)
+
+
+def get_telegram_bot():
+    return telegram_bot
@@ -1,22 +1,59 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from infrastructure.scheduler import get_scheduler
+from fastapi.responses import ORJSONResponse
+from infrastructure.database import engine
+from infrastructure.events import get_event_broker
+from infrastructure.scheduler import drain_scheduler, get_scheduler
+from infrastructure.telegram import get_telegram_bot
 from core.exceptions import AppError
 from core.config import settings
 from exception_handlers import app_error_handler, exception_handler
 from handlers.appointment import router as appointment_router
 from handlers.auth import router as auth_router
+from handlers.background_job import router as background_job_router
 from handlers.doctor import router as doctor_router
 from handlers.profile import router as profile_router
+from services.jobs.archive_appointments import archive_appointments
+from services.jobs.cleanup_background_jobs import cleanup_background_jobs
+from services.jobs.cleanup_idempotency_keys import cleanup_idempotency_keys
+from services.jobs.cleanup_rate_limit_buckets import cleanup_rate_limit_buckets
+from services.jobs.dispatch_outbox import dispatch_outbox
 from services.jobs.finish_appointments import finish_appointments
+from services.jobs.maintain_appointment_partitions import (
+    maintain_appointment_partitions,
+)
+from services.jobs.refresh_doctor_daily_stats import refresh_doctor_daily_stats
+from services.jobs.refresh_slot_calendar import refresh_slot_calendar
+from services.jobs.send_reminders import send_reminders
+from services.warmup import warm_up_database
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_database()
+    start_scheduler()
+    await get_event_broker().start()
+    get_event_broker().close_on_exit_signal()
+    yield
+    # uvicorn has already drained in-flight requests
+    # (--timeout-graceful-shutdown) by the time this runs; event streams were
+    # closed when the exit signal arrived
+    await drain_scheduler(settings.SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS)
+    await get_event_broker().stop()
+    await get_telegram_bot().aclose()
+    await engine.dispose()
 
-app = FastAPI()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.include_router(auth_router)
 app.include_router(doctor_router)
 app.include_router(profile_router)
 app.include_router(appointment_router)
+app.include_router(background_job_router)
 
 app.add_exception_handler(AppError, app_error_handler)
 app.add_exception_handler(Exception, exception_handler)
@@ -34,8 +71,7 @@ app.add_middleware(
     expose_headers=["Set-Cookie"],
 )
 
-@app.on_event("startup")
-async def start_scheduler():
+def start_scheduler():
     scheduler = get_scheduler()
 
     if scheduler.get_job("finish_appointments") is None:
@@ -47,4 +83,94 @@ async def start_scheduler():
             replace_existing=False,
         )
 
+    if scheduler.get_job("refresh_slot_calendar") is None:
+        scheduler.add_job(
+            refresh_slot_calendar,
+            trigger="cron",
+            hour=0,
+            minute=5,
+            next_run_time=datetime.now(timezone.utc),
+            id="refresh_slot_calendar",
+            replace_existing=False,
+        )
+
+    if scheduler.get_job("maintain_appointment_partitions") is None:
+        scheduler.add_job(
+            maintain_appointment_partitions,
+            trigger="cron",
+            hour=0,
+            minute=10,
+            next_run_time=datetime.now(timezone.utc),
+            id="maintain_appointment_partitions",
+            replace_existing=False,
+        )
+
+    if scheduler.get_job("archive_appointments") is None:
+        scheduler.add_job(
+            archive_appointments,
+            trigger="cron",
+            hour=0,
+            minute=20,
+            id="archive_appointments",
+            replace_existing=False,
+        )
+
+    if scheduler.get_job("refresh_doctor_daily_stats") is None:
+        scheduler.add_job(
+            refresh_doctor_daily_stats,
+            trigger="interval",
+            seconds=settings.DOCTOR_STATS_ROLLUP_SECONDS,
+            next_run_time=datetime.now(timezone.utc),
+            id="refresh_doctor_daily_stats",
+            replace_existing=False,
+        )
+
+    if scheduler.get_job("cleanup_idempotency_keys") is None:
+        scheduler.add_job(
+            cleanup_idempotency_keys,
+            trigger="cron",
+            minute=15,
+            id="cleanup_idempotency_keys",
+            replace_existing=False,
+        )
+
+    if scheduler.get_job("cleanup_background_jobs") is None:
+        scheduler.add_job(
+            cleanup_background_jobs,
+            trigger="cron",
+            minute=30,
+            id="cleanup_background_jobs",
+            replace_existing=False,
+        )
+
+    if scheduler.get_job("dispatch_outbox") is None:
+        scheduler.add_job(
+            dispatch_outbox,
+            trigger="interval",
+            seconds=settings.OUTBOX_DISPATCH_SECONDS,
+            id="dispatch_outbox",
+            replace_existing=False,
+        )
+
+    if scheduler.get_job("send_reminders") is None:
+        scheduler.add_job(
+            send_reminders,
+            trigger="cron",
+            minute="*",
+            id="send_reminders",
+            replace_existing=False,
+        )
+
+    if (
+        settings.RATE_LIMIT_BACKEND == "postgres"
+        and scheduler.get_job("cleanup_rate_limit_buckets") is None
+    ):
+        scheduler.add_job(
+            cleanup_rate_limit_buckets,
+            trigger="cron",
+            minute=45,
+            id="cleanup_rate_limit_buckets",
+            replace_existing=False,
+        )
+
     scheduler.start()
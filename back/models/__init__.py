@@ -1,3 +1,16 @@
 from .appointment import Appointment
 from .doctor import Doctor
 from .user import User
+from .doctor_schedule import (
+    DoctorScheduleTemplate,
+    DoctorScheduleException,
+    DoctorSlotCalendar,
+)
+from .waitlist import WaitlistEntry
+from .idempotency_key import IdempotencyKey
+from .rate_limit_bucket import RateLimitBucket
+from .outbox_event import OutboxEvent
+from .appointment_reminder import AppointmentReminder
+from .appointment_archive import AppointmentArchive
+from .doctor_daily_stats import DoctorDailyStats, RollupWatermark
+from .background_job import BackgroundJob
@@ -10,12 +10,17 @@ from sqlalchemy import (
     CheckConstraint,
     UniqueConstraint,
     Index,
+    Computed,
     Enum as SQLAlchemyEnum,
+    text,
 )
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from models.base import Base
 
+SLOTS_PER_DAY = 24
+SLOT_DURATION_MINUTES = 20
+
 
 class AppointmentStatusEnum(str, Enum):
     PLANNED = "Запланировано"
@@ -25,7 +30,8 @@ class AppointmentStatusEnum(str, Enum):
 
 class Appointment(Base):
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # the partition key has to be part of the primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("users.id"), nullable=False
     )
@@ -33,8 +39,15 @@ class Appointment(Base):
         Integer, ForeignKey("doctors.id"), nullable=False
     )
 
-    date: Mapped[date] = mapped_column(Date, nullable=False)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
     slot_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    starts_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        Computed(
+            f"date + slot_index * interval '{SLOT_DURATION_MINUTES} minutes'",
+            persisted=True,
+        ),
+    )
 
     status: Mapped[AppointmentStatusEnum] = mapped_column(
         SQLAlchemyEnum(AppointmentStatusEnum, name="appointment_status_enum"),
@@ -54,7 +67,17 @@ class Appointment(Base):
     __table_args__ = (
         UniqueConstraint("doctor_id", "date", "slot_index", "status", "user_id", name="uq_doctor_slot"),
         CheckConstraint(
-            "slot_index >= 0 AND slot_index < 24", name="ck_slot_index_range"
+            f"slot_index >= 0 AND slot_index < {SLOTS_PER_DAY}",
+            name="ck_slot_index_range",
         ),
         Index("ix_appointments_doctor_date", "doctor_id", "date"),
+        # rows changed since the last stats rollup
+        Index("ix_appointments_updated_at", "updated_at"),
+        Index(
+            "ix_appointments_planned_starts_at",
+            "starts_at",
+            postgresql_where=text("status = 'PLANNED'"),
+        ),
+        # monthly partitions are managed by maintain_appointment_partitions
+        {"postgresql_partition_by": "RANGE (date)"},
     )
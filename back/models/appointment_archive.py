@@ -0,0 +1,49 @@
+from datetime import datetime, date
+
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Enum as SQLAlchemyEnum,
+)
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+
+from models.appointment import AppointmentStatusEnum
+from models.base import Base
+
+
+class AppointmentArchive(Base):
+    # FINISHED and CANCELLED appointments moved out of the hot table by
+    # archive_appointments; same columns, ids keep coming from its sequence
+    __tablename__ = "appointments_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.id"), nullable=False
+    )
+    doctor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("doctors.id"), nullable=False
+    )
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    slot_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[AppointmentStatusEnum] = mapped_column(
+        SQLAlchemyEnum(AppointmentStatusEnum, name="appointment_status_enum"),
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow
+    )
+
+    user: Mapped["User"] = relationship("User")
+    doctor: Mapped["Doctor"] = relationship("Doctor")
+
+    __table_args__ = (
+        Index("ix_appointments_archive_doctor_date", "doctor_id", "date"),
+        Index("ix_appointments_archive_user_date", "user_id", "date"),
+        Index("ix_appointments_archive_date", "date"),
+    )
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, String, DateTime, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class AppointmentReminder(Base):
+
+    # no foreign key: appointments is partitioned and its key includes the
+    # date; rows of gone or started appointments are deleted by the job
+    appointment_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # minutes before the slot start, one of REMINDER_OFFSETS_MINUTES
+    offset_minutes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_appointment_reminders_unsent",
+            "available_at",
+            postgresql_where=text("sent_at IS NULL"),
+        ),
+    )
@@ -1,6 +1,13 @@
 from enum import Enum
 
-from sqlalchemy import Integer, UniqueConstraint, Enum as SQLAlchemyEnum
+from sqlalchemy import (
+    Integer,
+    String,
+    UniqueConstraint,
+    Index,
+    Computed,
+    Enum as SQLAlchemyEnum,
+)
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from models.base import Base
@@ -29,6 +36,14 @@ class Doctor(Base):
         SQLAlchemyEnum(SpecializationEnum, name="specialization_enum"), nullable=False
     )
     description: Mapped[str]
+    # lowercased "surname first_name middle_name" for search_doctors
+    search_name: Mapped[str] = mapped_column(
+        String,
+        Computed(
+            "lower(surname || ' ' || first_name || ' ' || middle_name)",
+            persisted=True,
+        ),
+    )
 
     appointments: Mapped[list["Appointment"]] = relationship(
         "Appointment", back_populates="doctor"
@@ -42,4 +57,11 @@ class Doctor(Base):
             "specialization",
             name="uq_doctor_fullname_specialization",
         ),
+        # pg_trgm: serves both the LIKE prefix patterns and <% fuzzy matches
+        Index(
+            "ix_doctors_search_name_trgm",
+            "search_name",
+            postgresql_using="gin",
+            postgresql_ops={"search_name": "gin_trgm_ops"},
+        ),
     )
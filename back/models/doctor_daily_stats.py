@@ -0,0 +1,33 @@
+from datetime import datetime, date
+
+from sqlalchemy import Integer, Date, DateTime, String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class DoctorDailyStats(Base):
+    # appointment counts per doctor and day, kept current by
+    # refresh_doctor_daily_stats from rows changed since its watermark
+    __tablename__ = "doctor_daily_stats"
+
+    doctor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("doctors.id", ondelete="CASCADE"), primary_key=True
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    planned: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    finished: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cancelled: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # working slots of the day; the slot calendar is not kept for past days,
+    # so the last known value stays here
+    scheduled_slots: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_doctor_daily_stats_date", "date", "doctor_id"),)
+
+
+class RollupWatermark(Base):
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    # source rows updated before this have been rolled up
+    processed_until: Mapped[datetime] = mapped_column(DateTime, nullable=False)
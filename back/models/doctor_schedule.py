@@ -0,0 +1,68 @@
+from datetime import date
+
+from sqlalchemy import (
+    Integer,
+    Date,
+    String,
+    ForeignKey,
+    CheckConstraint,
+    Index,
+    literal,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.appointment import SLOTS_PER_DAY
+from models.base import Base
+
+# bit i of a slot mask is set when the doctor works slot i
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+
+def slots_to_mask(slots: list[int]) -> int:
+    mask = 0
+    for slot in slots:
+        mask |= 1 << slot
+    return mask
+
+
+def mask_to_slots(mask: int) -> list[int]:
+    return [slot for slot in range(SLOTS_PER_DAY) if mask >> slot & 1]
+
+
+def slot_bit(slot_index):
+    return literal(1).op("<<")(slot_index)
+
+
+class DoctorScheduleTemplate(Base):
+
+    doctor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("doctors.id", ondelete="CASCADE"), primary_key=True
+    )
+    # 0 is Monday, as in date.weekday()
+    weekday: Mapped[int] = mapped_column(Integer, primary_key=True)
+    slot_mask: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("weekday >= 0 AND weekday < 7", name="ck_schedule_weekday"),
+    )
+
+
+class DoctorScheduleException(Base):
+
+    doctor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("doctors.id", ondelete="CASCADE"), primary_key=True
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    slot_mask: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class DoctorSlotCalendar(Base):
+
+    doctor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("doctors.id", ondelete="CASCADE"), primary_key=True
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    slot_mask: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_doctor_slot_calendars_date", "date", "doctor_id"),)
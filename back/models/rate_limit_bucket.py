@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import String, Float, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class RateLimitBucket(Base):
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    # losing buckets on a crash only resets limits, so skip the WAL
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from typing import Type, TypeVar
 
 from pydantic import BaseModel
+from sqlalchemy import insert, update as sqlalchemy_update
 
 from core.base_dao import BaseDAO
 from models.base import Base
@@ -33,11 +34,19 @@ class AbstractTokenRepository(BaseDAO[T]):
     async def create_and_revoke_all_for_user(
         self, new_token: str, user_id: int, expires_at: datetime
     ) -> None:
-
-        await self.revoke_all_for_user(user_id)
-        await self.add(
-            self.CreateSchema(token=new_token, user_id=user_id, expires_at=expires_at)
+        # WITH revoked AS (UPDATE ...) INSERT ... - one round trip
+        revoked = (
+            sqlalchemy_update(self.model)
+            .where(self.model.user_id == user_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+            .returning(self.model.id)
+            .cte("revoked")
+        )
+        values = self.CreateSchema(
+            token=new_token, user_id=user_id, expires_at=expires_at
         )
+        query = insert(self.model).values(**values.model_dump()).add_cte(revoked)
+        await self.db_session.execute(query)
 
     async def rotate_token(
         self, old_token: str, new_token: str, user_id: int, expires_at: datetime
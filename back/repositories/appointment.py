@@ -1,20 +1,72 @@
-from datetime import datetime, timedelta
+import operator
+from datetime import date, datetime, timedelta
 
-import sqlalchemy
-from sqlalchemy import select, update as sqlalchemy_update, func
+from sqlalchemy import (
+    Text,
+    and_,
+    cast,
+    delete as sqlalchemy_delete,
+    exists,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update as sqlalchemy_update,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import aliased
 
-from core.base_dao import BaseDAO
-from models.appointment import Appointment, AppointmentStatusEnum
+from core.base_dao import BaseDAO, GuardedResult
+from infrastructure.events import APPOINTMENT_EVENTS_CHANNEL
+from models.appointment import (
+    Appointment,
+    AppointmentStatusEnum,
+    SLOT_DURATION_MINUTES,
+)
+from models.appointment_archive import AppointmentArchive
+from models.doctor_schedule import DoctorSlotCalendar, slot_bit
+from models.outbox_event import OutboxEvent
 from schemas.appointment import (
+    AppointmentEventEnum,
+    AppointmentEventSchema,
     AppointmentFilterSchema,
     AppointmentUpdateSchema,
     AppointmentDBCreateSchema,
+    AppointmentWithDoctorRow,
 )
 from schemas.user import IDFilter
 
 
+def _event_payload(
+    event: AppointmentEventEnum,
+    rows,
+    status: AppointmentStatusEnum,
+    previous_doctor_id: int | None = None,
+):
+    # same payload as AppointmentEventSchema for rows changed in bulk
+    fields = {
+        "event": event.value,
+        "appointment_id": rows.c.id,
+        "doctor_id": rows.c.doctor_id,
+        "date": rows.c.date,
+        "slot_index": rows.c.slot_index,
+        "status": status.value,
+    }
+    if previous_doctor_id is not None:
+        fields["previous_doctor_id"] = previous_doctor_id
+    return func.jsonb_build_object(
+        *(item for pair in fields.items() for item in pair), type_=JSONB
+    ).label("payload")
+
+
 class AppointmentRepository(BaseDAO[Appointment]):
     model = Appointment
+    archive_model = AppointmentArchive
+    range_filters = {
+        "date_from": ("date", operator.ge),
+        "date_to": ("date", operator.le),
+    }
 
     async def create_appointment(
         self, appointment_data: AppointmentDBCreateSchema
@@ -41,27 +93,126 @@ class AppointmentRepository(BaseDAO[Appointment]):
         return result.scalar_one_or_none()
 
     async def finish_appointments(self, current_dt: datetime) -> None:
-        query = (
+        finished = (
             sqlalchemy_update(self.model)
             .where(
                 self.model.status == AppointmentStatusEnum.PLANNED,
-                (
-                        func.cast(self.model.date, sqlalchemy.DateTime) +
-                        func.cast(
-                            func.concat((self.model.slot_index + 1) * 20, ' minutes'),
-                            sqlalchemy.Interval
-                        )
-                ) <= current_dt
+                # prunes the future partitions
+                self.model.date <= current_dt.date(),
+                # ix_appointments_planned_starts_at
+                self.model.starts_at
+                <= current_dt - timedelta(minutes=SLOT_DURATION_MINUTES),
             )
             .values(status=AppointmentStatusEnum.FINISHED)
+            .returning(
+                self.model.id,
+                self.model.doctor_id,
+                self.model.date,
+                self.model.slot_index,
+            )
+            .cte("finished")
+        )
+        await self._publish(
+            select(
+                _event_payload(
+                    AppointmentEventEnum.FINISHED,
+                    finished,
+                    AppointmentStatusEnum.FINISHED,
+                )
+            )
         )
-        await self.db_session.execute(query)
+
+    async def _publish(self, payloads) -> list[dict]:
+        # One statement per write: the events go to the outbox in the
+        # caller's transaction, and NOTIFY, which postgres sends on commit
+        # only, wakes the live listeners. `payloads` selects a jsonb
+        # "payload" column.
+        payloads = payloads.subquery("payloads")
+        query = (
+            insert(OutboxEvent)
+            .from_select(
+                ["event_type", "payload"],
+                select(payloads.c.payload["event"].astext, payloads.c.payload),
+            )
+            .returning(
+                OutboxEvent.payload,
+                func.pg_notify(
+                    APPOINTMENT_EVENTS_CHANNEL, cast(OutboxEvent.payload, Text)
+                ),
+            )
+        )
+        res = await self.db_session.execute(query)
+        return [payload for payload, _ in res]
+
+    async def publish_events(self, events: list[AppointmentEventSchema]) -> None:
+        payloads = (
+            func.unnest(
+                literal(
+                    [event.model_dump_json(exclude_none=True) for event in events],
+                    ARRAY(Text),
+                )
+            )
+            .table_valued("payload")
+            .render_derived(name="events")
+        )
+        await self._publish(select(cast(payloads.c.payload, JSONB).label("payload")))
 
     async def get_appointments_with_filters(
-        self, filters: AppointmentFilterSchema
-    ) -> list[Appointment]:
-        return await self.find_all(filters)
+        self, filters: AppointmentFilterSchema, with_archive: bool = False
+    ) -> list[AppointmentWithDoctorRow]:
+        return await self.find_all_rows(
+            AppointmentWithDoctorRow, filters, with_archive=with_archive
+        )
+
+    async def archive_before(
+        self, cutoff: date, archived_at: datetime, batch_size: int
+    ) -> int:
+        # Moves one batch of closed appointments in a single statement; the
+        # date predicate keeps the scan to the partitions before the cutoff.
+        batch = (
+            select(self.model.id, self.model.date)
+            .where(
+                self.model.date < cutoff,
+                self.model.status.in_(
+                    [AppointmentStatusEnum.FINISHED, AppointmentStatusEnum.CANCELLED]
+                ),
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        columns = [
+            "id",
+            "user_id",
+            "doctor_id",
+            "date",
+            "slot_index",
+            "status",
+            "created_at",
+            "updated_at",
+        ]
+        moved = (
+            sqlalchemy_delete(self.model)
+            .where(tuple_(self.model.id, self.model.date).in_(batch))
+            .returning(*(getattr(self.model, name) for name in columns))
+            .cte("moved")
+        )
+        query = (
+            insert(AppointmentArchive)
+            .from_select(
+                columns + ["archived_at"],
+                select(*(moved.c[name] for name in columns), literal(archived_at)),
+            )
+            .returning(AppointmentArchive.id)
+        )
+        res = await self.db_session.execute(query)
+        return len(res.all())
 
+    async def get_user_appointments(
+        self, user_id: int
+    ) -> list[AppointmentWithDoctorRow]:
+        return await self.find_all_rows(
+            AppointmentWithDoctorRow, AppointmentFilterSchema(user_id=user_id)
+        )
 
     async def update_appointment(
         self, appointment_id: int, appointment_data: AppointmentUpdateSchema
@@ -71,12 +222,123 @@ class AppointmentRepository(BaseDAO[Appointment]):
     async def cancel_appointment(
         self,
         appointment_id: int,
-        update_data: AppointmentUpdateSchema,
-    ) -> Appointment:
-        return await self.update_appointment(
-            appointment_id=appointment_id,
-            appointment_data=update_data,
+        user_id: int,
+    ) -> GuardedResult[Appointment]:
+        return await self.update_guarded(
+            IDFilter(id=appointment_id),
+            AppointmentUpdateSchema(status=AppointmentStatusEnum.CANCELLED),
+            guards={
+                "owner": self.model.user_id == user_id,
+                "status": self.model.status == AppointmentStatusEnum.PLANNED,
+            },
         )
 
+    async def change_appointment_status(
+        self,
+        appointment_id: int,
+        status: AppointmentStatusEnum,
+    ) -> GuardedResult[Appointment]:
+        return await self.update_guarded(
+            IDFilter(id=appointment_id),
+            AppointmentUpdateSchema(status=status),
+            guards={"status": self.model.status != status},
+        )
+
+    async def release_doctor_slots(
+        self,
+        doctor_id: int,
+        date_from: datetime.date,
+        date_to: datetime.date,
+        slot_from: int,
+        slot_to: int,
+        reassign_to_doctor_id: int | None = None,
+    ) -> tuple[list[int], list[int]]:
+        # One statement: planned appointments in the range move to the
+        # substitute where the slot is in their calendar and still free, the
+        # rest are cancelled. The substitute's calendar must be materialized.
+        in_range = and_(
+            self.model.doctor_id == doctor_id,
+            self.model.status == AppointmentStatusEnum.PLANNED,
+            self.model.date.between(date_from, date_to),
+            self.model.slot_index.between(slot_from, slot_to),
+        )
+        cancel_filter = [in_range]
+        parts = []
+        # explicit value: two CTEs relying on onupdate would clash on bind names
+        now = datetime.utcnow()
+
+        if reassign_to_doctor_id is not None:
+            busy = aliased(self.model)
+            reassigned = (
+                sqlalchemy_update(self.model)
+                .where(
+                    in_range,
+                    exists().where(
+                        DoctorSlotCalendar.doctor_id == reassign_to_doctor_id,
+                        DoctorSlotCalendar.date == self.model.date,
+                        DoctorSlotCalendar.slot_mask.op("&")(
+                            slot_bit(self.model.slot_index)
+                        )
+                        != 0,
+                    ),
+                    ~exists().where(
+                        busy.doctor_id == reassign_to_doctor_id,
+                        busy.date == self.model.date,
+                        busy.slot_index == self.model.slot_index,
+                        busy.status == AppointmentStatusEnum.PLANNED,
+                    ),
+                )
+                .values(doctor_id=reassign_to_doctor_id, updated_at=now)
+                .returning(
+                    self.model.id,
+                    self.model.doctor_id,
+                    self.model.date,
+                    self.model.slot_index,
+                )
+                .cte("reassigned")
+            )
+            cancel_filter.append(self.model.id.not_in(select(reassigned.c.id)))
+            parts.append(
+                select(
+                    _event_payload(
+                        AppointmentEventEnum.REASSIGNED,
+                        reassigned,
+                        AppointmentStatusEnum.PLANNED,
+                        previous_doctor_id=doctor_id,
+                    )
+                )
+            )
+
+        cancelled = (
+            sqlalchemy_update(self.model)
+            .where(*cancel_filter)
+            .values(status=AppointmentStatusEnum.CANCELLED, updated_at=now)
+            .returning(
+                self.model.id,
+                self.model.doctor_id,
+                self.model.date,
+                self.model.slot_index,
+            )
+            .cte("cancelled")
+        )
+        parts.append(
+            select(
+                _event_payload(
+                    AppointmentEventEnum.CANCELLED,
+                    cancelled,
+                    AppointmentStatusEnum.CANCELLED,
+                )
+            )
+        )
+
+        payloads = await self._publish(
+            parts[0].union_all(*parts[1:]) if len(parts) > 1 else parts[0]
+        )
+
+        released = {"reassigned": [], "cancelled": []}
+        for payload in payloads:
+            released[payload["event"]].append(payload["appointment_id"])
+        return released["reassigned"], released["cancelled"]
+
     async def delete_appointment(self, appointment_id: int) -> None:
         await self.delete(IDFilter(id=appointment_id))
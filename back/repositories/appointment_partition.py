@@ -0,0 +1,70 @@
+import re
+from datetime import date
+
+from sqlalchemy import select, text
+
+from core.base_dao import BaseDAO
+from models.appointment import Appointment
+
+PARTITION_NAME = re.compile(r"^appointments_p(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = "appointments_default"
+
+
+def partition_name(month: date) -> str:
+    return f"appointments_p{month:%Y_%m}"
+
+
+class AppointmentPartitionRepository(BaseDAO[Appointment]):
+    model = Appointment
+
+    async def get_partition_months(self) -> list[date]:
+        query = text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'appointments'::regclass"
+        )
+        res = await self.db_session.execute(query)
+        months = []
+        for (name,) in res:
+            match = PARTITION_NAME.match(name)
+            if match:
+                months.append(date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    async def create_partition(self, month: date, next_month: date) -> None:
+        # Built detached and attached afterwards: ATTACH takes a weaker lock
+        # on appointments than CREATE ... PARTITION OF, and rows the default
+        # partition caught for this month are moved in first.
+        name = partition_name(month)
+        columns = ", ".join(
+            column.name
+            for column in self.model.__table__.columns
+            if column.computed is None
+        )
+        await self.db_session.execute(
+            text(
+                f"CREATE TABLE {name} (LIKE appointments "
+                "INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+            )
+        )
+        await self.db_session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                "WHERE date >= :month AND date < :next_month "
+                f"RETURNING {columns}) "
+                f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+            ),
+            {"month": month, "next_month": next_month},
+        )
+        await self.db_session.execute(
+            text(
+                f"ALTER TABLE appointments ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+            )
+        )
+
+    async def detach_partition(self, month: date) -> None:
+        # the table stays as a standalone one, to be dumped or dropped by hand
+        await self.db_session.execute(
+            text(f"ALTER TABLE appointments DETACH PARTITION {partition_name(month)}")
+        )
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    Integer,
+    delete as sqlalchemy_delete,
+    exists,
+    func,
+    literal,
+    select,
+    tuple_,
+    update as sqlalchemy_update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+
+from core.base_dao import BaseDAO
+from models.appointment import Appointment, AppointmentStatusEnum
+from models.appointment_reminder import AppointmentReminder
+from models.doctor import Doctor
+from schemas.appointment_reminder import DueReminderRow
+
+
+class AppointmentReminderRepository(BaseDAO[AppointmentReminder]):
+    model = AppointmentReminder
+
+    async def schedule_due(
+        self,
+        now: datetime,
+        offsets: list[int],
+        appointment_ids: list[int] | None = None,
+    ) -> None:
+        # Each planned appointment inside the largest offset gets a row for
+        # the smallest offset it has reached, unless that or a later (smaller)
+        # reminder exists: a late booking gets one reminder, not all of them.
+        offset = (
+            func.unnest(literal(offsets, ARRAY(Integer)))
+            .table_valued("offset_minutes")
+            .render_derived(name="offsets")
+        )
+        due = (
+            select(Appointment.id, offset.c.offset_minutes)
+            .join(
+                offset,
+                Appointment.starts_at
+                <= now + offset.c.offset_minutes * literal(timedelta(minutes=1)),
+            )
+            .where(
+                Appointment.status == AppointmentStatusEnum.PLANNED,
+                Appointment.date.between(
+                    now.date(), (now + timedelta(minutes=max(offsets))).date()
+                ),
+                # ix_appointments_planned_starts_at
+                Appointment.starts_at > now,
+                Appointment.starts_at <= now + timedelta(minutes=max(offsets)),
+                ~exists().where(
+                    self.model.appointment_id == Appointment.id,
+                    self.model.offset_minutes <= offset.c.offset_minutes,
+                ),
+            )
+            .distinct(Appointment.id)
+            .order_by(Appointment.id, offset.c.offset_minutes)
+        )
+        if appointment_ids is not None:
+            due = due.where(Appointment.id.in_(appointment_ids))
+        query = (
+            pg_insert(self.model)
+            .from_select(["appointment_id", "offset_minutes"], due)
+            .on_conflict_do_nothing()
+        )
+        await self.db_session.execute(query)
+
+    async def delete_started(self, now: datetime) -> None:
+        # also the rows of deleted appointments, there is no foreign key
+        await self.db_session.execute(
+            sqlalchemy_delete(self.model).where(
+                ~exists().where(
+                    Appointment.id == self.model.appointment_id,
+                    Appointment.starts_at > now,
+                )
+            )
+        )
+
+    async def delete_unsent(self, appointment_ids: list[int]) -> None:
+        if appointment_ids:
+            await self.db_session.execute(
+                sqlalchemy_delete(self.model).where(
+                    self.model.appointment_id.in_(appointment_ids),
+                    self.model.sent_at.is_(None),
+                )
+            )
+
+    async def claim_batch(
+        self, now: datetime, batch_size: int, max_attempts: int
+    ) -> list[DueReminderRow]:
+        query = (
+            select(
+                self.model.appointment_id,
+                self.model.offset_minutes,
+                self.model.attempts,
+                Appointment.user_id,
+                Appointment.starts_at,
+                Doctor.first_name,
+                Doctor.surname,
+                Doctor.middle_name,
+                Doctor.specialization,
+            )
+            .join(Appointment, Appointment.id == self.model.appointment_id)
+            .join(Doctor, Doctor.id == Appointment.doctor_id)
+            .where(
+                self.model.sent_at.is_(None),
+                self.model.available_at <= now,
+                self.model.attempts < max_attempts,
+                Appointment.status == AppointmentStatusEnum.PLANNED,
+                Appointment.starts_at > now,
+            )
+            .order_by(self.model.available_at)
+            .limit(batch_size)
+            .with_for_update(of=self.model, skip_locked=True)
+        )
+        res = await self.db_session.execute(query)
+        return [DueReminderRow(*row) for row in res]
+
+    async def mark_sent(self, keys: list[tuple[int, int]], now: datetime) -> None:
+        if keys:
+            await self.db_session.execute(
+                sqlalchemy_update(self.model)
+                .where(
+                    tuple_(self.model.appointment_id, self.model.offset_minutes).in_(
+                        keys
+                    )
+                )
+                .values(sent_at=now)
+            )
+
+    async def mark_failed(
+        self,
+        appointment_id: int,
+        offset_minutes: int,
+        attempts: int,
+        available_at: datetime,
+        error: str,
+    ) -> None:
+        await self.db_session.execute(
+            sqlalchemy_update(self.model)
+            .where(
+                self.model.appointment_id == appointment_id,
+                self.model.offset_minutes == offset_minutes,
+            )
+            .values(attempts=attempts, available_at=available_at, last_error=error)
+        )
@@ -0,0 +1,153 @@
+from datetime import timedelta
+
+from sqlalchemy import (
+    case,
+    delete as sqlalchemy_delete,
+    func,
+    insert,
+    literal,
+    select,
+    update as sqlalchemy_update,
+)
+
+from core.base_dao import BaseDAO
+from models.background_job import BackgroundJob, BackgroundJobStatusEnum
+
+
+class BackgroundJobRepository(BaseDAO[BackgroundJob]):
+    model = BackgroundJob
+
+    async def enqueue(
+        self, kind: str, payload: dict, created_by: int | None
+    ) -> BackgroundJob:
+        query = (
+            insert(self.model)
+            .values(kind=kind, payload=payload, created_by=created_by)
+            .returning(self.model)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one()
+
+    async def get_jobs(
+        self,
+        kind: str | None,
+        status: BackgroundJobStatusEnum | None,
+        limit: int,
+    ) -> list[BackgroundJob]:
+        query = select(self.model).order_by(self.model.id.desc()).limit(limit)
+        if kind is not None:
+            query = query.where(self.model.kind == kind)
+        if status is not None:
+            query = query.where(self.model.status == status)
+        res = await self.db_session.execute(query)
+        return res.scalars().all()
+
+    async def claim(self, worker_id: str, limit: int) -> list[BackgroundJob]:
+        # ix_background_jobs_queued; rows another worker is claiming right
+        # now are skipped instead of waited for
+        claimable = (
+            select(self.model.id)
+            .where(
+                self.model.status == BackgroundJobStatusEnum.QUEUED,
+                self.model.available_at <= func.now(),
+            )
+            .order_by(self.model.available_at, self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            sqlalchemy_update(self.model)
+            .where(self.model.id.in_(claimable.scalar_subquery()))
+            .values(
+                status=BackgroundJobStatusEnum.RUNNING,
+                attempts=self.model.attempts + 1,
+                locked_by=worker_id,
+                heartbeat_at=func.now(),
+                started_at=func.now(),
+            )
+            .returning(self.model)
+        )
+        res = await self.db_session.execute(query)
+        return sorted(res.scalars().all(), key=lambda job: job.id)
+
+    async def heartbeat(self, worker_id: str, job_ids: list[int]) -> None:
+        if job_ids:
+            await self.db_session.execute(
+                sqlalchemy_update(self.model)
+                .where(
+                    self.model.id.in_(job_ids),
+                    self.model.locked_by == worker_id,
+                    self.model.status == BackgroundJobStatusEnum.RUNNING,
+                )
+                .values(heartbeat_at=func.now())
+            )
+
+    async def finish(
+        self,
+        job_id: int,
+        worker_id: str,
+        status: BackgroundJobStatusEnum,
+        result: dict | None = None,
+        error: str | None = None,
+    ) -> None:
+        # a job requeued after a lost lease belongs to another worker now
+        await self.db_session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id == job_id, self.model.locked_by == worker_id)
+            .values(
+                status=status,
+                result=result,
+                last_error=error,
+                finished_at=func.now(),
+                locked_by=None,
+            )
+        )
+
+    async def retry_later(
+        self, job_id: int, worker_id: str, delay: timedelta, error: str
+    ) -> None:
+        await self.db_session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id == job_id, self.model.locked_by == worker_id)
+            .values(
+                status=BackgroundJobStatusEnum.QUEUED,
+                available_at=func.now() + delay,
+                last_error=error,
+                locked_by=None,
+            )
+        )
+
+    async def requeue_stale(
+        self, lease: timedelta, max_attempts: int
+    ) -> list[tuple[int, BackgroundJobStatusEnum]]:
+        # a job that keeps taking its worker down must not come back forever:
+        # once out of attempts it fails here like any other failed run
+        exhausted = self.model.attempts >= max_attempts
+        status_type = self.model.status.type
+        query = (
+            sqlalchemy_update(self.model)
+            .where(
+                self.model.status == BackgroundJobStatusEnum.RUNNING,
+                self.model.heartbeat_at < func.now() - lease,
+            )
+            .values(
+                status=case(
+                    (exhausted, literal(BackgroundJobStatusEnum.FAILED, status_type)),
+                    else_=literal(BackgroundJobStatusEnum.QUEUED, status_type),
+                ),
+                available_at=func.now(),
+                finished_at=case((exhausted, func.now())),
+                locked_by=None,
+                last_error="worker lease expired",
+            )
+            .returning(self.model.id, self.model.status)
+        )
+        res = await self.db_session.execute(query)
+        return [tuple(row) for row in res]
+
+    async def delete_finished_before(self, retention: timedelta) -> None:
+        await self.db_session.execute(
+            sqlalchemy_delete(self.model).where(
+                self.model.finished_at < func.now() - retention
+            )
+        )
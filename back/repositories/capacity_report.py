@@ -0,0 +1,53 @@
+from datetime import date
+
+from sqlalchemy import Integer, SmallInteger, case, func, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from core.base_dao import BaseDAO
+from models.appointment import Appointment, AppointmentStatusEnum
+from models.appointment_archive import AppointmentArchive
+from models.doctor import Doctor, SpecializationEnum
+
+# small codes for the status column of the slot matrix fetch
+STATUS_CODES = {status: code for code, status in enumerate(AppointmentStatusEnum)}
+
+
+class CapacityReportRepository(BaseDAO[Appointment]):
+    model = Appointment
+
+    async def get_doctor_specializations(self) -> list[tuple[int, SpecializationEnum]]:
+        res = await self.db_session.execute(
+            select(Doctor.id, Doctor.specialization).order_by(Doctor.id)
+        )
+        return [tuple(row) for row in res]
+
+    async def get_slot_columns(
+        self, date_from: date, date_to: date
+    ) -> tuple[list[int], list[int], list[int], list[int]]:
+        # One row of four arrays (doctor_id, day offset, slot_index, status
+        # code) over the hot and archived appointments, so the driver decodes
+        # flat integer arrays instead of building a Row per appointment.
+        sources = union_all(
+            *(
+                select(
+                    model.doctor_id,
+                    (model.date - date_from).label("day"),
+                    model.slot_index,
+                    case(
+                        *(
+                            (model.status == status, code)
+                            for status, code in STATUS_CODES.items()
+                        )
+                    ).label("status"),
+                ).where(model.date.between(date_from, date_to))
+                for model in (Appointment, AppointmentArchive)
+            )
+        ).subquery("sources")
+        query = select(
+            func.array_agg(sources.c.doctor_id, type_=ARRAY(Integer)),
+            func.array_agg(sources.c.day, type_=ARRAY(Integer)),
+            func.array_agg(sources.c.slot_index, type_=ARRAY(SmallInteger)),
+            func.array_agg(sources.c.status, type_=ARRAY(SmallInteger)),
+        )
+        res = await self.db_session.execute(query)
+        return tuple(column or [] for column in res.one())
@@ -1,36 +1,227 @@
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    case,
+    cast,
+    func,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from core.base_dao import BaseDAO
 from models import Appointment
 from models.appointment import AppointmentStatusEnum
-from models.doctor import Doctor
-from schemas.doctor import DoctorCreateSchema, DoctorFilterSchema, DoctorUpdateSchema
+from models.doctor import Doctor, SpecializationEnum
+from schemas.doctor import (
+    DoctorCreateSchema,
+    DoctorFilterSchema,
+    DoctorRow,
+    DoctorSummaryRow,
+    DoctorUpdateSchema,
+)
 from schemas.user import IDFilter
 
+_import_columns = (
+    "first_name",
+    "surname",
+    "middle_name",
+    "specialization",
+    "description",
+)
+
+
+def _doctor_key(doctor) -> tuple:
+    # the columns of uq_doctor_fullname_specialization
+    return (
+        doctor.surname,
+        doctor.first_name,
+        doctor.middle_name,
+        doctor.specialization,
+    )
+
+
+doctor_import_staging = Table(
+    "doctor_import_staging",
+    MetaData(),
+    Column("row_no", Integer, nullable=False),
+    *[Column(name, String, nullable=False) for name in _import_columns],
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
 
 class DoctorRepository(BaseDAO[Doctor]):
     model = Doctor
+    upsert_constraint = "uq_doctor_fullname_specialization"
 
     async def create_doctor(self, doctor_data: DoctorCreateSchema) -> Doctor:
         return await self.add(doctor_data)
 
+    async def upsert_doctors(
+        self,
+        doctors_data: list[DoctorCreateSchema],
+        update_fields: list[str] | None = None,
+    ) -> list[Doctor]:
+        return await self.upsert_many(doctors_data, update_fields)
+
+    async def insert_new_doctors(
+        self, rows: list[tuple[int, DoctorCreateSchema]]
+    ) -> dict[int, int | None]:
+        # Same result as import_doctors for files too small to be worth a
+        # staging table: an upsert that leaves existing doctors untouched,
+        # then the first row of each name gets the id that came back.
+        inserted = await self.upsert_doctors(
+            [doctor for _, doctor in rows], update_fields=[]
+        )
+        ids = {_doctor_key(doctor): doctor.id for doctor in inserted}
+        return {row_no: ids.pop(_doctor_key(doctor), None) for row_no, doctor in rows}
+
+    async def import_doctors(
+        self, rows: list[tuple[int, DoctorCreateSchema]]
+    ) -> dict[int, int | None]:
+        # COPY into a transaction-scoped staging table, then one
+        # INSERT ... SELECT ... ON CONFLICT DO NOTHING merges it into doctors.
+        # Returns row_no -> new doctor id, or None for duplicates.
+        connection = await self.db_session.connection()
+        await connection.run_sync(doctor_import_staging.create)
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            doctor_import_staging.name,
+            records=[
+                (
+                    row_no,
+                    doctor.first_name,
+                    doctor.surname,
+                    doctor.middle_name,
+                    doctor.specialization.name,
+                    doctor.description,
+                )
+                for row_no, doctor in rows
+            ],
+            columns=["row_no", *_import_columns],
+        )
+
+        staging = doctor_import_staging.c
+        key = [
+            staging.surname,
+            staging.first_name,
+            staging.middle_name,
+            staging.specialization,
+        ]
+        inserted = (
+            pg_insert(self.model)
+            .from_select(
+                list(_import_columns),
+                select(
+                    staging.first_name,
+                    staging.surname,
+                    staging.middle_name,
+                    cast(staging.specialization, self.model.specialization.type),
+                    staging.description,
+                )
+                .distinct(*key)
+                .order_by(*key, staging.row_no),
+            )
+            .on_conflict_do_nothing(constraint=self.upsert_constraint)
+            .returning(
+                self.model.id,
+                self.model.first_name,
+                self.model.surname,
+                self.model.middle_name,
+                cast(self.model.specialization, String).label("specialization"),
+            )
+            .cte("inserted")
+        )
+        first_in_file = func.row_number().over(
+            partition_by=key, order_by=staging.row_no
+        )
+        query = select(staging.row_no, inserted.c.id, first_in_file).outerjoin(
+            inserted,
+            and_(
+                inserted.c.first_name == staging.first_name,
+                inserted.c.surname == staging.surname,
+                inserted.c.middle_name == staging.middle_name,
+                inserted.c.specialization == staging.specialization,
+            ),
+        )
+        res = await self.db_session.execute(query)
+        return {
+            row_no: doctor_id if position == 1 else None
+            for row_no, doctor_id, position in res
+        }
+
     async def find_doctor_by_id(self, doctor_id: int) -> Doctor | None:
         return await self.find_one_or_none_by_id(doctor_id)
 
     async def get_doctors_with_filters(
         self, filters: DoctorFilterSchema
-    ) -> list[Doctor]:
-        return await self.find_all(filters)
+    ) -> list[DoctorRow]:
+        return await self.find_all_rows(DoctorRow, filters)
+
+    async def search_doctors(
+        self,
+        query: str,
+        specialization: SpecializationEnum | None,
+        limit: int,
+    ) -> list[DoctorSummaryRow]:
+        # surname prefix first, then a prefix of another name part, then
+        # trigram matches; ix_doctors_search_name_trgm serves all three
+        name = self.model.search_name
+        pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        starts = name.like(f"{pattern}%", escape="\\")
+        word_starts = name.like(f"% {pattern}%", escape="\\")
+        fuzzy = literal(query).op("<%")(name)
+        statement = (
+            select(
+                self.model.id,
+                self.model.first_name,
+                self.model.surname,
+                self.model.middle_name,
+                self.model.specialization,
+            )
+            .where(or_(starts, word_starts, fuzzy))
+            .order_by(
+                case((starts, 0), (word_starts, 1), else_=2),
+                func.word_similarity(query, name).desc(),
+                name,
+                self.model.id,
+            )
+            .limit(limit)
+        )
+        if specialization is not None:
+            statement = statement.where(self.model.specialization == specialization)
+        res = await self.db_session.execute(statement)
+        return [DoctorSummaryRow(*row) for row in res]
+
+    async def get_search_catalogue(self) -> list[DoctorSummaryRow]:
+        res = await self.db_session.execute(
+            select(
+                self.model.id,
+                self.model.first_name,
+                self.model.surname,
+                self.model.middle_name,
+                self.model.specialization,
+            )
+        )
+        return [DoctorSummaryRow(*row) for row in res]
 
     async def update_doctor(
         self, doctor_id: int, doctor_data: DoctorUpdateSchema
-    ) -> Doctor:
-        return await self.update(IDFilter(id=doctor_id), doctor_data)
+    ) -> Doctor | None:
+        result = await self.update_guarded(IDFilter(id=doctor_id), doctor_data)
+        return result.instance
 
-    async def delete_doctor(self, doctor_id: int) -> None:
-        await self.delete(IDFilter(id=doctor_id))
+    async def delete_doctor(self, doctor_id: int) -> bool:
+        result = await self.delete_guarded(IDFilter(id=doctor_id))
+        return result.applied
 
     async def is_slot_available(
         self,
@@ -0,0 +1,146 @@
+from datetime import date, datetime
+
+from sqlalchemy import (
+    DateTime,
+    and_,
+    cast,
+    delete as sqlalchemy_delete,
+    func,
+    literal,
+    select,
+    union,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import BIT, insert as pg_insert
+
+from core.base_dao import BaseDAO
+from models.appointment import Appointment, AppointmentStatusEnum, SLOTS_PER_DAY
+from models.appointment_archive import AppointmentArchive
+from models.doctor_daily_stats import DoctorDailyStats, RollupWatermark
+from models.doctor_schedule import DoctorSlotCalendar
+
+
+class DoctorDailyStatsRepository(BaseDAO[DoctorDailyStats]):
+    model = DoctorDailyStats
+
+    async def lock_watermark(self, name: str) -> datetime | None:
+        # the row lock also keeps two workers from rolling up at once
+        await self.db_session.execute(
+            pg_insert(RollupWatermark)
+            .values(name=name, processed_until=datetime.min)
+            .on_conflict_do_nothing(index_elements=[RollupWatermark.name])
+        )
+        query = (
+            select(RollupWatermark.processed_until)
+            .where(RollupWatermark.name == name)
+            .with_for_update()
+        )
+        res = await self.db_session.execute(query)
+        processed_until = res.scalar_one()
+        return None if processed_until == datetime.min else processed_until
+
+    async def set_watermark(self, name: str, processed_until: datetime) -> None:
+        await self.db_session.execute(
+            pg_insert(RollupWatermark)
+            .values(name=name, processed_until=processed_until)
+            .on_conflict_do_update(
+                index_elements=[RollupWatermark.name],
+                set_={"processed_until": processed_until},
+            )
+        )
+
+    async def get_changed_dates(self, since: datetime | None) -> list[date]:
+        if since is None:
+            # first run: everything, archived days included
+            query = union(
+                select(Appointment.date).distinct(),
+                select(AppointmentArchive.date).distinct(),
+            )
+        else:
+            # ix_appointments_updated_at; a reassignment keeps the date, so
+            # refreshing whole days also covers the doctor a row moved from
+            query = (
+                select(Appointment.date)
+                .where(Appointment.updated_at > since)
+                .distinct()
+            )
+        res = await self.db_session.execute(query)
+        return sorted(res.scalars().all())
+
+    async def refresh_dates(self, dates: list[date], refreshed_at: datetime) -> None:
+        sources = union_all(
+            *(
+                select(model.doctor_id, model.date, model.status).where(
+                    model.date.in_(dates)
+                )
+                for model in (Appointment, AppointmentArchive)
+            )
+        ).subquery("sources")
+        counts = (
+            select(
+                sources.c.doctor_id,
+                sources.c.date,
+                *(
+                    func.count().filter(sources.c.status == status)
+                    for status in (
+                        AppointmentStatusEnum.PLANNED,
+                        AppointmentStatusEnum.FINISHED,
+                        AppointmentStatusEnum.CANCELLED,
+                    )
+                ),
+                func.bit_count(cast(DoctorSlotCalendar.slot_mask, BIT(SLOTS_PER_DAY))),
+                literal(refreshed_at, DateTime),
+            )
+            .outerjoin(
+                DoctorSlotCalendar,
+                and_(
+                    DoctorSlotCalendar.doctor_id == sources.c.doctor_id,
+                    DoctorSlotCalendar.date == sources.c.date,
+                ),
+            )
+            .group_by(sources.c.doctor_id, sources.c.date, DoctorSlotCalendar.slot_mask)
+        )
+        query = pg_insert(self.model).from_select(
+            [
+                "doctor_id",
+                "date",
+                "planned",
+                "finished",
+                "cancelled",
+                "scheduled_slots",
+                "refreshed_at",
+            ],
+            counts,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.doctor_id, self.model.date],
+            set_={
+                "planned": query.excluded.planned,
+                "finished": query.excluded.finished,
+                "cancelled": query.excluded.cancelled,
+                "scheduled_slots": func.coalesce(
+                    query.excluded.scheduled_slots, self.model.scheduled_slots
+                ),
+                "refreshed_at": query.excluded.refreshed_at,
+            },
+        )
+        await self.db_session.execute(query)
+        # days a doctor no longer has any appointment on
+        await self.db_session.execute(
+            sqlalchemy_delete(self.model).where(
+                self.model.date.in_(dates), self.model.refreshed_at < refreshed_at
+            )
+        )
+
+    async def get_daily_stats(
+        self, date_from: date, date_to: date, doctor_id: int | None = None
+    ) -> list[DoctorDailyStats]:
+        query = (
+            select(self.model)
+            .where(self.model.date.between(date_from, date_to))
+            .order_by(self.model.date, self.model.doctor_id)
+        )
+        if doctor_id is not None:
+            query = query.where(self.model.doctor_id == doctor_id)
+        res = await self.db_session.execute(query)
+        return res.scalars().all()
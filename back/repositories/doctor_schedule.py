@@ -0,0 +1,286 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (
+    Date,
+    and_,
+    case,
+    cast,
+    delete as sqlalchemy_delete,
+    func,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.base_dao import BaseDAO
+from models.appointment import (
+    Appointment,
+    AppointmentStatusEnum,
+    SLOTS_PER_DAY,
+    SLOT_DURATION_MINUTES,
+)
+from models.doctor import Doctor, SpecializationEnum
+from models.doctor_schedule import (
+    FULL_DAY_MASK,
+    DoctorScheduleException,
+    DoctorScheduleTemplate,
+    DoctorSlotCalendar,
+    slot_bit,
+)
+from schemas.doctor_schedule import DoctorScheduleTemplateCreateSchema
+
+
+class DoctorScheduleRepository(BaseDAO[DoctorScheduleTemplate]):
+    model = DoctorScheduleTemplate
+
+    async def get_templates(self, doctor_id: int) -> list[DoctorScheduleTemplate]:
+        query = (
+            select(self.model)
+            .where(self.model.doctor_id == doctor_id)
+            .order_by(self.model.weekday)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalars().all()
+
+    async def replace_templates(self, doctor_id: int, masks: dict[int, int]) -> None:
+        await self.db_session.execute(
+            sqlalchemy_delete(self.model).where(self.model.doctor_id == doctor_id)
+        )
+        await self.add_many(
+            [
+                DoctorScheduleTemplateCreateSchema(
+                    doctor_id=doctor_id, weekday=weekday, slot_mask=mask
+                )
+                for weekday, mask in masks.items()
+            ]
+        )
+
+    async def get_exceptions(
+        self, doctor_id: int, date_from: date
+    ) -> list[DoctorScheduleException]:
+        query = (
+            select(DoctorScheduleException)
+            .where(
+                DoctorScheduleException.doctor_id == doctor_id,
+                DoctorScheduleException.date >= date_from,
+            )
+            .order_by(DoctorScheduleException.date)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalars().all()
+
+    async def upsert_exception(
+        self, doctor_id: int, day: date, slot_mask: int, reason: str | None
+    ) -> DoctorScheduleException:
+        query = pg_insert(DoctorScheduleException).values(
+            doctor_id=doctor_id, date=day, slot_mask=slot_mask, reason=reason
+        )
+        query = (
+            query.on_conflict_do_update(
+                index_elements=[
+                    DoctorScheduleException.doctor_id,
+                    DoctorScheduleException.date,
+                ],
+                set_={
+                    "slot_mask": query.excluded.slot_mask,
+                    "reason": query.excluded.reason,
+                },
+            )
+            .returning(DoctorScheduleException)
+            .execution_options(populate_existing=True)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one()
+
+    async def delete_exception(self, doctor_id: int, day: date) -> bool:
+        query = (
+            sqlalchemy_delete(DoctorScheduleException)
+            .where(
+                DoctorScheduleException.doctor_id == doctor_id,
+                DoctorScheduleException.date == day,
+            )
+            .returning(DoctorScheduleException.doctor_id)
+        )
+        res = await self.db_session.execute(query)
+        return res.first() is not None
+
+    async def materialize(
+        self,
+        date_from: date,
+        date_to: date,
+        doctor_id: int | None = None,
+        only_missing: bool = False,
+    ) -> dict[tuple[int, date], int]:
+        # Calendar day = exception, else the weekday template, else a day off
+        # for doctors that have templates and a full day for those that don't.
+        days = (
+            func.generate_series(date_from, date_to, timedelta(days=1))
+            .table_valued("value")
+            .render_derived(name="days")
+        )
+        day = cast(days.c.value, Date)
+        templated = select(DoctorScheduleTemplate.doctor_id).distinct().subquery()
+        rows = (
+            select(
+                Doctor.id,
+                day,
+                func.coalesce(
+                    DoctorScheduleException.slot_mask,
+                    DoctorScheduleTemplate.slot_mask,
+                    case((templated.c.doctor_id.is_(None), FULL_DAY_MASK), else_=0),
+                ),
+            )
+            .select_from(Doctor)
+            .join(days, true())
+            .outerjoin(templated, templated.c.doctor_id == Doctor.id)
+            .outerjoin(
+                DoctorScheduleTemplate,
+                and_(
+                    DoctorScheduleTemplate.doctor_id == Doctor.id,
+                    DoctorScheduleTemplate.weekday
+                    == func.extract("isodow", days.c.value) - 1,
+                ),
+            )
+            .outerjoin(
+                DoctorScheduleException,
+                and_(
+                    DoctorScheduleException.doctor_id == Doctor.id,
+                    DoctorScheduleException.date == day,
+                ),
+            )
+        )
+        if doctor_id is not None:
+            rows = rows.where(Doctor.id == doctor_id)
+
+        query = pg_insert(DoctorSlotCalendar).from_select(
+            ["doctor_id", "date", "slot_mask"], rows
+        )
+        index_elements = [DoctorSlotCalendar.doctor_id, DoctorSlotCalendar.date]
+        if only_missing:
+            query = query.on_conflict_do_nothing(index_elements=index_elements)
+        else:
+            query = query.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={"slot_mask": query.excluded.slot_mask},
+            )
+        query = query.returning(
+            DoctorSlotCalendar.doctor_id,
+            DoctorSlotCalendar.date,
+            DoctorSlotCalendar.slot_mask,
+        )
+        res = await self.db_session.execute(query)
+        return {(row_doctor, row_date): mask for row_doctor, row_date, mask in res}
+
+    async def delete_calendar_before(self, day: date) -> None:
+        await self.db_session.execute(
+            sqlalchemy_delete(DoctorSlotCalendar).where(DoctorSlotCalendar.date < day)
+        )
+
+    async def get_slot_mask(self, doctor_id: int, day: date) -> int:
+        query = select(DoctorSlotCalendar.slot_mask).where(
+            DoctorSlotCalendar.doctor_id == doctor_id,
+            DoctorSlotCalendar.date == day,
+        )
+        res = await self.db_session.execute(query)
+        slot_mask = res.scalar_one_or_none()
+        if slot_mask is None:
+            # beyond the materialized horizon or a doctor added since the last run
+            materialized = await self.materialize(day, day, doctor_id)
+            slot_mask = materialized.get((doctor_id, day), 0)
+        return slot_mask
+
+    async def get_day_masks(
+        self, doctor_id: int, date_from: date, date_to: date
+    ) -> list[tuple[date, int, int]]:
+        # (date, working slots, booked slots) for every day in the range
+        query = (
+            select(
+                DoctorSlotCalendar.date,
+                DoctorSlotCalendar.slot_mask,
+                func.coalesce(func.bit_or(slot_bit(Appointment.slot_index)), 0),
+            )
+            .outerjoin(
+                Appointment,
+                and_(
+                    Appointment.doctor_id == DoctorSlotCalendar.doctor_id,
+                    Appointment.date == DoctorSlotCalendar.date,
+                    Appointment.status == AppointmentStatusEnum.PLANNED,
+                ),
+            )
+            .where(
+                DoctorSlotCalendar.doctor_id == doctor_id,
+                DoctorSlotCalendar.date.between(date_from, date_to),
+            )
+            .group_by(DoctorSlotCalendar.date, DoctorSlotCalendar.slot_mask)
+            .order_by(DoctorSlotCalendar.date)
+        )
+        res = await self.db_session.execute(query)
+        rows = res.all()
+        if len(rows) < (date_to - date_from).days + 1:
+            await self.materialize(date_from, date_to, doctor_id, only_missing=True)
+            res = await self.db_session.execute(query)
+            rows = res.all()
+        return [tuple(row) for row in rows]
+
+    async def find_free_slots(
+        self,
+        specialization: SpecializationEnum,
+        date_from: date,
+        date_to: date,
+        now: datetime,
+        limit: int,
+    ) -> list[tuple[int, date, int]]:
+        # Calendar rows are walked in date order (ix_doctor_slot_calendars_date);
+        # a lateral probe of ix_appointments_doctor_date gives each row's booked
+        # mask once, only free bits are expanded to slots, and the LIMIT stops
+        # the scan at the first days that have any.
+        booked = (
+            select(
+                func.coalesce(func.bit_or(slot_bit(Appointment.slot_index)), 0).label(
+                    "mask"
+                )
+            )
+            .where(
+                Appointment.doctor_id == DoctorSlotCalendar.doctor_id,
+                Appointment.date == DoctorSlotCalendar.date,
+                Appointment.status == AppointmentStatusEnum.PLANNED,
+            )
+            .lateral("booked")
+        )
+        free_mask = DoctorSlotCalendar.slot_mask.op("&")(
+            booked.c.mask.op("#")(FULL_DAY_MASK)
+        )
+        slots = (
+            func.generate_series(0, SLOTS_PER_DAY - 1)
+            .table_valued("slot_index")
+            .render_derived(name="slots")
+        )
+        started_slots = (now.hour * 60 + now.minute) // SLOT_DURATION_MINUTES
+        query = (
+            select(
+                DoctorSlotCalendar.doctor_id,
+                DoctorSlotCalendar.date,
+                slots.c.slot_index,
+            )
+            .join(Doctor, Doctor.id == DoctorSlotCalendar.doctor_id)
+            .join(booked, true())
+            .join(slots, free_mask.op("&")(slot_bit(slots.c.slot_index)) != 0)
+            .where(
+                Doctor.specialization == specialization,
+                DoctorSlotCalendar.date.between(date_from, date_to),
+                free_mask != 0,
+                or_(
+                    DoctorSlotCalendar.date > now.date(),
+                    slots.c.slot_index > started_slots,
+                ),
+            )
+            .order_by(
+                DoctorSlotCalendar.date,
+                slots.c.slot_index,
+                DoctorSlotCalendar.doctor_id,
+            )
+            .limit(limit)
+        )
+        res = await self.db_session.execute(query)
+        return [tuple(row) for row in res]
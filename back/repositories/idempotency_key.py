@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    delete as sqlalchemy_delete,
+    null,
+    select,
+    tuple_,
+    update as sqlalchemy_update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.base_dao import BaseDAO
+from models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyKeyRepository(BaseDAO[IdempotencyKey]):
+    model = IdempotencyKey
+
+    async def claim(
+        self,
+        user_id: int,
+        key: str,
+        scope: str,
+        request_hash: str,
+        now: datetime,
+        expires_at: datetime,
+    ) -> bool:
+        # True if this request owns the key: it is new or the old one expired.
+        # A concurrent claim of the same key waits here until the owner's
+        # transaction ends, then sees its stored response.
+        query = pg_insert(self.model).values(
+            user_id=user_id,
+            key=key,
+            scope=scope,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.user_id, self.model.key],
+            set_={
+                "scope": query.excluded.scope,
+                "request_hash": query.excluded.request_hash,
+                "status_code": null(),
+                "response": null(),
+                "created_at": query.excluded.created_at,
+                "expires_at": query.excluded.expires_at,
+            },
+            where=self.model.expires_at <= now,
+        ).returning(self.model.user_id)
+        res = await self.db_session.execute(query)
+        return res.first() is not None
+
+    async def get(self, user_id: int, key: str) -> IdempotencyKey | None:
+        query = select(self.model).where(
+            self.model.user_id == user_id, self.model.key == key
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def save_response(
+        self, user_id: int, key: str, status_code: int, response: dict
+    ) -> None:
+        await self.db_session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.user_id == user_id, self.model.key == key)
+            .values(status_code=status_code, response=response)
+        )
+
+    async def delete_expired(self, now: datetime, batch_size: int) -> int:
+        expired = (
+            select(self.model.user_id, self.model.key)
+            .where(self.model.expires_at <= now)
+            .limit(batch_size)
+        )
+        res = await self.db_session.execute(
+            sqlalchemy_delete(self.model).where(
+                tuple_(self.model.user_id, self.model.key).in_(expired)
+            )
+        )
+        return res.rowcount
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    delete as sqlalchemy_delete,
+    func,
+    select,
+)
+
+from core.base_dao import BaseDAO
+from models.outbox_event import OutboxEvent
+from schemas.outbox import OutboxEventRetrySchema
+
+
+class OutboxRepository(BaseDAO[OutboxEvent]):
+    model = OutboxEvent
+
+    async def claim_batch(self, batch_size: int) -> list[OutboxEvent]:
+        # rows locked by another dispatcher are skipped, not waited for
+        query = (
+            select(self.model)
+            .where(self.model.available_at <= func.now())
+            .order_by(self.model.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalars().all()
+
+    async def delete_by_ids(self, event_ids: list[int]) -> None:
+        if event_ids:
+            await self.db_session.execute(
+                sqlalchemy_delete(self.model).where(self.model.id.in_(event_ids))
+            )
+
+    async def retry_later(self, retries: list[OutboxEventRetrySchema]) -> None:
+        # one UPDATE ... FROM (VALUES ...) per batch of failed events
+        await self.update_many(retries)
+
+    async def get_stats(self) -> tuple[int, int, datetime | None, float]:
+        # (pending, pending after a failure, oldest pending, its age in seconds)
+        query = select(
+            func.count(),
+            func.count().filter(self.model.attempts > 0),
+            func.min(self.model.created_at),
+            func.coalesce(
+                func.extract("epoch", func.now() - func.min(self.model.created_at)),
+                0,
+            ),
+        )
+        res = await self.db_session.execute(query)
+        return tuple(res.one())
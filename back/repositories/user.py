@@ -1,3 +1,5 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from core.base_dao import BaseDAO
 from models.user import User
 from schemas.user import (
@@ -13,6 +15,19 @@ class UserRepository(BaseDAO[User]):
     async def create_user(self, user_data: UserCreateSchema) -> User:
         return await self.add(user_data)
 
+    async def upsert_user(self, user_data: UserCreateSchema) -> User:
+        query = pg_insert(self.model).values(**user_data.model_dump())
+        query = (
+            query.on_conflict_do_update(
+                index_elements=[self.model.id],
+                set_={"username": query.excluded.username},
+            )
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one()
+
     async def find_user_by_id(self, user_id: int) -> User | None:
         return await self.find_one_or_none_by_id(user_id)
 
@@ -0,0 +1,111 @@
+from datetime import date
+
+from sqlalchemy import (
+    delete as sqlalchemy_delete,
+    exists,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
+
+from core.base_dao import BaseDAO, GuardedResult
+from models.appointment import Appointment, AppointmentStatusEnum
+from models.waitlist import WaitlistEntry
+from schemas.user import IDFilter
+from schemas.waitlist import WaitlistEntryRow
+
+
+class WaitlistRepository(BaseDAO[WaitlistEntry]):
+    model = WaitlistEntry
+
+    async def join(
+        self, user_id: int, doctor_id: int, day: date, slot_index: int
+    ) -> WaitlistEntry | None:
+        query = (
+            pg_insert(self.model)
+            .values(
+                user_id=user_id, doctor_id=doctor_id, date=day, slot_index=slot_index
+            )
+            .on_conflict_do_nothing(constraint="uq_waitlist_user_slot")
+            .returning(self.model)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def get_user_entries(
+        self, user_id: int, entry_id: int | None = None
+    ) -> list[WaitlistEntryRow]:
+        ahead = aliased(self.model)
+        position = (
+            select(func.count())
+            .where(
+                ahead.doctor_id == self.model.doctor_id,
+                ahead.date == self.model.date,
+                ahead.slot_index == self.model.slot_index,
+                ahead.id <= self.model.id,
+            )
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                self.model.id,
+                self.model.doctor_id,
+                self.model.date,
+                self.model.slot_index,
+                self.model.created_at,
+                position,
+            )
+            .where(self.model.user_id == user_id)
+            .order_by(self.model.date, self.model.slot_index)
+        )
+        if entry_id is not None:
+            query = query.where(self.model.id == entry_id)
+        res = await self.db_session.execute(query)
+        return [WaitlistEntryRow(*row) for row in res]
+
+    async def leave(self, entry_id: int, user_id: int) -> GuardedResult[WaitlistEntry]:
+        return await self.delete_guarded(
+            IDFilter(id=entry_id), guards={"owner": self.model.user_id == user_id}
+        )
+
+    async def pop_next(self, doctor_id: int, day: date, slot_index: int) -> int | None:
+        # Takes the first waiter who is free at that time, if the slot itself
+        # is free. SKIP LOCKED lets concurrent promotions of the same slot
+        # pass each other instead of queueing on the head row.
+        next_entry = (
+            select(self.model.id)
+            .where(
+                self.model.doctor_id == doctor_id,
+                self.model.date == day,
+                self.model.slot_index == slot_index,
+                ~exists().where(
+                    Appointment.doctor_id == doctor_id,
+                    Appointment.date == day,
+                    Appointment.slot_index == slot_index,
+                    Appointment.status == AppointmentStatusEnum.PLANNED,
+                ),
+                ~exists().where(
+                    Appointment.user_id == self.model.user_id,
+                    Appointment.date == day,
+                    Appointment.slot_index == slot_index,
+                    Appointment.status == AppointmentStatusEnum.PLANNED,
+                ),
+            )
+            .order_by(self.model.id)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=self.model)
+            .cte("next_entry")
+        )
+        query = (
+            sqlalchemy_delete(self.model)
+            .where(self.model.id.in_(select(next_entry.c.id)))
+            .returning(self.model.user_id)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def delete_before(self, day: date) -> None:
+        await self.db_session.execute(
+            sqlalchemy_delete(self.model).where(self.model.date < day)
+        )
@@ -1,22 +1,26 @@
 
 import datetime
+from dataclasses import dataclass
+from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-from models.appointment import AppointmentStatusEnum
+from models.appointment import AppointmentStatusEnum, SLOTS_PER_DAY
+from schemas.doctor import DoctorSummaryRow, DoctorSummarySchema
+from schemas.doctor_schedule import SlotIndex
 
 
 class AppointmentCreateSchema(BaseModel):
     doctor_id: int
     date: datetime.date
-    slot_index: int
+    slot_index: SlotIndex
 
 
 class AppointmentDBCreateSchema(BaseModel):
     user_id: int
     doctor_id: int
     date: datetime.date
-    slot_index: int
+    slot_index: SlotIndex
     status: AppointmentStatusEnum = AppointmentStatusEnum.PLANNED
 
 
@@ -26,8 +30,77 @@ class AppointmentFilterSchema(BaseModel):
     doctor_id: int | None = None
     slot_index: int | None = None
     date: datetime.date | None = None
+    date_from: datetime.date | None = None
+    date_to: datetime.date | None = None
     status: AppointmentStatusEnum | None = None
 
 
 class AppointmentUpdateSchema(BaseModel):
     status: AppointmentStatusEnum
+
+
+class DoctorUnavailableSchema(BaseModel):
+    date_from: datetime.date
+    date_to: datetime.date
+    slot_from: int = Field(0, ge=0, lt=SLOTS_PER_DAY)
+    slot_to: int = Field(SLOTS_PER_DAY - 1, ge=0, lt=SLOTS_PER_DAY)
+    reassign_to_doctor_id: int | None = None
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.date_from > self.date_to or self.slot_from > self.slot_to:
+            raise ValueError("Empty date or slot range")
+        return self
+
+
+class DoctorUnavailableResultSchema(BaseModel):
+    reassigned_ids: list[int]
+    cancelled_ids: list[int]
+
+
+class AppointmentSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: int
+    doctor_id: int
+    date: datetime.date
+    slot_index: int
+    status: AppointmentStatusEnum
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class AppointmentWithDoctorSchema(AppointmentSchema):
+    doctor: DoctorSummarySchema
+
+
+@dataclass(slots=True)
+class AppointmentWithDoctorRow:
+    id: int
+    user_id: int
+    doctor_id: int
+    date: datetime.date
+    slot_index: int
+    status: AppointmentStatusEnum
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    doctor: DoctorSummaryRow
+
+
+class AppointmentEventEnum(str, Enum):
+    CREATED = "created"
+    CANCELLED = "cancelled"
+    STATUS_CHANGED = "status_changed"
+    REASSIGNED = "reassigned"
+    FINISHED = "finished"
+
+
+class AppointmentEventSchema(BaseModel):
+    event: AppointmentEventEnum
+    appointment_id: int
+    doctor_id: int
+    previous_doctor_id: int | None = None
+    date: datetime.date
+    slot_index: int
+    status: AppointmentStatusEnum
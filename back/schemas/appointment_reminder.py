@@ -0,0 +1,17 @@
+import datetime
+from dataclasses import dataclass
+
+from models.doctor import SpecializationEnum
+
+
+@dataclass(slots=True)
+class DueReminderRow:
+    appointment_id: int
+    offset_minutes: int
+    attempts: int
+    user_id: int
+    starts_at: datetime.datetime
+    doctor_first_name: str
+    doctor_surname: str
+    doctor_middle_name: str
+    doctor_specialization: SpecializationEnum
@@ -0,0 +1,63 @@
+import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from models.background_job import BackgroundJobStatusEnum
+from schemas.appointment import DoctorUnavailableSchema
+
+
+class BackgroundJobKindEnum(str, Enum):
+    CAPACITY_REPORT = "capacity_report"
+    DOCTOR_STATS_REBUILD = "doctor_stats_rebuild"
+    DOCTOR_UNAVAILABLE = "doctor_unavailable"
+    ARCHIVE_APPOINTMENTS = "archive_appointments"
+
+
+class EmptyJobPayloadSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class CapacityReportJobPayloadSchema(BaseModel):
+    date_from: datetime.date
+    date_to: datetime.date
+
+
+class DoctorUnavailableJobPayloadSchema(DoctorUnavailableSchema):
+    doctor_id: int
+
+
+# payload checked at enqueue time, so a worker never gets one it cannot parse
+JOB_PAYLOAD_SCHEMAS: dict[BackgroundJobKindEnum, type[BaseModel]] = {
+    BackgroundJobKindEnum.CAPACITY_REPORT: CapacityReportJobPayloadSchema,
+    BackgroundJobKindEnum.DOCTOR_STATS_REBUILD: EmptyJobPayloadSchema,
+    BackgroundJobKindEnum.DOCTOR_UNAVAILABLE: DoctorUnavailableJobPayloadSchema,
+    BackgroundJobKindEnum.ARCHIVE_APPOINTMENTS: EmptyJobPayloadSchema,
+}
+
+
+class BackgroundJobCreateSchema(BaseModel):
+    kind: BackgroundJobKindEnum
+    payload: dict[str, Any] = {}
+
+
+class BackgroundJobFilterSchema(BaseModel):
+    kind: BackgroundJobKindEnum | None = None
+    status: BackgroundJobStatusEnum | None = None
+
+
+class BackgroundJobSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: BackgroundJobKindEnum
+    payload: dict[str, Any]
+    status: BackgroundJobStatusEnum
+    created_by: int | None = None
+    attempts: int
+    created_at: datetime.datetime
+    started_at: datetime.datetime | None = None
+    finished_at: datetime.datetime | None = None
+    result: dict[str, Any] | None = None
+    last_error: str | None = None
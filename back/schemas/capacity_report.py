@@ -0,0 +1,32 @@
+import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+from models.doctor import SpecializationEnum
+
+
+class CapacityReportFormatEnum(str, Enum):
+    JSON = "json"
+    CSV = "csv"
+
+
+class CapacityOverloadSchema(BaseModel):
+    specialization: SpecializationEnum
+    weekday: int
+    slot_index: int
+    projected_occupancy: float
+
+
+class CapacityReportSchema(BaseModel):
+    date_from: datetime.date
+    date_to: datetime.date
+    projection_weeks: int
+    # arrays are indexed [specialization][weekday][slot_index], in the order
+    # of `specializations`, weekday 0 is Monday; null where there is no data
+    specializations: list[SpecializationEnum]
+    doctor_days: list[list[int]]
+    occupancy: list[list[list[float | None]]]
+    cancellation_rate: list[list[list[float | None]]]
+    projected_occupancy: list[list[list[float | None]]]
+    overloaded: list[CapacityOverloadSchema]
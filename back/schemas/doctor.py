@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
 
 from models.doctor import SpecializationEnum
 
@@ -22,3 +25,63 @@ class DoctorFilterSchema(BaseModel):
 class DoctorUpdateSchema(BaseModel):
     specialization: SpecializationEnum | None = None
     description: str | None = None
+
+
+class DoctorSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    first_name: str
+    surname: str
+    middle_name: str
+    specialization: SpecializationEnum
+    description: str
+
+
+class DoctorSummarySchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    first_name: str
+    surname: str
+    middle_name: str
+    specialization: SpecializationEnum
+
+
+class DoctorImportStatusEnum(str, Enum):
+    INSERTED = "inserted"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+
+
+class DoctorImportRowSchema(BaseModel):
+    row: int
+    status: DoctorImportStatusEnum
+    doctor_id: int | None = None
+    errors: list[str] = []
+
+
+class DoctorImportReportSchema(BaseModel):
+    inserted: int
+    duplicates: int
+    invalid: int
+    rows: list[DoctorImportRowSchema]
+
+
+@dataclass(slots=True)
+class DoctorRow:
+    id: int
+    first_name: str
+    surname: str
+    middle_name: str
+    specialization: SpecializationEnum
+    description: str
+
+
+@dataclass(slots=True)
+class DoctorSummaryRow:
+    id: int
+    first_name: str
+    surname: str
+    middle_name: str
+    specialization: SpecializationEnum
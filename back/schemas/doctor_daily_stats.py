@@ -0,0 +1,15 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class DoctorDailyStatsSchema(BaseModel):
+    doctor_id: int
+    date: datetime.date
+    planned: int
+    finished: int
+    cancelled: int
+    scheduled_slots: int | None = None
+    # booked (planned or finished) share of the working slots
+    utilisation: float | None = None
+    cancellation_rate: float | None = None
@@ -0,0 +1,57 @@
+import datetime
+from typing import Annotated
+
+from pydantic import BaseModel, Field, field_validator
+
+from models.appointment import SLOTS_PER_DAY
+
+SlotIndex = Annotated[int, Field(ge=0, lt=SLOTS_PER_DAY)]
+
+
+class DoctorWeekdayScheduleSchema(BaseModel):
+    weekday: int = Field(ge=0, le=6)
+    slots: list[SlotIndex]
+
+
+class DoctorScheduleTemplateCreateSchema(BaseModel):
+    doctor_id: int
+    weekday: int
+    slot_mask: int
+
+
+class DoctorScheduleUpdateSchema(BaseModel):
+    weekdays: list[DoctorWeekdayScheduleSchema]
+
+    @field_validator("weekdays")
+    @classmethod
+    def check_unique_weekdays(cls, weekdays):
+        if len({w.weekday for w in weekdays}) != len(weekdays):
+            raise ValueError("Weekdays must be unique")
+        return weekdays
+
+
+class DoctorScheduleExceptionCreateSchema(BaseModel):
+    slots: list[SlotIndex] = []
+    reason: str | None = None
+
+
+class DoctorScheduleExceptionSchema(BaseModel):
+    date: datetime.date
+    slots: list[int]
+    reason: str | None = None
+
+
+class DoctorScheduleSchema(BaseModel):
+    weekdays: list[DoctorWeekdayScheduleSchema]
+    exceptions: list[DoctorScheduleExceptionSchema]
+
+
+class DoctorDaySlotsSchema(BaseModel):
+    date: datetime.date
+    free_slots: list[int]
+
+
+class FreeSlotSchema(BaseModel):
+    doctor_id: int
+    date: datetime.date
+    slot_index: int
@@ -0,0 +1,17 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class OutboxStatsSchema(BaseModel):
+    backlog: int
+    retrying: int
+    oldest_created_at: datetime.datetime | None = None
+    lag_seconds: float
+
+
+class OutboxEventRetrySchema(BaseModel):
+    id: int
+    attempts: int
+    available_at: datetime.datetime
+    last_error: str
@@ -2,6 +2,7 @@ from datetime import date
 
 from pydantic import (
     BaseModel,
+    ConfigDict,
     EmailStr,
 )
 
@@ -47,3 +48,18 @@ class EmailFilter(BaseModel):
 
 class IDFilter(BaseModel):
     id: int
+
+
+class UserSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    username: str | None
+    first_name: str | None
+    surname: str | None
+    middle_name: str | None
+    role: UserRoleEnum
+    phone: str | None
+    email: str | None
+    birth_date: date | None
+    gender: str | None
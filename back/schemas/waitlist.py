@@ -0,0 +1,33 @@
+import datetime
+from dataclasses import dataclass
+
+from pydantic import BaseModel, ConfigDict
+
+from schemas.doctor_schedule import SlotIndex
+
+
+class WaitlistJoinSchema(BaseModel):
+    doctor_id: int
+    date: datetime.date
+    slot_index: SlotIndex
+
+
+class WaitlistEntrySchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    doctor_id: int
+    date: datetime.date
+    slot_index: int
+    created_at: datetime.datetime
+    position: int
+
+
+@dataclass(slots=True)
+class WaitlistEntryRow:
+    id: int
+    doctor_id: int
+    date: datetime.date
+    slot_index: int
+    created_at: datetime.datetime
+    position: int
@@ -1,30 +1,47 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, timedelta
+
+from core.config import settings
 
 from core.exceptions import (
     AppointmentAlreadyExistsError,
     AppointmentNotFoundError,
     DoctorNotFoundError,
     DoctorSlotBusyError,
+    DoctorSlotNotScheduledError,
     AppointmentStatusTransitionError,
     AppointmentCannotBeCancelledError,
     ForbiddenError,
+    DoctorSpecializationMismatchError,
+    WaitlistEntryAlreadyExistsError,
+    WaitlistEntryNotFoundError,
+    WaitlistSlotFreeError,
 )
 from models.appointment import Appointment, AppointmentStatusEnum
 from repositories.appointment import AppointmentRepository
 from repositories.doctor import DoctorRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from repositories.waitlist import WaitlistRepository
 from schemas.appointment import (
+    AppointmentEventEnum,
+    AppointmentEventSchema,
     AppointmentCreateSchema,
     AppointmentUpdateSchema,
     AppointmentDBCreateSchema,
     AppointmentFilterSchema,
+    AppointmentWithDoctorRow,
+    DoctorUnavailableSchema,
+    DoctorUnavailableResultSchema,
 )
+from schemas.waitlist import WaitlistEntryRow, WaitlistJoinSchema
 
 
 @dataclass
 class AppointmentService:
     appointment_repository: AppointmentRepository
     doctor_repository: DoctorRepository
+    doctor_schedule_repository: DoctorScheduleRepository
+    waitlist_repository: WaitlistRepository
 
     async def create_appointment(
         self,
@@ -48,6 +65,13 @@ class AppointmentService:
         if doctor is None:
             raise DoctorNotFoundError()
 
+        slot_mask = await self.doctor_schedule_repository.get_slot_mask(
+            doctor_id=appointment_data.doctor_id,
+            day=appointment_data.date,
+        )
+        if not slot_mask >> appointment_data.slot_index & 1:
+            raise DoctorSlotNotScheduledError()
+
         slot_free = await self.doctor_repository.is_slot_available(
             doctor_id=appointment_data.doctor_id,
             date=appointment_data.date,
@@ -56,6 +80,14 @@ class AppointmentService:
         if not slot_free:
             raise DoctorSlotBusyError()
 
+        return await self._book(user_id, appointment_data)
+
+    async def _book(
+        self,
+        user_id: int,
+        appointment_data: AppointmentCreateSchema,
+    ) -> Appointment:
+
         cancelled_by_user = await self.appointment_repository.find_all(
             AppointmentFilterSchema(
                 user_id=user_id,
@@ -67,19 +99,54 @@ class AppointmentService:
         )
 
         if cancelled_by_user:
-            return await self.appointment_repository.update_appointment(
+            appointment = await self.appointment_repository.update_appointment(
                 appointment_id=cancelled_by_user[0].id,
                 appointment_data=AppointmentUpdateSchema(
                     status=AppointmentStatusEnum.PLANNED,
                 )
             )
+        else:
+            appointment = await self.appointment_repository.create_appointment(
+                AppointmentDBCreateSchema(
+                    user_id=user_id,
+                    **appointment_data.model_dump(),
+                )
+            )
 
-        appointment = AppointmentDBCreateSchema(
-            user_id=user_id,
-            **appointment_data.model_dump(),
+        await self._publish(AppointmentEventEnum.CREATED, appointment)
+        return appointment
+
+    async def _publish(
+        self, event: AppointmentEventEnum, appointment: Appointment
+    ) -> None:
+        await self.appointment_repository.publish_events(
+            [
+                AppointmentEventSchema(
+                    event=event,
+                    appointment_id=appointment.id,
+                    doctor_id=appointment.doctor_id,
+                    date=appointment.date,
+                    slot_index=appointment.slot_index,
+                    status=appointment.status,
+                )
+            ]
         )
 
-        return await self.appointment_repository.create_appointment(appointment)
+    async def _promote_waiter(self, appointment: Appointment) -> None:
+        user_id = await self.waitlist_repository.pop_next(
+            doctor_id=appointment.doctor_id,
+            day=appointment.date,
+            slot_index=appointment.slot_index,
+        )
+        if user_id is not None:
+            await self._book(
+                user_id,
+                AppointmentCreateSchema(
+                    doctor_id=appointment.doctor_id,
+                    date=appointment.date,
+                    slot_index=appointment.slot_index,
+                ),
+            )
 
     async def cancel_appointment(
         self,
@@ -87,27 +154,25 @@ class AppointmentService:
         appointment_id: int,
     ) -> Appointment:
 
-        appointment = await self.appointment_repository.find_appointment_by_id(
-            appointment_id
+        result = await self.appointment_repository.cancel_appointment(
+            appointment_id=appointment_id,
+            user_id=user_id,
         )
 
-        if appointment is None:
+        if not result.found:
             raise AppointmentNotFoundError()
 
-        if appointment.user_id != user_id:
+        if result.failed_guard == "owner":
             raise ForbiddenError(
                 message="You are not allowed to cancel this appointment"
             )
 
-        if appointment.status != AppointmentStatusEnum.PLANNED:
+        if result.instance is None:
             raise AppointmentCannotBeCancelledError()
 
-        update_data = AppointmentUpdateSchema(status=AppointmentStatusEnum.CANCELLED)
-
-        return await self.appointment_repository.cancel_appointment(
-            appointment_id=appointment_id,
-            update_data=update_data,
-        )
+        await self._publish(AppointmentEventEnum.CANCELLED, result.instance)
+        await self._promote_waiter(result.instance)
+        return result.instance
 
     async def change_appointment_status(
         self,
@@ -115,33 +180,146 @@ class AppointmentService:
         status: AppointmentStatusEnum,
     ) -> Appointment:
 
-        appointment = await self.appointment_repository.find_appointment_by_id(
-            appointment_id
+        result = await self.appointment_repository.change_appointment_status(
+            appointment_id=appointment_id,
+            status=status,
         )
 
-        if appointment is None:
+        if not result.found:
             raise AppointmentNotFoundError()
 
-        if appointment.status == status:
+        if result.instance is None:
             raise AppointmentStatusTransitionError()
 
-        update_data = AppointmentUpdateSchema(status=status)
+        await self._publish(AppointmentEventEnum.STATUS_CHANGED, result.instance)
+        if status == AppointmentStatusEnum.CANCELLED:
+            await self._promote_waiter(result.instance)
+        return result.instance
 
-        return await self.appointment_repository.update_appointment(
-            appointment_id=appointment_id,
-            appointment_data=update_data,
+    async def mark_doctor_unavailable(
+        self,
+        doctor_id: int,
+        unavailable_data: DoctorUnavailableSchema,
+    ) -> DoctorUnavailableResultSchema:
+
+        doctor = await self.doctor_repository.find_doctor_by_id(doctor_id)
+        if doctor is None:
+            raise DoctorNotFoundError()
+
+        substitute_id = unavailable_data.reassign_to_doctor_id
+        if substitute_id is not None:
+            substitute = await self.doctor_repository.find_doctor_by_id(substitute_id)
+            if substitute is None:
+                raise DoctorNotFoundError(message="Substitute doctor not found")
+            if substitute.specialization != doctor.specialization:
+                raise DoctorSpecializationMismatchError()
+            await self.doctor_schedule_repository.materialize(
+                unavailable_data.date_from,
+                unavailable_data.date_to,
+                substitute_id,
+                only_missing=True,
+            )
+
+        reassigned_ids, cancelled_ids = (
+            await self.appointment_repository.release_doctor_slots(
+                doctor_id=doctor_id,
+                date_from=unavailable_data.date_from,
+                date_to=unavailable_data.date_to,
+                slot_from=unavailable_data.slot_from,
+                slot_to=unavailable_data.slot_to,
+                reassign_to_doctor_id=substitute_id,
+            )
         )
 
+        return DoctorUnavailableResultSchema(
+            reassigned_ids=reassigned_ids, cancelled_ids=cancelled_ids
+        )
+
+    async def join_waitlist(
+        self,
+        user_id: int,
+        waitlist_data: WaitlistJoinSchema,
+    ) -> WaitlistEntryRow:
+
+        doctor = await self.doctor_repository.find_doctor_by_id(waitlist_data.doctor_id)
+        if doctor is None:
+            raise DoctorNotFoundError()
+
+        slot_mask = await self.doctor_schedule_repository.get_slot_mask(
+            doctor_id=waitlist_data.doctor_id,
+            day=waitlist_data.date,
+        )
+        if not slot_mask >> waitlist_data.slot_index & 1:
+            raise DoctorSlotNotScheduledError()
+
+        slot_free = await self.doctor_repository.is_slot_available(
+            doctor_id=waitlist_data.doctor_id,
+            date=waitlist_data.date,
+            slot_index=waitlist_data.slot_index,
+        )
+        if slot_free:
+            raise WaitlistSlotFreeError()
+
+        parallel = await self.appointment_repository.find_parallel_appointment(
+            user_id=user_id,
+            date=waitlist_data.date,
+            slot_index=waitlist_data.slot_index,
+        )
+        if parallel:
+            raise AppointmentAlreadyExistsError()
+
+        entry = await self.waitlist_repository.join(
+            user_id=user_id,
+            doctor_id=waitlist_data.doctor_id,
+            day=waitlist_data.date,
+            slot_index=waitlist_data.slot_index,
+        )
+        if entry is None:
+            raise WaitlistEntryAlreadyExistsError()
+
+        rows = await self.waitlist_repository.get_user_entries(
+            user_id=user_id, entry_id=entry.id
+        )
+        return rows[0]
+
+    async def leave_waitlist(self, user_id: int, entry_id: int) -> None:
+        result = await self.waitlist_repository.leave(
+            entry_id=entry_id, user_id=user_id
+        )
+        if not result.found or result.failed_guard == "owner":
+            raise WaitlistEntryNotFoundError()
+
+    async def get_waitlist(self, user_id: int) -> list[WaitlistEntryRow]:
+        return await self.waitlist_repository.get_user_entries(user_id=user_id)
+
     async def get_appointments(
         self,
         filters: AppointmentFilterSchema,
-    ) -> list[Appointment]:
-
+    ) -> list[AppointmentWithDoctorRow]:
+        # the archive is only read when the requested range reaches past
+        # the archiving cutoff
+        date_from = filters.date or filters.date_from
+        if date_from is None:
+            with_archive = filters.date_to is not None
+        else:
+            with_archive = date_from < self.archive_cutoff()
         appointments = await self.appointment_repository.get_appointments_with_filters(
-            filters=filters
+            filters=filters, with_archive=with_archive
         )
         return appointments
 
+    @staticmethod
+    def archive_cutoff() -> date:
+        return datetime.utcnow().date() - timedelta(
+            days=settings.APPOINTMENT_ARCHIVE_AFTER_DAYS
+        )
+
+    async def archive_appointments(self, batch_size: int) -> int:
+        return await self.appointment_repository.archive_before(
+            self.archive_cutoff(), datetime.utcnow(), batch_size
+        )
+
     async def finish_expired_appointments(self):
         now = datetime.utcnow()
         await self.appointment_repository.finish_appointments(now)
+        await self.waitlist_repository.delete_before(now.date())
@@ -0,0 +1,40 @@
+import logging
+from dataclasses import dataclass
+from datetime import date
+
+from core.config import settings
+from repositories.appointment_partition import AppointmentPartitionRepository
+
+logger = logging.getLogger(__name__)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass
+class AppointmentPartitionService:
+    partition_repository: AppointmentPartitionRepository
+
+    async def maintain_partitions(self, today: date) -> None:
+        current = today.replace(day=1)
+        existing = set(await self.partition_repository.get_partition_months())
+
+        for ahead in range(settings.APPOINTMENT_PARTITIONS_AHEAD_MONTHS + 1):
+            month = add_months(current, ahead)
+            if month not in existing:
+                await self.partition_repository.create_partition(
+                    month, add_months(month, 1)
+                )
+                logger.info("created appointments partition for %s", month)
+
+        if settings.APPOINTMENT_PARTITION_RETENTION_MONTHS is None:
+            return
+        oldest_kept = add_months(
+            current, -settings.APPOINTMENT_PARTITION_RETENTION_MONTHS
+        )
+        for month in sorted(existing):
+            if month < oldest_kept:
+                await self.partition_repository.detach_partition(month)
+                logger.info("detached appointments partition for %s", month)
@@ -16,6 +16,7 @@ from core.security import (
     get_token_hash,
     verify_telegram_webapp,
 )
+from core.single_flight import SingleFlight, TTLCache
 from models.refresh_token import RefreshToken
 from models.user import User, UserRoleEnum
 from repositories.refresh_token import RefreshTokenRepository
@@ -28,6 +29,12 @@ from schemas.user import (
     UserChangeRoleSchema,
 )
 
+# Parallel tabs send the same refresh cookie at once: only one request per
+# token rotates it, the rest share its result, and for a short grace window
+# a just-rotated token keeps returning the same new pair.
+_refresh_flight = SingleFlight()
+_recent_rotations = TTLCache(ttl_seconds=settings.REFRESH_GRACE_SECONDS)
+
 
 @dataclass
 class AuthService:
@@ -46,15 +53,9 @@ class AuthService:
 
         user_data = json.loads(data["user"])
 
-        user = await self.user_repository.find_user_by_id(user_data["id"])
-
-        if not user:
-
-            new_user_payload = UserCreateSchema(
-                id=user_data["id"], username=user_data["username"]
-            )
-
-            user = await self.user_repository.create_user(new_user_payload)
+        user = await self.user_repository.upsert_user(
+            UserCreateSchema(id=user_data["id"], username=user_data["username"])
+        )
 
         token_payload = self._build_token_payload(user)
 
@@ -108,15 +109,29 @@ class AuthService:
         return await self.user_repository.find_user_by_id(user_id)
 
     async def refresh_tokens(self, token: str) -> tuple[str, str]:
+        token_hash = get_token_hash(token)
+
+        rotated = _recent_rotations.get(token_hash)
+        if rotated is not None:
+            return rotated
+
+        return await _refresh_flight.do(
+            token_hash, lambda: self._rotate_refresh_token(token_hash)
+        )
+
+    async def _rotate_refresh_token(self, token_hash: str) -> tuple[str, str]:
         token_record: RefreshToken | None = await self.refresh_repository.get_by_token(
-            get_token_hash(token)
+            token_hash
         )
 
         if not token_record:
             raise TokenNotFoundError()
 
         if token_record.revoked_at is not None:
-            await self.refresh_repository.revoke_all_for_user(token_record.user_id)
+            grace = timedelta(seconds=settings.REFRESH_GRACE_SECONDS)
+            # rotated moments ago (e.g. by another worker): not a reuse attack
+            if token_record.revoked_at + grace < datetime.now(timezone.utc):
+                await self.refresh_repository.revoke_all_for_user(token_record.user_id)
             raise TokenRevokedError()
 
         if token_record.expires_at < datetime.now(timezone.utc):
@@ -134,11 +149,15 @@ class AuthService:
         new_refresh_token = create_refresh_token()
 
         await self.refresh_repository.rotate_token(
-            old_token=get_token_hash(token),
+            old_token=token_hash,
             new_token=get_token_hash(new_refresh_token),
             user_id=user_id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=30),
         )
+        # followers and retries get this pair, so it must be persisted first
+        await self.refresh_repository.db_session.commit()
+
+        _recent_rotations.set(token_hash, (access_token, new_refresh_token))
 
         return access_token, new_refresh_token
 
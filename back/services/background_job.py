@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel, ValidationError
+
+from core.exceptions import BackgroundJobNotFoundError, BackgroundJobPayloadError
+from models.background_job import BackgroundJob
+from repositories.background_job import BackgroundJobRepository
+from schemas.background_job import (
+    JOB_PAYLOAD_SCHEMAS,
+    BackgroundJobCreateSchema,
+    BackgroundJobFilterSchema,
+    BackgroundJobKindEnum,
+)
+
+BackgroundJobHandler = Callable[[BaseModel], Awaitable[dict | None]]
+
+# kind -> handler; filled by services.background_job_handlers, which only
+# the worker process imports
+background_job_handlers: dict[BackgroundJobKindEnum, BackgroundJobHandler] = {}
+
+
+def background_job_handler(kind: BackgroundJobKindEnum):
+    def register(handler: BackgroundJobHandler) -> BackgroundJobHandler:
+        background_job_handlers[kind] = handler
+        return handler
+
+    return register
+
+
+def parse_job_payload(kind: BackgroundJobKindEnum, payload: dict) -> BaseModel:
+    try:
+        return JOB_PAYLOAD_SCHEMAS[kind].model_validate(payload)
+    except ValidationError as e:
+        raise BackgroundJobPayloadError(
+            extra={"errors": e.errors(include_url=False, include_context=False)}
+        )
+
+
+@dataclass
+class BackgroundJobService:
+    job_repository: BackgroundJobRepository
+
+    async def enqueue(
+        self, job_data: BackgroundJobCreateSchema, user_id: int
+    ) -> BackgroundJob:
+        payload = parse_job_payload(job_data.kind, job_data.payload)
+        return await self.job_repository.enqueue(
+            job_data.kind.value, payload.model_dump(mode="json"), user_id
+        )
+
+    async def get_job(self, job_id: int) -> BackgroundJob:
+        job = await self.job_repository.find_one_or_none_by_id(job_id)
+        if job is None:
+            raise BackgroundJobNotFoundError()
+        return job
+
+    async def get_jobs(
+        self, filters: BackgroundJobFilterSchema, limit: int
+    ) -> list[BackgroundJob]:
+        return await self.job_repository.get_jobs(
+            filters.kind.value if filters.kind else None, filters.status, limit
+        )
@@ -0,0 +1,67 @@
+from infrastructure.database import async_session_maker
+from repositories.appointment import AppointmentRepository
+from repositories.capacity_report import CapacityReportRepository
+from repositories.doctor import DoctorRepository
+from repositories.doctor_daily_stats import DoctorDailyStatsRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from repositories.waitlist import WaitlistRepository
+from schemas.appointment import DoctorUnavailableSchema
+from schemas.background_job import (
+    BackgroundJobKindEnum,
+    CapacityReportJobPayloadSchema,
+    DoctorUnavailableJobPayloadSchema,
+    EmptyJobPayloadSchema,
+)
+from services.appointment import AppointmentService
+from services.background_job import background_job_handler
+from services.capacity_report import CapacityReportService
+from services.doctor_daily_stats import DoctorDailyStatsService
+from services.jobs.archive_appointments import archive_appointments
+
+
+@background_job_handler(BackgroundJobKindEnum.CAPACITY_REPORT)
+async def run_capacity_report(payload: CapacityReportJobPayloadSchema) -> dict:
+    async with async_session_maker() as session:
+        report_service = CapacityReportService(
+            report_repository=CapacityReportRepository(session)
+        )
+        report = await report_service.get_capacity_report(
+            payload.date_from, payload.date_to
+        )
+    return report.model_dump(mode="json")
+
+
+@background_job_handler(BackgroundJobKindEnum.DOCTOR_STATS_REBUILD)
+async def run_doctor_stats_rebuild(payload: EmptyJobPayloadSchema) -> dict:
+    async with async_session_maker() as session:
+        async with session.begin():
+            stats_service = DoctorDailyStatsService(
+                stats_repository=DoctorDailyStatsRepository(session)
+            )
+            days = await stats_service.refresh(full=True)
+    return {"days": days}
+
+
+@background_job_handler(BackgroundJobKindEnum.DOCTOR_UNAVAILABLE)
+async def run_doctor_unavailable(payload: DoctorUnavailableJobPayloadSchema) -> dict:
+    async with async_session_maker() as session:
+        async with session.begin():
+            appointment_service = AppointmentService(
+                appointment_repository=AppointmentRepository(session),
+                doctor_repository=DoctorRepository(session),
+                doctor_schedule_repository=DoctorScheduleRepository(session),
+                waitlist_repository=WaitlistRepository(session),
+            )
+            result = await appointment_service.mark_doctor_unavailable(
+                payload.doctor_id,
+                DoctorUnavailableSchema.model_validate(
+                    payload.model_dump(exclude={"doctor_id"})
+                ),
+            )
+    return result.model_dump(mode="json")
+
+
+@background_job_handler(BackgroundJobKindEnum.ARCHIVE_APPOINTMENTS)
+async def run_archive_appointments(payload: EmptyJobPayloadSchema) -> None:
+    # batches commit one by one, a retry resumes where it stopped
+    await archive_appointments()
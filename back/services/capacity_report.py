@@ -0,0 +1,184 @@
+import asyncio
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from core.config import settings
+from core.exceptions import StatsRangeError
+from models.appointment import AppointmentStatusEnum, SLOTS_PER_DAY
+from models.doctor import SpecializationEnum
+from repositories.capacity_report import CapacityReportRepository, STATUS_CODES
+from schemas.capacity_report import CapacityOverloadSchema, CapacityReportSchema
+
+SPECIALIZATIONS = list(SpecializationEnum)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _trend_projection(series: np.ndarray, ahead: int) -> np.ndarray:
+    # least-squares line per cell over axis 0 (weeks), NaN weeks skipped,
+    # evaluated `ahead` weeks after the last one
+    weeks = np.arange(series.shape[0], dtype=np.float64).reshape(
+        -1, *[1] * (series.ndim - 1)
+    )
+    known = ~np.isnan(series)
+    n = known.sum(axis=0)
+    values = np.where(known, series, 0.0)
+    t_mean = _ratio((weeks * known).sum(axis=0), n)
+    y_mean = _ratio(values.sum(axis=0), n)
+    dt = np.where(known, weeks - t_mean, 0.0)
+    slope = _ratio((dt * (values - y_mean)).sum(axis=0), (dt * dt).sum(axis=0))
+    slope = np.where(np.isnan(slope) & (n > 0), 0.0, slope)
+    target = series.shape[0] - 1 + ahead
+    return np.maximum(y_mean + slope * (target - t_mean), 0.0)
+
+
+def _to_list(values: np.ndarray) -> list:
+    return np.where(np.isnan(values), None, values.round(4)).tolist()
+
+
+def build_capacity_report(
+    date_from: date,
+    date_to: date,
+    doctors: list[tuple[int, SpecializationEnum]],
+    columns: tuple[list[int], list[int], list[int], list[int]],
+) -> CapacityReportSchema:
+    n_days = (date_to - date_from).days + 1
+    doctor_ids = np.array([doctor_id for doctor_id, _ in doctors], dtype=np.int64)
+    specializations = np.array(
+        [SPECIALIZATIONS.index(spec) for _, spec in doctors], dtype=np.int64
+    )
+    doctor_col, day_col, slot_col, status_col = (
+        np.asarray(column, dtype=np.int64) for column in columns
+    )
+    # doctors x days x slots count tensors, filled with one bincount each
+    doctor_idx = np.searchsorted(doctor_ids, doctor_col)
+    flat = (doctor_idx * n_days + day_col) * SLOTS_PER_DAY + slot_col
+    shape = (len(doctor_ids), n_days, SLOTS_PER_DAY)
+    cancelled_mask = status_col == STATUS_CODES[AppointmentStatusEnum.CANCELLED]
+    booked = np.bincount(flat[~cancelled_mask], minlength=np.prod(shape)).reshape(shape)
+    cancelled = np.bincount(flat[cancelled_mask], minlength=np.prod(shape)).reshape(
+        shape
+    )
+    # history has no working calendar: a doctor-day counts once it has any
+    # appointment
+    worked = ((booked + cancelled).sum(axis=2) > 0).astype(np.int64)
+
+    # fold doctors into specializations and days into weekdays with one-hot
+    # matrix products
+    by_spec = np.zeros((len(SPECIALIZATIONS), len(doctor_ids)), dtype=np.int64)
+    by_spec[specializations, np.arange(len(doctor_ids))] = 1
+    weekdays = (date_from.weekday() + np.arange(n_days)) % 7
+    by_weekday = np.zeros((n_days, 7), dtype=np.int64)
+    by_weekday[np.arange(n_days), weekdays] = 1
+
+    booked_spec = np.tensordot(by_spec, booked, axes=1)
+    cancelled_spec = np.tensordot(by_spec, cancelled, axes=1)
+    worked_spec = by_spec @ worked
+
+    def per_weekday(days_first: np.ndarray) -> np.ndarray:
+        return np.moveaxis(np.tensordot(days_first, by_weekday, axes=([1], [0])), -1, 1)
+
+    booked_week = per_weekday(booked_spec)
+    cancelled_week = per_weekday(cancelled_spec)
+    doctor_days = worked_spec @ by_weekday
+    occupancy = _ratio(booked_week, doctor_days[..., None])
+    cancellation_rate = _ratio(cancelled_week, booked_week + cancelled_week)
+
+    # weekly occupancy series per (specialization, weekday, slot); the
+    # trailing partial week is left out
+    n_weeks = n_days // 7
+    projected = np.full(occupancy.shape, np.nan)
+    if n_weeks:
+        weekly_booked = booked_spec[:, : n_weeks * 7].reshape(
+            len(SPECIALIZATIONS), n_weeks, 7, SLOTS_PER_DAY
+        )
+        weekly_worked = worked_spec[:, : n_weeks * 7].reshape(
+            len(SPECIALIZATIONS), n_weeks, 7
+        )
+        weekly = _ratio(weekly_booked, weekly_worked[..., None])
+        # week positions start at date_from's weekday, shift them to Monday
+        weekly = np.roll(weekly, date_from.weekday(), axis=2)
+        projected = _trend_projection(
+            np.moveaxis(weekly, 1, 0), settings.CAPACITY_PROJECTION_WEEKS
+        )
+
+    overloaded = np.argwhere(projected >= settings.CAPACITY_OVERLOAD_THRESHOLD)
+    return CapacityReportSchema(
+        date_from=date_from,
+        date_to=date_to,
+        projection_weeks=settings.CAPACITY_PROJECTION_WEEKS,
+        specializations=SPECIALIZATIONS,
+        doctor_days=doctor_days.tolist(),
+        occupancy=_to_list(occupancy),
+        cancellation_rate=_to_list(cancellation_rate),
+        projected_occupancy=_to_list(projected),
+        overloaded=[
+            CapacityOverloadSchema(
+                specialization=SPECIALIZATIONS[spec],
+                weekday=weekday,
+                slot_index=slot_index,
+                projected_occupancy=round(
+                    float(projected[spec, weekday, slot_index]), 4
+                ),
+            )
+            for spec, weekday, slot_index in overloaded.tolist()
+        ],
+    )
+
+
+def capacity_report_csv(report: CapacityReportSchema) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(
+        [
+            "specialization",
+            "weekday",
+            "slot_index",
+            "doctor_days",
+            "occupancy",
+            "cancellation_rate",
+            "projected_occupancy",
+        ]
+    )
+    for spec_idx, spec in enumerate(report.specializations):
+        for weekday in range(7):
+            for slot_index in range(SLOTS_PER_DAY):
+                writer.writerow(
+                    [
+                        spec.value,
+                        weekday,
+                        slot_index,
+                        report.doctor_days[spec_idx][weekday],
+                        report.occupancy[spec_idx][weekday][slot_index],
+                        report.cancellation_rate[spec_idx][weekday][slot_index],
+                        report.projected_occupancy[spec_idx][weekday][slot_index],
+                    ]
+                )
+    return buffer.getvalue()
+
+
+@dataclass
+class CapacityReportService:
+    report_repository: CapacityReportRepository
+
+    async def get_capacity_report(
+        self, date_from: date, date_to: date
+    ) -> CapacityReportSchema:
+        if date_from > date_to:
+            raise StatsRangeError()
+        if (date_to - date_from).days >= settings.CAPACITY_REPORT_MAX_DAYS:
+            raise StatsRangeError(extra={"max_days": settings.CAPACITY_REPORT_MAX_DAYS})
+        # doctors second: every doctor_id in the columns is then among them
+        columns = await self.report_repository.get_slot_columns(date_from, date_to)
+        doctors = await self.report_repository.get_doctor_specializations()
+        # numpy releases the GIL for the heavy parts; keep the loop free
+        return await asyncio.to_thread(
+            build_capacity_report, date_from, date_to, doctors, columns
+        )
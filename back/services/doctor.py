@@ -1,14 +1,62 @@
+import csv
+import io
+import json
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 
-from core.exceptions import DoctorAlreadyExistsError, DoctorNotFoundError
-from models.doctor import Doctor
+from pydantic import ValidationError
+
+from core.config import settings
+from core.exceptions import (
+    DoctorAlreadyExistsError,
+    DoctorImportFormatError,
+    DoctorNotFoundError,
+)
+from infrastructure.doctor_search import DoctorPrefixIndex, normalize_query
+from models.doctor import Doctor, SpecializationEnum
 from repositories.doctor import DoctorRepository
-from schemas.doctor import DoctorCreateSchema, DoctorFilterSchema, DoctorUpdateSchema
+from repositories.doctor_schedule import DoctorScheduleRepository
+from schemas.doctor import (
+    DoctorCreateSchema,
+    DoctorFilterSchema,
+    DoctorImportReportSchema,
+    DoctorImportRowSchema,
+    DoctorImportStatusEnum,
+    DoctorRow,
+    DoctorSummaryRow,
+    DoctorUpdateSchema,
+)
+
+
+def _parse_import_file(content: bytes, content_type: str) -> list[dict]:
+    try:
+        text = content.decode("utf-8-sig")
+        if "json" in content_type:
+            records = json.loads(text)
+            if not isinstance(records, list):
+                raise DoctorImportFormatError("Expected a JSON array of doctors")
+            return records
+        dialect = csv.Sniffer().sniff(text.split("\n", 1)[0], delimiters=",;\t")
+        return list(csv.DictReader(io.StringIO(text), dialect=dialect))
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        raise DoctorImportFormatError(extra={"orig": str(e)})
 
 
 @dataclass
 class DoctorService:
     doctor_repository: DoctorRepository
+    schedule_repository: DoctorScheduleRepository
+    prefix_index: DoctorPrefixIndex
+
+    async def _materialize_calendar(self, doctor_id: int | None = None) -> None:
+        # new doctors become bookable right away instead of after the nightly job
+        today = datetime.utcnow().date()
+        await self.schedule_repository.materialize(
+            today,
+            today + timedelta(days=settings.SLOT_CALENDAR_HORIZON_DAYS),
+            doctor_id,
+            only_missing=True,
+        )
 
     async def create_doctor(self, doctor_data: DoctorCreateSchema) -> Doctor:
         doctor = await self.doctor_repository.find_all(
@@ -18,38 +66,103 @@ class DoctorService:
             raise DoctorAlreadyExistsError()
 
         doctor = await self.doctor_repository.create_doctor(doctor_data)
+        await self._materialize_calendar(doctor.id)
+        self.prefix_index.invalidate()
         return doctor
 
+    async def import_doctors(
+        self, content: bytes, content_type: str
+    ) -> DoctorImportReportSchema:
+        report: dict[int, DoctorImportRowSchema] = {}
+        valid: list[tuple[int, DoctorCreateSchema]] = []
+
+        for row_no, record in enumerate(_parse_import_file(content, content_type), 1):
+            try:
+                valid.append((row_no, DoctorCreateSchema.model_validate(record)))
+            except ValidationError as e:
+                report[row_no] = DoctorImportRowSchema(
+                    row=row_no,
+                    status=DoctorImportStatusEnum.INVALID,
+                    errors=[
+                        f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                        for err in e.errors()
+                    ],
+                )
+
+        if valid:
+            if len(valid) < settings.DOCTOR_IMPORT_COPY_MIN_ROWS:
+                imported = await self.doctor_repository.insert_new_doctors(valid)
+            else:
+                imported = await self.doctor_repository.import_doctors(valid)
+            if any(imported.values()):
+                await self._materialize_calendar()
+                self.prefix_index.invalidate()
+            for row_no, doctor_id in imported.items():
+                report[row_no] = DoctorImportRowSchema(
+                    row=row_no,
+                    status=(
+                        DoctorImportStatusEnum.INSERTED
+                        if doctor_id
+                        else DoctorImportStatusEnum.DUPLICATE
+                    ),
+                    doctor_id=doctor_id,
+                )
+
+        rows = [report[row_no] for row_no in sorted(report)]
+        statuses = [row.status for row in rows]
+        return DoctorImportReportSchema(
+            inserted=statuses.count(DoctorImportStatusEnum.INSERTED),
+            duplicates=statuses.count(DoctorImportStatusEnum.DUPLICATE),
+            invalid=statuses.count(DoctorImportStatusEnum.INVALID),
+            rows=rows,
+        )
+
     async def update_doctor(
         self,
         doctor_id: int,
         doctor_data: DoctorUpdateSchema,
     ) -> Doctor:
 
-        doctor = await self.doctor_repository.find_doctor_by_id(doctor_id)
-        if not doctor:
-            raise DoctorNotFoundError()
-
         updated_doctor = await self.doctor_repository.update_doctor(
             doctor_id=doctor_id, doctor_data=doctor_data
         )
+        if not updated_doctor:
+            raise DoctorNotFoundError()
 
+        self.prefix_index.invalidate()
         return updated_doctor
 
     async def delete_doctor(self, doctor_id: int) -> None:
-        doctor = await self.doctor_repository.find_doctor_by_id(doctor_id)
-        if not doctor:
+        deleted = await self.doctor_repository.delete_doctor(doctor_id=doctor_id)
+        if not deleted:
             raise DoctorNotFoundError()
-
-        await self.doctor_repository.delete_doctor(doctor_id=doctor_id)
+        # other workers catch up within DOCTOR_SEARCH_INDEX_TTL_SECONDS
+        self.prefix_index.invalidate()
 
     async def get_doctors(
         self,
         filters: DoctorFilterSchema,
-    ) -> list[Doctor]:
+    ) -> list[DoctorRow]:
 
         doctors = await self.doctor_repository.get_doctors_with_filters(filters=filters)
         return doctors
 
+    async def search_doctors(
+        self,
+        query: str,
+        specialization: SpecializationEnum | None,
+        limit: int,
+    ) -> list[DoctorSummaryRow]:
+        query = normalize_query(query)
+        if settings.DOCTOR_SEARCH_IN_MEMORY:
+            await self.prefix_index.ensure_fresh(
+                self.doctor_repository.get_search_catalogue
+            )
+            doctors = self.prefix_index.search(query, specialization, limit)
+            if doctors:
+                return doctors
+            # no prefix match, likely a typo: trigram search in the database
+        return await self.doctor_repository.search_doctors(query, specialization, limit)
+
     async def get_doctor_by_id(self, doctor_id: int) -> Doctor | None:
         return await self.doctor_repository.find_doctor_by_id(doctor_id)
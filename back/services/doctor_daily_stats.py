@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from core.config import settings
+from core.exceptions import StatsRangeError
+from repositories.doctor_daily_stats import DoctorDailyStatsRepository
+from schemas.doctor_daily_stats import DoctorDailyStatsSchema
+
+WATERMARK_NAME = "doctor_daily_stats"
+
+
+@dataclass
+class DoctorDailyStatsService:
+    stats_repository: DoctorDailyStatsRepository
+
+    async def refresh(self, full: bool = False) -> int:
+        # Only days with appointments updated since the previous run are
+        # recounted. The watermark is read back with a margin, so a
+        # transaction that committed after that run is not missed.
+        started_at = datetime.utcnow()
+        processed_until = await self.stats_repository.lock_watermark(WATERMARK_NAME)
+        since = None
+        if processed_until is not None and not full:
+            since = processed_until - timedelta(
+                seconds=settings.DOCTOR_STATS_WATERMARK_MARGIN_SECONDS
+            )
+        dates = await self.stats_repository.get_changed_dates(since)
+        batch_days = settings.DOCTOR_STATS_REFRESH_BATCH_DAYS
+        for start in range(0, len(dates), batch_days):
+            await self.stats_repository.refresh_dates(
+                dates[start : start + batch_days], started_at
+            )
+        await self.stats_repository.set_watermark(WATERMARK_NAME, started_at)
+        return len(dates)
+
+    async def get_daily_stats(
+        self, date_from: date, date_to: date, doctor_id: int | None = None
+    ) -> list[DoctorDailyStatsSchema]:
+        if date_from > date_to:
+            raise StatsRangeError()
+        if (date_to - date_from).days >= settings.DOCTOR_STATS_MAX_DAYS:
+            raise StatsRangeError(extra={"max_days": settings.DOCTOR_STATS_MAX_DAYS})
+        rows = await self.stats_repository.get_daily_stats(
+            date_from, date_to, doctor_id
+        )
+        return [
+            DoctorDailyStatsSchema(
+                doctor_id=row.doctor_id,
+                date=row.date,
+                planned=row.planned,
+                finished=row.finished,
+                cancelled=row.cancelled,
+                scheduled_slots=row.scheduled_slots,
+                utilisation=(
+                    (row.planned + row.finished) / row.scheduled_slots
+                    if row.scheduled_slots
+                    else None
+                ),
+                cancellation_rate=(
+                    row.cancelled / total
+                    if (total := row.planned + row.finished + row.cancelled)
+                    else None
+                ),
+            )
+            for row in rows
+        ]
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from core.config import settings
+from core.exceptions import (
+    DoctorNotFoundError,
+    DoctorScheduleExceptionNotFoundError,
+    ScheduleRangeError,
+)
+from models.doctor import SpecializationEnum
+from models.doctor_schedule import mask_to_slots, slots_to_mask
+from repositories.doctor import DoctorRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from schemas.doctor_schedule import (
+    DoctorDaySlotsSchema,
+    DoctorScheduleExceptionCreateSchema,
+    DoctorScheduleExceptionSchema,
+    DoctorScheduleSchema,
+    DoctorScheduleUpdateSchema,
+    DoctorWeekdayScheduleSchema,
+    FreeSlotSchema,
+)
+
+
+@dataclass
+class DoctorScheduleService:
+    schedule_repository: DoctorScheduleRepository
+    doctor_repository: DoctorRepository
+
+    async def _check_doctor(self, doctor_id: int) -> None:
+        doctor = await self.doctor_repository.find_doctor_by_id(doctor_id)
+        if doctor is None:
+            raise DoctorNotFoundError()
+
+    async def get_schedule(self, doctor_id: int) -> DoctorScheduleSchema:
+        await self._check_doctor(doctor_id)
+        templates = await self.schedule_repository.get_templates(doctor_id)
+        exceptions = await self.schedule_repository.get_exceptions(
+            doctor_id, datetime.utcnow().date()
+        )
+        return DoctorScheduleSchema(
+            weekdays=[
+                DoctorWeekdayScheduleSchema(
+                    weekday=t.weekday, slots=mask_to_slots(t.slot_mask)
+                )
+                for t in templates
+            ],
+            exceptions=[
+                DoctorScheduleExceptionSchema(
+                    date=e.date, slots=mask_to_slots(e.slot_mask), reason=e.reason
+                )
+                for e in exceptions
+            ],
+        )
+
+    async def set_weekly_schedule(
+        self, doctor_id: int, schedule_data: DoctorScheduleUpdateSchema
+    ) -> DoctorScheduleSchema:
+        await self._check_doctor(doctor_id)
+        await self.schedule_repository.replace_templates(
+            doctor_id,
+            {w.weekday: slots_to_mask(w.slots) for w in schedule_data.weekdays},
+        )
+        today = datetime.utcnow().date()
+        await self.schedule_repository.materialize(
+            today,
+            today + timedelta(days=settings.SLOT_CALENDAR_HORIZON_DAYS),
+            doctor_id,
+        )
+        return await self.get_schedule(doctor_id)
+
+    async def set_exception(
+        self,
+        doctor_id: int,
+        day: date,
+        exception_data: DoctorScheduleExceptionCreateSchema,
+    ) -> DoctorScheduleExceptionSchema:
+        await self._check_doctor(doctor_id)
+        exception = await self.schedule_repository.upsert_exception(
+            doctor_id,
+            day,
+            slots_to_mask(exception_data.slots),
+            exception_data.reason,
+        )
+        await self.schedule_repository.materialize(day, day, doctor_id)
+        return DoctorScheduleExceptionSchema(
+            date=exception.date,
+            slots=mask_to_slots(exception.slot_mask),
+            reason=exception.reason,
+        )
+
+    async def delete_exception(self, doctor_id: int, day: date) -> None:
+        deleted = await self.schedule_repository.delete_exception(doctor_id, day)
+        if not deleted:
+            raise DoctorScheduleExceptionNotFoundError()
+        await self.schedule_repository.materialize(day, day, doctor_id)
+
+    async def get_free_slots(
+        self, doctor_id: int, date_from: date, date_to: date
+    ) -> list[DoctorDaySlotsSchema]:
+        if date_from > date_to:
+            raise ScheduleRangeError()
+        if (date_to - date_from).days >= settings.SLOT_CALENDAR_HORIZON_DAYS:
+            raise ScheduleRangeError(
+                extra={"max_days": settings.SLOT_CALENDAR_HORIZON_DAYS}
+            )
+        await self._check_doctor(doctor_id)
+        days = await self.schedule_repository.get_day_masks(
+            doctor_id, date_from, date_to
+        )
+        return [
+            DoctorDaySlotsSchema(date=day, free_slots=mask_to_slots(mask & ~busy))
+            for day, mask, busy in days
+        ]
+
+    async def find_earliest_slots(
+        self,
+        specialization: SpecializationEnum,
+        date_from: date | None,
+        date_to: date | None,
+        limit: int,
+    ) -> list[FreeSlotSchema]:
+        # the calendar is kept materialized up to the horizon, so the search
+        # never reads further than that
+        now = datetime.utcnow()
+        horizon = now.date() + timedelta(days=settings.SLOT_CALENDAR_HORIZON_DAYS)
+        date_from = max(date_from or now.date(), now.date())
+        date_to = min(date_to or horizon, horizon)
+        if date_from > date_to:
+            return []
+        slots = await self.schedule_repository.find_free_slots(
+            specialization, date_from, date_to, now, limit
+        )
+        return [
+            FreeSlotSchema(doctor_id=doctor_id, date=day, slot_index=slot_index)
+            for doctor_id, day, slot_index in slots
+        ]
+
+    async def refresh_calendar(self) -> None:
+        today = datetime.utcnow().date()
+        await self.schedule_repository.delete_calendar_before(today)
+        await self.schedule_repository.materialize(
+            today, today + timedelta(days=settings.SLOT_CALENDAR_HORIZON_DAYS)
+        )
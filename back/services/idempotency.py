@@ -0,0 +1,57 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from core.config import settings
+from core.exceptions import IdempotencyKeyReusedError
+from repositories.idempotency_key import IdempotencyKeyRepository
+
+CLEANUP_BATCH_SIZE = 5000
+
+
+def request_fingerprint(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass
+class IdempotencyService:
+    idempotency_repository: IdempotencyKeyRepository
+
+    async def claim(
+        self, user_id: int, key: str, scope: str, request_hash: str
+    ) -> tuple[int, dict] | None:
+        # None: the caller owns the key and must run the request, then
+        # save_response; otherwise the stored (status, body) to replay
+        now = datetime.utcnow()
+        claimed = await self.idempotency_repository.claim(
+            user_id=user_id,
+            key=key,
+            scope=scope,
+            request_hash=request_hash,
+            now=now,
+            expires_at=now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+        )
+        if claimed:
+            return None
+
+        stored = await self.idempotency_repository.get(user_id, key)
+        if (
+            stored is None
+            or stored.response is None
+            or stored.scope != scope
+            or stored.request_hash != request_hash
+        ):
+            raise IdempotencyKeyReusedError()
+        return stored.status_code, stored.response
+
+    async def save_response(
+        self, user_id: int, key: str, status_code: int, response: dict
+    ) -> None:
+        await self.idempotency_repository.save_response(
+            user_id=user_id, key=key, status_code=status_code, response=response
+        )
+
+    async def delete_expired(self) -> int:
+        return await self.idempotency_repository.delete_expired(
+            datetime.utcnow(), CLEANUP_BATCH_SIZE
+        )
@@ -0,0 +1,25 @@
+from core.config import settings
+from infrastructure.database import async_session_maker
+from repositories.appointment import AppointmentRepository
+from repositories.doctor import DoctorRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from repositories.waitlist import WaitlistRepository
+from services.appointment import AppointmentService
+
+
+async def archive_appointments():
+    # one transaction per batch keeps locks and WAL bursts short
+    for _ in range(settings.APPOINTMENT_ARCHIVE_MAX_BATCHES_PER_RUN):
+        async with async_session_maker() as session:
+            async with session.begin():
+                appointment_service = AppointmentService(
+                    appointment_repository=AppointmentRepository(session),
+                    doctor_repository=DoctorRepository(session),
+                    doctor_schedule_repository=DoctorScheduleRepository(session),
+                    waitlist_repository=WaitlistRepository(session),
+                )
+                moved = await appointment_service.archive_appointments(
+                    settings.APPOINTMENT_ARCHIVE_BATCH_SIZE
+                )
+        if moved < settings.APPOINTMENT_ARCHIVE_BATCH_SIZE:
+            break
@@ -0,0 +1,13 @@
+from datetime import timedelta
+
+from core.config import settings
+from infrastructure.database import async_session_maker
+from repositories.background_job import BackgroundJobRepository
+
+
+async def cleanup_background_jobs():
+    async with async_session_maker() as session:
+        async with session.begin():
+            await BackgroundJobRepository(session).delete_finished_before(
+                timedelta(days=settings.JOB_RETENTION_DAYS)
+            )
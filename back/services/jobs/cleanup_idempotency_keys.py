@@ -0,0 +1,16 @@
+from infrastructure.database import async_session_maker
+from repositories.idempotency_key import IdempotencyKeyRepository
+from services.idempotency import CLEANUP_BATCH_SIZE, IdempotencyService
+
+
+async def cleanup_idempotency_keys():
+    # one short transaction per batch so the table is never locked for long
+    while True:
+        async with async_session_maker() as session:
+            async with session.begin():
+                idempotency_service = IdempotencyService(
+                    idempotency_repository=IdempotencyKeyRepository(session)
+                )
+                deleted = await idempotency_service.delete_expired()
+        if deleted < CLEANUP_BATCH_SIZE:
+            break
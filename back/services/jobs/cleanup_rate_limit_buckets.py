@@ -0,0 +1,5 @@
+from infrastructure.rate_limit import rate_limiter
+
+
+async def cleanup_rate_limit_buckets():
+    await rate_limiter.delete_idle()
@@ -0,0 +1,20 @@
+from core.config import settings
+from infrastructure.database import async_session_maker
+from repositories.outbox import OutboxRepository
+from services.outbox import OutboxService
+import services.outbox_handlers  # noqa: F401  registers the handlers
+
+
+async def dispatch_outbox():
+    # one transaction per batch: rows stay locked only while being handled
+    for _ in range(settings.OUTBOX_MAX_BATCHES_PER_RUN):
+        async with async_session_maker() as session:
+            async with session.begin():
+                outbox_service = OutboxService(
+                    outbox_repository=OutboxRepository(session)
+                )
+                claimed = await outbox_service.dispatch_batch(
+                    settings.OUTBOX_BATCH_SIZE
+                )
+        if claimed < settings.OUTBOX_BATCH_SIZE:
+            break
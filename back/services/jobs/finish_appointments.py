@@ -1,6 +1,8 @@
 from infrastructure.database import async_session_maker
 from repositories.appointment import AppointmentRepository
 from repositories.doctor import DoctorRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from repositories.waitlist import WaitlistRepository
 from services.appointment import AppointmentService
 
 
@@ -9,9 +11,13 @@ async def finish_appointments():
         async with session.begin():
             doctor_repo = DoctorRepository(session)
             appointment_repo = AppointmentRepository(session)
+            schedule_repo = DoctorScheduleRepository(session)
+            waitlist_repo = WaitlistRepository(session)
             appointment_service = AppointmentService(
                 appointment_repository=appointment_repo,
-                doctor_repository=doctor_repo
+                doctor_repository=doctor_repo,
+                doctor_schedule_repository=schedule_repo,
+                waitlist_repository=waitlist_repo,
             )
             await appointment_service.finish_expired_appointments()
             await session.commit()
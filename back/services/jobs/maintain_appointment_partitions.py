@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from infrastructure.database import async_session_maker
+from repositories.appointment_partition import AppointmentPartitionRepository
+from services.appointment_partition import AppointmentPartitionService
+
+
+async def maintain_appointment_partitions():
+    async with async_session_maker() as session:
+        async with session.begin():
+            partition_service = AppointmentPartitionService(
+                partition_repository=AppointmentPartitionRepository(session)
+            )
+            await partition_service.maintain_partitions(datetime.utcnow().date())
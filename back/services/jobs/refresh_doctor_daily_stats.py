@@ -0,0 +1,12 @@
+from infrastructure.database import async_session_maker
+from repositories.doctor_daily_stats import DoctorDailyStatsRepository
+from services.doctor_daily_stats import DoctorDailyStatsService
+
+
+async def refresh_doctor_daily_stats():
+    async with async_session_maker() as session:
+        async with session.begin():
+            stats_service = DoctorDailyStatsService(
+                stats_repository=DoctorDailyStatsRepository(session)
+            )
+            await stats_service.refresh()
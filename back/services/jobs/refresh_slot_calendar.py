@@ -0,0 +1,14 @@
+from infrastructure.database import async_session_maker
+from repositories.doctor import DoctorRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from services.doctor_schedule import DoctorScheduleService
+
+
+async def refresh_slot_calendar():
+    async with async_session_maker() as session:
+        async with session.begin():
+            schedule_service = DoctorScheduleService(
+                schedule_repository=DoctorScheduleRepository(session),
+                doctor_repository=DoctorRepository(session),
+            )
+            await schedule_service.refresh_calendar()
@@ -0,0 +1,28 @@
+from core.config import settings
+from infrastructure.database import async_session_maker
+from infrastructure.telegram import telegram_bot
+from repositories.appointment_reminder import AppointmentReminderRepository
+from services.reminder import ReminderService
+
+
+async def send_reminders():
+    async with async_session_maker() as session:
+        async with session.begin():
+            await ReminderService(
+                reminder_repository=AppointmentReminderRepository(session),
+                telegram_bot=telegram_bot,
+            ).schedule_due_reminders()
+
+    # one transaction per batch, failed reminders wait for their backoff
+    while True:
+        async with async_session_maker() as session:
+            async with session.begin():
+                reminder_service = ReminderService(
+                    reminder_repository=AppointmentReminderRepository(session),
+                    telegram_bot=telegram_bot,
+                )
+                claimed = await reminder_service.send_due_reminders(
+                    settings.REMINDER_BATCH_SIZE
+                )
+        if claimed < settings.REMINDER_BATCH_SIZE:
+            break
@@ -0,0 +1,81 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from core.config import settings
+from models.outbox_event import OutboxEvent
+from repositories.outbox import OutboxRepository
+from schemas.outbox import OutboxEventRetrySchema, OutboxStatsSchema
+
+logger = logging.getLogger(__name__)
+
+OutboxHandler = Callable[[OutboxEvent], Awaitable[None]]
+
+# event_type -> handlers; filled by services.outbox_handlers, which the
+# dispatch job imports. Events nobody handles stay in the table.
+outbox_handlers: dict[str, list[OutboxHandler]] = defaultdict(list)
+
+
+def outbox_handler(*event_types: str):
+    def register(handler: OutboxHandler) -> OutboxHandler:
+        for event_type in event_types:
+            outbox_handlers[event_type].append(handler)
+        return handler
+
+    return register
+
+
+@dataclass
+class OutboxService:
+    outbox_repository: OutboxRepository
+
+    async def dispatch_batch(self, batch_size: int) -> int:
+        # At-least-once: an event is deleted only after all its handlers
+        # succeeded, so handlers must tolerate seeing it again.
+        events = await self.outbox_repository.claim_batch(batch_size)
+        dispatched = []
+        retries = []
+        for event in events:
+            handlers = outbox_handlers.get(event.event_type)
+            try:
+                if not handlers:
+                    raise LookupError(f"no handler for {event.event_type!r}")
+                for handler in handlers:
+                    await handler(event)
+            except Exception as e:
+                logger.exception("outbox event %s failed", event.id)
+                retries.append(
+                    OutboxEventRetrySchema(
+                        id=event.id,
+                        attempts=event.attempts + 1,
+                        available_at=datetime.utcnow() + self._retry_delay(event),
+                        last_error=repr(e),
+                    )
+                )
+            else:
+                dispatched.append(event.id)
+        await self.outbox_repository.retry_later(retries)
+        await self.outbox_repository.delete_by_ids(dispatched)
+        return len(events)
+
+    @staticmethod
+    def _retry_delay(event: OutboxEvent) -> timedelta:
+        return timedelta(
+            seconds=min(
+                settings.OUTBOX_RETRY_SECONDS * 2**event.attempts,
+                settings.OUTBOX_MAX_RETRY_SECONDS,
+            )
+        )
+
+    async def get_stats(self) -> OutboxStatsSchema:
+        backlog, retrying, oldest_created_at, lag_seconds = (
+            await self.outbox_repository.get_stats()
+        )
+        return OutboxStatsSchema(
+            backlog=backlog,
+            retrying=retrying,
+            oldest_created_at=oldest_created_at,
+            lag_seconds=lag_seconds,
+        )
@@ -0,0 +1,34 @@
+from infrastructure.database import async_session_maker
+from infrastructure.telegram import telegram_bot
+from models.appointment import AppointmentStatusEnum
+from models.outbox_event import OutboxEvent
+from repositories.appointment_reminder import AppointmentReminderRepository
+from schemas.appointment import AppointmentEventEnum
+from services.outbox import outbox_handler
+from services.reminder import ReminderService
+
+
+def _reminder_service(session) -> ReminderService:
+    return ReminderService(
+        reminder_repository=AppointmentReminderRepository(session),
+        telegram_bot=telegram_bot,
+    )
+
+
+@outbox_handler(
+    AppointmentEventEnum.CREATED.value,
+    AppointmentEventEnum.CANCELLED.value,
+    AppointmentEventEnum.STATUS_CHANGED.value,
+    AppointmentEventEnum.REASSIGNED.value,
+    AppointmentEventEnum.FINISHED.value,
+)
+async def sync_reminders(event: OutboxEvent) -> None:
+    # both branches are idempotent, so a redelivered event is harmless
+    appointment_ids = [event.payload["appointment_id"]]
+    async with async_session_maker() as session:
+        async with session.begin():
+            reminder_service = _reminder_service(session)
+            if event.payload["status"] == AppointmentStatusEnum.PLANNED.value:
+                await reminder_service.schedule_for(appointment_ids)
+            else:
+                await reminder_service.cancel_for(appointment_ids)
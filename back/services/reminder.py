@@ -0,0 +1,83 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from core.config import settings
+from core.exceptions import TelegramSendError
+from infrastructure.telegram import TelegramBotClient
+from repositories.appointment_reminder import AppointmentReminderRepository
+from schemas.appointment_reminder import DueReminderRow
+
+
+def _reminder_text(reminder: DueReminderRow) -> str:
+    return (
+        f"Напоминание о записи к врачу: {reminder.doctor_specialization.value}, "
+        f"{reminder.doctor_surname} {reminder.doctor_first_name} "
+        f"{reminder.doctor_middle_name}, {reminder.starts_at:%d.%m.%Y} "
+        f"в {reminder.starts_at:%H:%M}."
+    )
+
+
+@dataclass
+class ReminderService:
+    reminder_repository: AppointmentReminderRepository
+    telegram_bot: TelegramBotClient
+
+    async def schedule_due_reminders(self) -> None:
+        now = datetime.utcnow()
+        await self.reminder_repository.delete_started(now)
+        await self.reminder_repository.schedule_due(
+            now, settings.REMINDER_OFFSETS_MINUTES
+        )
+
+    async def schedule_for(self, appointment_ids: list[int]) -> None:
+        # a booking inside the largest offset gets its reminder right away
+        # instead of on the next job run
+        await self.reminder_repository.schedule_due(
+            datetime.utcnow(), settings.REMINDER_OFFSETS_MINUTES, appointment_ids
+        )
+
+    async def cancel_for(self, appointment_ids: list[int]) -> None:
+        await self.reminder_repository.delete_unsent(appointment_ids)
+
+    async def _send(self, reminder: DueReminderRow) -> TelegramSendError | None:
+        try:
+            # users are keyed by their Telegram id, which is also the chat id
+            await self.telegram_bot.send_message(
+                reminder.user_id, _reminder_text(reminder)
+            )
+        except TelegramSendError as e:
+            return e
+        return None
+
+    async def send_due_reminders(self, batch_size: int) -> int:
+        # A batch is sent concurrently while its rows stay locked; if the
+        # transaction is lost the batch is sent again (at-least-once).
+        now = datetime.utcnow()
+        reminders = await self.reminder_repository.claim_batch(
+            now, batch_size, settings.REMINDER_MAX_ATTEMPTS
+        )
+        errors = await asyncio.gather(*(self._send(r) for r in reminders))
+
+        sent = []
+        for reminder, error in zip(reminders, errors):
+            if error is None:
+                sent.append((reminder.appointment_id, reminder.offset_minutes))
+                continue
+            attempts = (
+                settings.REMINDER_MAX_ATTEMPTS
+                if error.permanent
+                else reminder.attempts + 1
+            )
+            await self.reminder_repository.mark_failed(
+                reminder.appointment_id,
+                reminder.offset_minutes,
+                attempts,
+                now
+                + timedelta(
+                    seconds=settings.REMINDER_RETRY_SECONDS * 2**reminder.attempts
+                ),
+                error.message,
+            )
+        await self.reminder_repository.mark_sent(sent, datetime.utcnow())
+        return len(reminders)
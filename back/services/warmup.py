@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from infrastructure.database import warm_up_pool
+from models.doctor import SpecializationEnum
+from repositories.appointment import AppointmentRepository
+from repositories.doctor import DoctorRepository
+from repositories.doctor_schedule import DoctorScheduleRepository
+from repositories.refresh_token import RefreshTokenRepository
+from repositories.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def run_hot_statements(session: AsyncSession) -> None:
+    # Read-only versions of what auth, booking and slot search run on every
+    # request, with ids that match nothing: they compile the SQL once per
+    # process and prepare it once per connection.
+    now = datetime.utcnow()
+    today = now.date()
+    doctor_repository = DoctorRepository(session)
+    appointment_repository = AppointmentRepository(session)
+    await UserRepository(session).find_user_by_id(0)
+    await RefreshTokenRepository(session).get_by_token("")
+    await doctor_repository.find_doctor_by_id(0)
+    await doctor_repository.is_slot_available(0, today, 0)
+    await appointment_repository.find_appointment_by_id(0)
+    await appointment_repository.find_parallel_appointment(0, today, 0)
+    await appointment_repository.get_user_appointments(0)
+    await DoctorScheduleRepository(session).find_free_slots(
+        SpecializationEnum.THERAPIST, today, today, now, 1
+    )
+
+
+async def warm_up_database() -> None:
+    # a slow or failing warmup only costs the cold start it tries to avoid
+    try:
+        await asyncio.wait_for(
+            warm_up_pool(settings.DB_POOL_WARMUP_CONNECTIONS, run_hot_statements),
+            settings.DB_POOL_WARMUP_TIMEOUT_SECONDS,
+        )
+    except Exception:
+        logger.exception("database warmup failed")
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+from sqlalchemy import text
+
+from core.config import settings
+from infrastructure.database import async_session_maker, engine
+from repositories.refresh_token import RefreshTokenRepository
+from repositories.user import UserRepository
+from services.auth import AuthService
+
+TELEGRAM_ID = 990_000_001
+
+
+def _init_data(user_id: int, username: str) -> str:
+    # signed the way Telegram signs WebApp init data
+    data = {
+        "user": json.dumps({"id": user_id, "username": username}),
+        "auth_date": str(int(time.time())),
+    }
+    data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(data.items()))
+    secret_key = hmac.new(
+        b"WebAppData", settings.BOT_TOKEN.encode(), hashlib.sha256
+    ).digest()
+    data["hash"] = hmac.new(
+        secret_key, data_check_string.encode(), hashlib.sha256
+    ).hexdigest()
+    return urlencode(data)
+
+
+async def _login(username: str) -> tuple[str, str]:
+    async with async_session_maker() as session:
+        auth_service = AuthService(
+            user_repository=UserRepository(session),
+            refresh_repository=RefreshTokenRepository(session),
+        )
+        tokens = await auth_service.login_via_telegram(
+            _init_data(TELEGRAM_ID, username)
+        )
+        await session.commit()
+        return tokens
+
+
+async def _delete_user() -> None:
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("DELETE FROM refresh_tokens WHERE user_id = :id"),
+            {"id": TELEGRAM_ID},
+        )
+        await connection.execute(
+            text("DELETE FROM users WHERE id = :id"), {"id": TELEGRAM_ID}
+        )
+
+
+def test_parallel_logins_create_one_user():
+    async def run():
+        try:
+            async with engine.connect() as connection:
+                migrated = await connection.scalar(
+                    text("SELECT to_regclass('users') IS NOT NULL")
+                )
+        except (OSError, ConnectionError) as e:
+            pytest.skip(f"postgres unavailable: {e}")
+        if not migrated:
+            pytest.skip("database is not migrated")
+        await _delete_user()
+        try:
+            usernames = [f"user{i}" for i in range(8)]
+            results = await asyncio.gather(
+                *(_login(username) for username in usernames)
+            )
+            assert all(access and refresh for access, refresh in results)
+
+            async with engine.connect() as connection:
+                rows = (
+                    await connection.execute(
+                        text("SELECT username FROM users WHERE id = :id"),
+                        {"id": TELEGRAM_ID},
+                    )
+                ).all()
+            assert len(rows) == 1
+            assert rows[0].username in usernames
+
+            # a later login overwrites the stored username
+            await _login("renamed")
+            async with engine.connect() as connection:
+                username = await connection.scalar(
+                    text("SELECT username FROM users WHERE id = :id"),
+                    {"id": TELEGRAM_ID},
+                )
+            assert username == "renamed"
+        finally:
+            await _delete_user()
+            await engine.dispose()
+
+    asyncio.run(run())
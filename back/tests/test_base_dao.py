@@ -0,0 +1,198 @@
+import asyncio
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+
+from core.base_dao import _statement_cache
+from infrastructure.database import async_session_maker, engine
+from models.appointment import Appointment, AppointmentStatusEnum
+from models.appointment_archive import AppointmentArchive
+from models.doctor import Doctor, SpecializationEnum
+from models.refresh_token import RefreshToken  # noqa: F401, User relationship
+from models.user import User, UserRoleEnum
+from repositories.appointment import AppointmentRepository
+from repositories.doctor import DoctorRepository
+from schemas.appointment import AppointmentFilterSchema, AppointmentWithDoctorRow
+from schemas.doctor import DoctorFilterSchema, DoctorRow
+
+USER_ID = 990_000_002
+ARCHIVED_ID = 990_000_002
+DOCTOR_ROW = AppointmentWithDoctorRow.__dataclass_fields__["doctor"].type
+
+
+class RecordingSession:
+    # stands in for AsyncSession: keeps what would have been executed
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, query, params=None):
+        self.executed.append((query, params))
+        return _Result()
+
+
+class _Result(list):
+    def scalars(self):
+        return self
+
+    def scalar_one_or_none(self):
+        return None
+
+
+def test_repeated_filter_keys_reuse_statement():
+    session = RecordingSession()
+    repository = DoctorRepository(session)
+
+    async def run():
+        await repository.get_doctors_with_filters(DoctorFilterSchema(surname="Иванов"))
+        await repository.get_doctors_with_filters(DoctorFilterSchema(surname="Петров"))
+        await repository.get_doctors_with_filters(
+            DoctorFilterSchema(surname="Петров", first_name="Петр")
+        )
+        await repository.find_one_or_none_by_id(1)
+        await repository.find_one_or_none_by_id(2)
+
+    asyncio.run(run())
+
+    (first, first_params), (second, second_params), (third, _) = session.executed[:3]
+    # same key set: one statement, values only in the bind parameters
+    assert first is second
+    assert first_params == {"f_surname": "Иванов"}
+    assert second_params == {"f_surname": "Петров"}
+    assert third is not first
+    (by_id, _), (by_id_again, params) = session.executed[3:]
+    assert by_id is by_id_again
+    assert params == {"f_id": 2}
+    assert ("select", Doctor, ("id",), ()) in _statement_cache
+
+
+def test_archive_flag_gets_its_own_statement():
+    session = RecordingSession()
+    repository = AppointmentRepository(session)
+    filters = AppointmentFilterSchema(user_id=1)
+
+    async def run():
+        await repository.get_appointments_with_filters(filters)
+        await repository.get_appointments_with_filters(filters, with_archive=True)
+        await repository.get_appointments_with_filters(
+            AppointmentFilterSchema(user_id=2), with_archive=True
+        )
+
+    asyncio.run(run())
+
+    (hot, _), (both, _), (both_again, params) = session.executed
+    assert hot is not both
+    assert both is both_again
+    assert params == {"f_user_id": 2}
+
+
+def _as_dict(row) -> dict:
+    return {
+        f.name: (
+            _as_dict(value) if is_dataclass(value := getattr(row, f.name)) else value
+        )
+        for f in fields(row)
+    }
+
+
+def _expected(instance, doctor: Doctor) -> dict:
+    values = {
+        f.name: getattr(instance, f.name)
+        for f in fields(AppointmentWithDoctorRow)
+        if f.name != "doctor"
+    }
+    values["doctor"] = {f.name: getattr(doctor, f.name) for f in fields(DOCTOR_ROW)}
+    return values
+
+
+def test_find_all_rows_matches_find_all():
+    async def run():
+        try:
+            async with engine.connect() as connection:
+                migrated = await connection.scalar(
+                    text("SELECT to_regclass('appointments_archive') IS NOT NULL")
+                )
+        except (OSError, ConnectionError) as e:
+            pytest.skip(f"postgres unavailable: {e}")
+        if not migrated:
+            pytest.skip("database is not migrated")
+        try:
+            async with async_session_maker() as session:
+                await _compare(session)
+                await session.rollback()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+async def _compare(session) -> None:
+    session.add(User(id=USER_ID, username="rows", role=UserRoleEnum.USER))
+    doctors = [
+        Doctor(
+            first_name="Иван",
+            surname="Строков",
+            middle_name="Иванович",
+            specialization=SpecializationEnum.THERAPIST,
+            description="d",
+        ),
+        Doctor(
+            first_name="Анна",
+            surname="Строкова",
+            middle_name="Ивановна",
+            specialization=SpecializationEnum.SURGEON,
+            description="d",
+        ),
+    ]
+    session.add_all(doctors)
+    await session.flush()
+    today = date.today()
+    session.add_all(
+        [
+            Appointment(
+                user_id=USER_ID, doctor_id=doctors[0].id, date=today, slot_index=1
+            ),
+            Appointment(
+                user_id=USER_ID,
+                doctor_id=doctors[1].id,
+                date=today,
+                slot_index=2,
+                status=AppointmentStatusEnum.FINISHED,
+            ),
+            AppointmentArchive(
+                id=ARCHIVED_ID,
+                user_id=USER_ID,
+                doctor_id=doctors[1].id,
+                date=today,
+                slot_index=3,
+                status=AppointmentStatusEnum.CANCELLED,
+                created_at=datetime(2026, 1, 1),
+                updated_at=datetime(2026, 1, 2),
+            ),
+        ]
+    )
+    await session.flush()
+
+    repository = AppointmentRepository(session)
+    doctors_by_id = {doctor.id: doctor for doctor in doctors}
+    for with_archive in (False, True):
+        filters = AppointmentFilterSchema(user_id=USER_ID)
+        instances = await repository.find_all(filters, with_archive=with_archive)
+        rows = await repository.get_appointments_with_filters(
+            filters, with_archive=with_archive
+        )
+        expected = sorted(
+            (_expected(i, doctors_by_id[i.doctor_id]) for i in instances),
+            key=lambda row: row["slot_index"],
+        )
+        actual = sorted(map(_as_dict, rows), key=lambda row: row["slot_index"])
+        assert len(actual) == (3 if with_archive else 2)
+        assert actual == expected
+
+    doctor_rows = await DoctorRepository(session).get_doctors_with_filters(
+        DoctorFilterSchema(surname="Строкова", first_name="Анна")
+    )
+    assert [_as_dict(row) for row in doctor_rows] == [
+        {f.name: getattr(doctors[1], f.name) for f in fields(DoctorRow)}
+    ]
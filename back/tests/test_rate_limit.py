@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from infrastructure import rate_limit
+from infrastructure.database import engine
+from infrastructure.rate_limit import (
+    MemoryBucketStore,
+    PostgresBucketStore,
+    RateLimiter,
+)
+from core.exceptions import RateLimitExceededError
+from models.rate_limit_bucket import RateLimitBucket
+
+# the configured default for the "appointment" bucket
+CAPACITY, RATE = 10.0, 10 / 60
+
+
+async def _drain(store, key: str) -> float:
+    for _ in range(int(CAPACITY)):
+        assert await store.take(key, CAPACITY, RATE) == 0
+    return await store.take(key, CAPACITY, RATE)
+
+
+def test_memory_bucket_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    store = MemoryBucketStore(max_keys=10)
+
+    async def run():
+        assert await _drain(store, "k") > 0
+        now[0] += 1 / RATE
+        assert await store.take("k", CAPACITY, RATE) == 0
+        assert await store.take("k", CAPACITY, RATE) > 0
+
+    asyncio.run(run())
+
+
+def test_postgres_bucket_refills():
+    store = PostgresBucketStore()
+
+    async def run():
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(
+                    RateLimitBucket.__table__.create, checkfirst=True
+                )
+                await connection.execute(
+                    text("DELETE FROM rate_limit_buckets WHERE key = 'test'")
+                )
+        except (OSError, ConnectionError) as e:
+            pytest.skip(f"postgres unavailable: {e}")
+        try:
+            assert await _drain(store, "test") > 0
+            # move the last update into the past instead of sleeping
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text(
+                        "UPDATE rate_limit_buckets "
+                        "SET updated_at = updated_at - make_interval(secs => :s) "
+                        "WHERE key = 'test'"
+                    ),
+                    {"s": 1 / RATE},
+                )
+            assert await store.take("test", CAPACITY, RATE) == 0
+            assert await store.take("test", CAPACITY, RATE) > 0
+        finally:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text("DELETE FROM rate_limit_buckets WHERE key = 'test'")
+                )
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_global_rejection_keeps_user_tokens():
+    limiter = RateLimiter(
+        {"appointment": "2/60", "appointment:global": "1/60"},
+        MemoryBucketStore(max_keys=10),
+    )
+
+    async def run():
+        await limiter.hit("appointment", "1")
+        with pytest.raises(RateLimitExceededError):
+            await limiter.hit("appointment", "1")
+        tokens, _ = limiter.store._buckets["appointment:1"]
+        assert tokens >= 1
+
+    asyncio.run(run())
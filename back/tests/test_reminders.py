@@ -0,0 +1,116 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from infrastructure.telegram import TelegramBotClient
+from models.doctor import SpecializationEnum
+from schemas.appointment_reminder import DueReminderRow
+from services.reminder import ReminderService
+from tools import fake_telegram_api as fake
+
+
+class MemoryReminderRepository:
+    # the part of AppointmentReminderRepository the sender uses
+    def __init__(self, reminders: list[DueReminderRow]):
+        self.reminders = reminders
+        self.sent: list[tuple[int, int]] = []
+        self.failed: dict[tuple[int, int], tuple[int, str]] = {}
+
+    async def claim_batch(self, now, batch_size, max_attempts):
+        return self.reminders[:batch_size]
+
+    async def mark_sent(self, keys, now):
+        self.sent.extend(keys)
+
+    async def mark_failed(
+        self, appointment_id, offset_minutes, attempts, available_at, error
+    ):
+        self.failed[(appointment_id, offset_minutes)] = (attempts, error)
+
+
+def _reminder(appointment_id: int, chat_id: int) -> DueReminderRow:
+    return DueReminderRow(
+        appointment_id=appointment_id,
+        offset_minutes=60,
+        attempts=0,
+        user_id=chat_id,
+        starts_at=datetime.utcnow() + timedelta(hours=1),
+        doctor_first_name="Иван",
+        doctor_surname="Иванов",
+        doctor_middle_name="Иванович",
+        doctor_specialization=SpecializationEnum.THERAPIST,
+    )
+
+
+@pytest.fixture
+def telegram_bot(monkeypatch):
+    monkeypatch.setattr(fake, "LATENCY", 0)
+    monkeypatch.setattr(fake, "ERROR_RATE", 0)
+    fake.stats.clear()
+    fake.window.clear()
+    bot = TelegramBotClient(
+        api_url="http://fake",
+        token="123",
+        max_concurrency=10,
+        messages_per_second=100,
+        max_retries=2,
+        timeout=5,
+    )
+    bot._client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake.app), base_url="http://fake/bot123/"
+    )
+    return bot
+
+
+def _send(bot: TelegramBotClient, repository: MemoryReminderRepository) -> float:
+    service = ReminderService(reminder_repository=repository, telegram_bot=bot)
+
+    async def run():
+        try:
+            await service.send_due_reminders(batch_size=100)
+        finally:
+            await bot.aclose()
+
+    start = time.monotonic()
+    asyncio.run(run())
+    return time.monotonic() - start
+
+
+def test_throttled_reminders_wait_for_retry_after(telegram_bot, monkeypatch):
+    monkeypatch.setattr(fake, "RATE", 2)
+    monkeypatch.setattr(fake, "RETRY_AFTER", 1)
+    repository = MemoryReminderRepository([_reminder(i, i) for i in range(1, 5)])
+
+    elapsed = _send(telegram_bot, repository)
+
+    assert fake.stats["throttled"] > 0
+    assert sorted(repository.sent) == [(i, 60) for i in range(1, 5)]
+    assert not repository.failed
+    # two messages fit the first second, the rest wait for retry_after
+    assert elapsed >= 1
+
+
+def test_proxy_error_page_fails_only_its_reminder(telegram_bot, monkeypatch):
+    monkeypatch.setattr(fake, "RATE", 1000)
+    monkeypatch.setattr(fake, "PROXY_ERROR_CHATS", {2})
+    monkeypatch.setattr(asyncio, "sleep", _no_backoff(asyncio.sleep))
+    repository = MemoryReminderRepository([_reminder(1, 1), _reminder(2, 2)])
+
+    _send(telegram_bot, repository)
+
+    assert repository.sent == [(1, 60)]
+    attempts, error = repository.failed[(2, 60)]
+    # retryable: one attempt used, not marked as permanently failed
+    assert attempts == 1
+    assert "502" in error
+    assert fake.stats["proxy_errors"] == telegram_bot.max_retries + 1
+
+
+def _no_backoff(sleep):
+    async def no_backoff(delay, *args, **kwargs):
+        await sleep(0)
+
+    return no_backoff
@@ -0,0 +1,110 @@
+# Local stand-in for the Telegram Bot API sendMessage method, for trying
+# reminders without a real bot and for measuring sender throughput:
+#   uvicorn tools.fake_telegram_api:app --port 8081
+#   TELEGRAM_API_URL=http://127.0.0.1:8081
+# FAKE_TELEGRAM_RATE caps accepted messages per second (429 with
+# retry_after above it), FAKE_TELEGRAM_LATENCY_MS delays every answer,
+# FAKE_TELEGRAM_ERROR_RATE answers that share of requests with a 500,
+# FAKE_TELEGRAM_BLOCKED_CHATS lists chat ids answered with a 403 and
+# FAKE_TELEGRAM_PROXY_ERROR_CHATS chat ids answered with the HTML 502 page of
+# a failing proxy. FAKE_TELEGRAM_RETRY_AFTER is the retry_after of a 429.
+import asyncio
+import os
+import random
+import time
+from collections import Counter, deque
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse
+
+RATE = float(os.getenv("FAKE_TELEGRAM_RATE", "30"))
+LATENCY = float(os.getenv("FAKE_TELEGRAM_LATENCY_MS", "50")) / 1000
+ERROR_RATE = float(os.getenv("FAKE_TELEGRAM_ERROR_RATE", "0"))
+RETRY_AFTER = int(os.getenv("FAKE_TELEGRAM_RETRY_AFTER", "1"))
+
+
+def _chat_ids(name: str) -> set[int]:
+    return {int(chat_id) for chat_id in os.getenv(name, "").split(",") if chat_id}
+
+
+BLOCKED_CHATS = _chat_ids("FAKE_TELEGRAM_BLOCKED_CHATS")
+PROXY_ERROR_CHATS = _chat_ids("FAKE_TELEGRAM_PROXY_ERROR_CHATS")
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+stats: Counter = Counter()
+messages: deque = deque(maxlen=1000)
+# start times of the messages accepted during the last second
+window: deque = deque()
+started = time.monotonic()
+
+
+def _error(status_code: int, description: str, **parameters) -> ORJSONResponse:
+    body = {"ok": False, "error_code": status_code, "description": description}
+    if parameters:
+        body["parameters"] = parameters
+    return ORJSONResponse(body, status_code=status_code)
+
+
+@app.post("/bot{token}/sendMessage")
+async def send_message(token: str, request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+    await asyncio.sleep(LATENCY)
+
+    now = time.monotonic()
+    while window and now - window[0] >= 1:
+        window.popleft()
+    if body.get("chat_id") in PROXY_ERROR_CHATS:
+        stats["proxy_errors"] += 1
+        return HTMLResponse(
+            "<html><body><h1>502 Bad Gateway</h1></body></html>", status_code=502
+        )
+    if len(window) >= RATE:
+        stats["throttled"] += 1
+        return _error(
+            429,
+            f"Too Many Requests: retry after {RETRY_AFTER}",
+            retry_after=RETRY_AFTER,
+        )
+    if body.get("chat_id") in BLOCKED_CHATS:
+        stats["blocked"] += 1
+        return _error(403, "Forbidden: bot was blocked by the user")
+    if random.random() < ERROR_RATE:
+        stats["failed"] += 1
+        return _error(500, "Internal Server Error")
+
+    window.append(now)
+    stats["sent"] += 1
+    message = {
+        "message_id": stats["sent"],
+        "chat": {"id": body.get("chat_id"), "type": "private"},
+        "date": int(time.time()),
+        "text": body.get("text"),
+    }
+    messages.append(message)
+    return {"ok": True, "result": message}
+
+
+@app.get("/stats")
+async def get_stats():
+    elapsed = time.monotonic() - started
+    return {
+        **stats,
+        "elapsed_seconds": elapsed,
+        "sent_per_second": stats["sent"] / elapsed if elapsed else 0,
+    }
+
+
+@app.get("/messages")
+async def get_messages():
+    return list(messages)
+
+
+@app.delete("/stats")
+async def reset_stats():
+    global started
+    stats.clear()
+    messages.clear()
+    started = time.monotonic()
+    return {"ok": True}
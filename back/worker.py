@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import signal
+import socket
+from datetime import timedelta
+
+from core.config import settings
+from core.exceptions import AppError
+from infrastructure.database import async_session_maker, engine
+from models.background_job import BackgroundJob, BackgroundJobStatusEnum
+from repositories.background_job import BackgroundJobRepository
+from schemas.background_job import BackgroundJobKindEnum
+from services.background_job import background_job_handlers, parse_job_payload
+import services.background_job_handlers  # noqa: F401  registers the handlers
+
+logger = logging.getLogger("worker")
+
+
+class Worker:
+    # Runs background_jobs outside the web process: claims up to
+    # `concurrency` jobs with FOR UPDATE SKIP LOCKED, keeps their lease alive
+    # with heartbeats and records the outcome. Several workers can share
+    # the table.
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._running: dict[int, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    def stop(self) -> None:
+        logger.info("stopping, waiting for %s running jobs", len(self._running))
+        self._stopping.set()
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        logger.info("worker %s started", self.worker_id)
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping.is_set():
+                free = self.concurrency - len(self._running)
+                try:
+                    jobs = await self._claim(free) if free else []
+                except Exception:
+                    # database restarting or migrations not applied yet
+                    logger.exception("claiming jobs failed")
+                    jobs = []
+                for job in jobs:
+                    task = asyncio.create_task(self._execute(job))
+                    self._running[job.id] = task
+                    task.add_done_callback(self._on_done(job.id))
+                if len(jobs) < free or not free:
+                    # idle or full: wait for the poll interval or a free slot
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), settings.JOB_POLL_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+            if self._running:
+                await asyncio.wait(
+                    self._running.values(),
+                    timeout=settings.JOB_SHUTDOWN_TIMEOUT_SECONDS,
+                )
+        finally:
+            # jobs still running lose their lease and are picked up again
+            heartbeat.cancel()
+            for task in self._running.values():
+                task.cancel()
+
+    def _on_done(self, job_id: int):
+        def callback(task: asyncio.Task) -> None:
+            self._running.pop(job_id, None)
+            self._wakeup.set()
+
+        return callback
+
+    async def _claim(self, limit: int) -> list[BackgroundJob]:
+        async with async_session_maker() as session:
+            async with session.begin():
+                return await BackgroundJobRepository(session).claim(
+                    self.worker_id, limit
+                )
+
+    async def _heartbeat(self) -> None:
+        while True:
+            try:
+                async with async_session_maker() as session:
+                    async with session.begin():
+                        job_repository = BackgroundJobRepository(session)
+                        await job_repository.heartbeat(
+                            self.worker_id, list(self._running)
+                        )
+                        stale = await job_repository.requeue_stale(
+                            timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                            settings.JOB_MAX_ATTEMPTS,
+                        )
+                for status in (
+                    BackgroundJobStatusEnum.QUEUED,
+                    BackgroundJobStatusEnum.FAILED,
+                ):
+                    job_ids = [
+                        job_id for job_id, job_status in stale if job_status == status
+                    ]
+                    if job_ids:
+                        logger.warning(
+                            "jobs of lost workers %s: %s", status.value, job_ids
+                        )
+            except Exception:
+                logger.exception("heartbeat failed")
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+
+    async def _execute(self, job: BackgroundJob) -> None:
+        logger.info("job %s (%s) started, attempt %s", job.id, job.kind, job.attempts)
+        kind = BackgroundJobKindEnum(job.kind)
+        try:
+            result = await background_job_handlers[kind](
+                parse_job_payload(kind, job.payload)
+            )
+        except AppError as e:
+            # the request itself is wrong, another attempt would fail the same way
+            logger.warning("job %s failed: %s", job.id, e.message)
+            await self._finish(job, BackgroundJobStatusEnum.FAILED, error=e.message)
+        except Exception as e:
+            logger.exception("job %s failed", job.id)
+            if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+                await self._finish(job, BackgroundJobStatusEnum.FAILED, error=repr(e))
+            else:
+                delay = settings.JOB_RETRY_SECONDS * 2 ** (job.attempts - 1)
+                async with async_session_maker() as session:
+                    async with session.begin():
+                        await BackgroundJobRepository(session).retry_later(
+                            job.id, self.worker_id, timedelta(seconds=delay), repr(e)
+                        )
+        else:
+            logger.info("job %s succeeded", job.id)
+            await self._finish(job, BackgroundJobStatusEnum.SUCCEEDED, result=result)
+
+    async def _finish(
+        self,
+        job: BackgroundJob,
+        status: BackgroundJobStatusEnum,
+        result: dict | None = None,
+        error: str | None = None,
+    ) -> None:
+        async with async_session_maker() as session:
+            async with session.begin():
+                await BackgroundJobRepository(session).finish(
+                    job.id, self.worker_id, status, result, error
+                )
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s"
+    )
+    worker = Worker(settings.JOB_WORKER_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())